@@ -1,16 +1,32 @@
 import os
 import json
 import asyncio
-import requests
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 import logging
 from pathlib import Path
 
+import bootstrap  # noqa: F401  (puts src on sys.path)
+
+import html_optimizer
+import http_client
+import renderer
+from config import Config
+from image_generator import ImageGenerator
+from image_processor import ImageProcessor
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Stable Diffusion settings; part of the image cache key
+IMAGE_PARAMETERS = {
+    "negative_prompt": "blurry, low quality, distorted",
+    "width": 512,
+    "height": 512,
+    "num_inference_steps": 20
+}
+
 class AIWhopNewsletter2025:
     def __init__(self):
         self.newsapi_key = os.getenv('NEWSAPI_KEY')
@@ -47,7 +63,7 @@ class AIWhopNewsletter2025:
                     'apiKey': self.newsapi_key
                 }
                 
-                response = requests.get(url, params=params)
+                response = http_client.get(url, params=params)
                 if response.status_code == 200:
                     data = response.json()
                     articles = data.get('articles', [])
@@ -70,43 +86,24 @@ class AIWhopNewsletter2025:
 
     async def generate_ai_images(self, articles: List[Dict[str, Any]]) -> List[str]:
         """Generate AI images for newsletter using Hugging Face"""
-        image_urls = []
+        prompts = [
+            f"Professional AI technology news illustration for: {article['title']}"
+            for article in articles[:3]  # Generate for first 3 articles
+        ]
         
-        for i, article in enumerate(articles[:3]):  # Generate for first 3 articles
-            try:
-                prompt = f"Professional AI technology news illustration for: {article['title']}"
-                
-                # Use Stable Diffusion API
-                api_url = "https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-xl-base-1.0"
-                headers = {"Authorization": f"Bearer {self.hf_token}"}
-                
-                payload = {
-                    "inputs": prompt,
-                    "parameters": {
-                        "negative_prompt": "blurry, low quality, distorted",
-                        "width": 512,
-                        "height": 512,
-                        "num_inference_steps": 20
-                    }
-                }
-                
-                response = requests.post(api_url, headers=headers, json=payload)
-                
-                if response.status_code == 200:
-                    # Save image locally and return URL
-                    image_filename = f"ai_newsletter_image_{i+1}.png"
-                    image_path = Path(image_filename)
-                    with open(image_path, 'wb') as f:
-                        f.write(response.content)
-                    
-                    image_urls.append(str(image_path.absolute()))
-                else:
-                    # Use placeholder if API fails
-                    image_urls.append(f"https://via.placeholder.com/512x512/1e40af/ffffff?text=AI+News+{i+1}")
-                    
-            except Exception as e:
-                logger.error(f"Error generating image {i+1}: {e}")
-                image_urls.append(f"https://via.placeholder.com/512x512/1e40af/ffffff?text=AI+News+{i+1}")
+        # Stable Diffusion, a few requests at a time; prompts rendered before come from the image cache
+        paths = await ImageGenerator(token=self.hf_token).generate(prompts, IMAGE_PARAMETERS)
+        
+        # Crop and recompress for the email into the static directory, off the event loop
+        processed = await asyncio.to_thread(ImageProcessor().process_all, paths)
+        
+        image_urls = []
+        for i, url in enumerate(processed, 1):
+            if url:
+                image_urls.append(url)
+            else:
+                # Use placeholder if API fails
+                image_urls.append(f"https://via.placeholder.com/512x512/1e40af/ffffff?text=AI+News+{i}")
                 
         return image_urls
 
@@ -137,7 +134,7 @@ class AIWhopNewsletter2025:
                 ]
             }
             
-            response = requests.post(url, headers=headers, json=product_data)
+            response = http_client.post(url, headers=headers, json=product_data)
             
             if response.status_code == 201:
                 logger.info("WHOP product created successfully")
@@ -153,105 +150,64 @@ class AIWhopNewsletter2025:
     async def generate_premium_newsletter(self, articles: List[Dict[str, Any]], images: List[str]) -> str:
         """Generate premium HTML newsletter with AI enhancements"""
         
-        # Calculate newsletter stats
         current_date = datetime.now().strftime("%B %d, %Y")
-        total_articles = len(articles)
-        total_categories = len(set([article.get('source', {}).get('name', 'General') for article in articles]))
-        total_read_time = max(5, total_articles * 2)  # 2 min per article
+        published_time = datetime.now().strftime('%I:%M %p')
         
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AI Newsletter 2025 - Premium Daily Intelligence</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); margin: 0; padding: 20px; }}
-        .container {{ max-width: 800px; margin: 0 auto; background: white; border-radius: 20px; box-shadow: 0 20px 40px rgba(0,0,0,0.1); overflow: hidden; }}
-        .header {{ background: linear-gradient(135deg, #1e40af, #3b82f6); color: white; padding: 40px 30px; text-align: center; }}
-        .header h1 {{ font-size: 2.5em; margin-bottom: 10px; font-weight: 700; }}
-        .header p {{ font-size: 1.2em; opacity: 0.9; }}
-        .stats {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: 20px; padding: 30px; background: #f8fafc; border-bottom: 1px solid #e2e8f0; }}
-        .stat {{ text-align: center; }}
-        .stat-number {{ font-size: 2em; font-weight: bold; color: #1e40af; }}
-        .stat-label {{ color: #64748b; font-size: 0.9em; }}
-        .content {{ padding: 30px; }}
-        .article {{ margin-bottom: 40px; padding: 25px; border-radius: 12px; background: #f8fafc; border-left: 4px solid #3b82f6; }}
-        .article h2 {{ color: #1e293b; margin-bottom: 15px; font-size: 1.5em; }}
-        .article-meta {{ color: #64748b; font-size: 0.9em; margin-bottom: 15px; }}
-        .article-description {{ color: #475569; line-height: 1.6; margin-bottom: 15px; }}
-        .article-link {{ display: inline-block; background: #3b82f6; color: white; padding: 12px 24px; border-radius: 8px; text-decoration: none; font-weight: 600; transition: background 0.3s; }}
-        .article-link:hover {{ background: #1e40af; }}
-        .footer {{ background: #1e293b; color: white; padding: 30px; text-align: center; }}
-        .footer p {{ margin-bottom: 10px; }}
-        .social-links {{ display: flex; justify-content: center; gap: 20px; }}
-        .social-links a {{ color: white; text-decoration: none; font-size: 0.9em; }}
-        @media (max-width: 600px) {{ .stats {{ grid-template-columns: 1fr; }} }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>🤖 AI Newsletter 2025</h1>
-            <p>Premium Daily Intelligence • {current_date}</p>
-        </div>
-        
-        <div class="stats">
-            <div class="stat">
-                <div class="stat-number">{total_articles}</div>
-                <div class="stat-label">Articles</div>
-            </div>
-            <div class="stat">
-                <div class="stat-number">{total_categories}</div>
-                <div class="stat-label">Sources</div>
-            </div>
-            <div class="stat">
-                <div class="stat-number">{total_read_time}</div>
-                <div class="stat-label">Min Read</div>
-            </div>
-        </div>
-        
-        <div class="content">
-"""
-
-        for i, article in enumerate(articles):
-            img_tag = f'<img src="{images[i] if i < len(images) else "https://via.placeholder.com/512x512/1e40af/ffffff?text=AI+News"}" alt="{article["title"]}" style="width: 100%; height: 200px; object-fit: cover; border-radius: 8px; margin-bottom: 15px;">' if i < len(images) else ""
+        def render(stories: Dict[str, List[Dict[str, Any]]]) -> str:
+            kept = stories.get('articles', [])
+            
+            # Calculate newsletter stats
+            total_articles = len(kept)
+            total_categories = len(set([article.get('source', {}).get('name', 'General') for article in kept]))
+            total_read_time = max(5, total_articles * 2)  # 2 min per article
             
-            html_content += f"""
-            <div class="article">
-                {img_tag}
-                <h2>{article['title']}</h2>
-                <div class="article-meta">
-                    📰 {article.get('source', {}).get('name', 'AI News')} • 
-                    ⏰ {datetime.now().strftime('%I:%M %p')}
-                </div>
-                <div class="article-description">
-                    {article['description']}
-                </div>
-                <a href="{article['url']}" class="article-link" target="_blank">Read Full Article →</a>
-            </div>
-"""
+            return renderer.render(
+                'premium_newsletter.html.j2',
+                articles=kept,
+                images=images,
+                current_date=current_date,
+                total_articles=total_articles,
+                total_categories=total_categories,
+                total_read_time=total_read_time,
+                published_time=published_time
+            )
+        
+        # Unscored articles are dropped from the end, which keeps images lined up with their articles
+        html_content, _, _ = html_optimizer.fit_to_budget({'articles': articles}, render)
+        return html_content
 
-        html_content += """
-        </div>
+    def stream_premium_newsletter(self, articles: List[Dict[str, Any]], images: List[str]) -> Iterator[str]:
+        """Yield the full premium newsletter piece by piece as it renders, inlined and minified
         
-        <div class="footer">
-            <p>🚀 Powered by AI • Delivered Daily</p>
-            <p>Questions? Reply to this email or contact support@ainewsletter2025.com</p>
-            <div class="social-links">
-                <a href="https://whop.com/ai-newsletter-2025">Manage Subscription</a>
-                <a href="https://twitter.com/ainewsletter2025">Twitter</a>
-                <a href="https://discord.gg/ainewsletter">Discord</a>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        Nothing is dropped for the email byte budget here; write_premium_newsletter
+        checks the size once the page is written.
+        """
+        total_articles = len(articles)
+        return html_optimizer.stream_optimized(renderer.stream(
+            'premium_newsletter.html.j2',
+            articles=articles,
+            images=images,
+            current_date=datetime.now().strftime("%B %d, %Y"),
+            total_articles=total_articles,
+            total_categories=len(set([article.get('source', {}).get('name', 'General') for article in articles])),
+            total_read_time=max(5, total_articles * 2),  # 2 min per article
+            published_time=datetime.now().strftime('%I:%M %p')
+        ))
 
-        return html_content
+    async def write_premium_newsletter(self, articles: List[Dict[str, Any]], images: List[str], filename: str) -> int:
+        """Stream the premium newsletter to disk, returning its size in bytes
+        
+        Most issues fit the email byte budget and are written in a single
+        streamed render. An issue over budget is rendered again through
+        generate_premium_newsletter, which drops stories until it fits.
+        """
+        size = renderer.write_stream(self.stream_premium_newsletter(articles, images), filename)
+        if size <= Config.EMAIL_BYTE_BUDGET:
+            return size
+        
+        logger.warning(f"Newsletter is {size} bytes, over the {Config.EMAIL_BYTE_BUDGET} byte budget; trimming stories")
+        html_content = await self.generate_premium_newsletter(articles, images)
+        return renderer.write_stream([html_content], filename)
 
     async def setup_kit_integration(self) -> bool:
         """Setup Kit email integration"""
@@ -264,7 +220,7 @@ class AIWhopNewsletter2025:
             url = "https://api.kit.com/v3/me"
             headers = {"Authorization": f"Bearer {self.kit_api_key}"}
             
-            response = requests.get(url, headers=headers)
+            response = http_client.get(url, headers=headers)
             return response.status_code == 200
             
         except Exception as e:
@@ -288,14 +244,10 @@ class AIWhopNewsletter2025:
         logger.info("🏪 Creating WHOP product...")
         whop_product = await self.create_whop_product()
         
-        # 4. Generate newsletter
+        # 4-5. Generate newsletter, writing it to disk as it renders
         logger.info("📝 Generating premium newsletter...")
-        newsletter_html = await self.generate_premium_newsletter(articles, images)
-        
-        # 5. Save newsletter
         filename = f"ai_newsletter_{datetime.now().strftime('%Y%m%d_%H%M')}.html"
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(newsletter_html)
+        await self.write_premium_newsletter(articles, images, filename)
         
         # 6. Save data for reference
         newsletter_data = {
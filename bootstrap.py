@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Import Bootstrap
+Puts src/ on sys.path for the root-level scripts and tests; the modules in src
+import each other by bare name, the same way they do when run as scripts
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -0,0 +1,3 @@
+"""Shared pytest setup: the tests import src modules by bare name"""
+
+import bootstrap  # noqa: F401
@@ -6,7 +6,10 @@ Run this script to create your AI Newsletter product on Whop
 
 import sys
 import os
-from src.whop_integration import WhopIntegration
+
+import bootstrap  # noqa: F401  (puts src on sys.path)
+
+from whop_integration import WhopIntegration
 
 def main():
     """Create Whop product"""
@@ -38,6 +38,79 @@ class Config:
         'quick_bites': 6
     }
     
+    # Feed Fetching
+    FEED_FETCH_CONCURRENCY = int(os.getenv('FEED_FETCH_CONCURRENCY', '10'))
+    FEED_FETCH_TIMEOUT = float(os.getenv('FEED_FETCH_TIMEOUT', '15'))
+    FEED_CACHE_PATH = os.getenv('FEED_CACHE_PATH', '.cache/feed_cache.json')
+    
+    # Image Generation
+    IMAGE_API_URL = os.getenv(
+        'IMAGE_API_URL', 'https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-xl-base-1.0'
+    )
+    IMAGE_GENERATION_CONCURRENCY = int(os.getenv('IMAGE_GENERATION_CONCURRENCY', '3'))
+    IMAGE_GENERATION_TIMEOUT = float(os.getenv('IMAGE_GENERATION_TIMEOUT', '120'))  # Seconds per image
+    IMAGE_CACHE_DIR = os.getenv('IMAGE_CACHE_DIR', '.cache/images')
+    
+    # Image Post-Processing (the premium template shows images in a ~700x200 box)
+    IMAGE_STATIC_DIR = os.getenv('IMAGE_STATIC_DIR', 'static/images')
+    IMAGE_BASE_URL = os.getenv('IMAGE_BASE_URL', '')  # Public URL of IMAGE_STATIC_DIR; empty links local files
+    IMAGE_OUTPUT_FORMAT = os.getenv('IMAGE_OUTPUT_FORMAT', 'jpeg')  # jpeg or webp (Outlook can't show WebP)
+    IMAGE_DISPLAY_WIDTH = int(os.getenv('IMAGE_DISPLAY_WIDTH', '700'))
+    IMAGE_DISPLAY_HEIGHT = int(os.getenv('IMAGE_DISPLAY_HEIGHT', '200'))
+    IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY', '80'))
+    IMAGE_TARGET_BYTES = int(os.getenv('IMAGE_TARGET_BYTES', '40000'))  # Quality steps down to fit; 0 disables
+    IMAGE_PROCESSING_WORKERS = int(os.getenv('IMAGE_PROCESSING_WORKERS', '4'))
+    
+    # Summarization
+    # Backends: bart, bart-int8, distilbart, distilbart-int8, bart-onnx, distilbart-onnx
+    # (see summarizer_backends.py)
+    SUMMARIZER_BACKEND = os.getenv('SUMMARIZER_BACKEND', 'bart')
+    SUMMARIZER_MODEL = os.getenv('SUMMARIZER_MODEL')  # Overrides the backend's checkpoint
+    SUMMARIZER_THREADS = int(os.getenv('SUMMARIZER_THREADS', '0'))  # 0 = torch default
+    ONNX_CACHE_DIR = os.getenv('ONNX_CACHE_DIR', '.cache/onnx')
+    SUMMARIZER_LOCAL_WEIGHTS = os.getenv('SUMMARIZER_LOCAL_WEIGHTS', 'false').lower() == 'true'  # Memory-map a local safetensors copy, shared across processes
+    LOCAL_MODEL_DIR = os.getenv('LOCAL_MODEL_DIR', '.cache/models')
+    
+    # Multi-process summarization: 1 = in-process, 0 = one worker per THREADS_PER_WORKER cores.
+    # THREADS_PER_WORKER 0 = split the cores evenly between the workers.
+    SUMMARIZER_WORKERS = int(os.getenv('SUMMARIZER_WORKERS', '1'))
+    SUMMARIZER_THREADS_PER_WORKER = int(os.getenv('SUMMARIZER_THREADS_PER_WORKER', '0'))
+    SUMMARIZER_POOL_MIN_ARTICLES = int(os.getenv('SUMMARIZER_POOL_MIN_ARTICLES', '0'))  # 0 = half of MAX_STORIES_PER_ISSUE
+    SUMMARIZER_SERVER_URL = os.getenv('SUMMARIZER_SERVER_URL', '')  # e.g. http://127.0.0.1:8765; empty disables it
+    SUMMARIZER_SERVER_CONNECT_TIMEOUT = float(os.getenv('SUMMARIZER_SERVER_CONNECT_TIMEOUT', '1'))
+    SUMMARY_BATCH_SIZE = int(os.getenv('SUMMARY_BATCH_SIZE', '8'))
+    SUMMARY_INPUT_TOKENS = int(os.getenv('SUMMARY_INPUT_TOKENS', '1000'))  # BART window is 1024
+    SUMMARY_MIN_INPUT_TOKENS = int(os.getenv('SUMMARY_MIN_INPUT_TOKENS', '12'))
+    SUMMARY_LENGTH_BUCKETS = [64, 128, 256, 512, 1024]
+    SUMMARY_TIME_BUDGET = float(os.getenv('SUMMARY_TIME_BUDGET', '180'))  # Seconds before TextRank takes over
+    EXTRACTIVE_SUMMARY_SENTENCES = int(os.getenv('EXTRACTIVE_SUMMARY_SENTENCES', '2'))
+    SUMMARY_CACHE_ENABLED = os.getenv('SUMMARY_CACHE_ENABLED', 'true').lower() == 'true'
+    SUMMARY_CACHE_PATH = os.getenv('SUMMARY_CACHE_PATH', '.cache/summary_cache.json')
+    SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv('SUMMARY_CACHE_MAX_ENTRIES', '5000'))
+    SUMMARY_CACHE_TTL_DAYS = float(os.getenv('SUMMARY_CACHE_TTL_DAYS', '30'))
+    
+    # Rendering
+    TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR', '.cache/templates')  # Compiled template bytecode
+    FRAGMENT_CACHE_PATH = os.getenv('FRAGMENT_CACHE_PATH', '.cache/fragment_cache.json')  # Empty keeps it in memory
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.getenv('FRAGMENT_CACHE_MAX_ENTRIES', '2000'))
+    ISSUE_ARCHIVE_DIR = os.getenv('ISSUE_ARCHIVE_DIR', 'archive')  # One JSON manifest per issue; empty disables
+    
+    # Email Size (Gmail clips HTML parts over ~102KB, hiding the footer and unsubscribe link)
+    EMAIL_BYTE_BUDGET = int(os.getenv('EMAIL_BYTE_BUDGET', '100000'))
+    
+    # Per-Subscriber Personalization
+    LINK_TRACKING_URL = os.getenv('LINK_TRACKING_URL', '')  # Click redirector; empty keeps plain links
+    LINK_TRACKING_SECRET = os.getenv('LINK_TRACKING_SECRET', '')  # Required once LINK_TRACKING_URL is set
+    PERSONALIZATION_WORKERS = int(os.getenv('PERSONALIZATION_WORKERS', '0'))  # 0 = one per core
+    PERSONALIZATION_POOL_MIN_RECIPIENTS = int(os.getenv('PERSONALIZATION_POOL_MIN_RECIPIENTS', '5000'))
+    PERSONALIZATION_CHUNK_SIZE = int(os.getenv('PERSONALIZATION_CHUNK_SIZE', '2000'))
+    PERSONA_SECTION_STORIES = int(os.getenv('PERSONA_SECTION_STORIES', '3'))
+    PERSONALIZATION_SLOT_RESERVE = 2048  # Bytes kept free for greetings and tracking tokens
+    
+    # Near-Duplicate Detection (MinHash/LSH)
+    DEDUP_SIMILARITY_THRESHOLD = float(os.getenv('DEDUP_SIMILARITY_THRESHOLD', '0.6'))
+    DEDUP_NUM_PERM = int(os.getenv('DEDUP_NUM_PERM', '128'))
+    
     # Business Impact Keywords
     BUSINESS_KEYWORDS = {
         'high_impact': [
@@ -56,6 +129,13 @@ class Config:
         ]
     }
     
+    # Points added per distinct BUSINESS_KEYWORDS hit
+    KEYWORD_WEIGHTS = {
+        'high_impact': 3.0,
+        'medium_impact': 2.0,
+        'trending_tech': 1.5
+    }
+    
     # Categorization Keywords
     CATEGORY_KEYWORDS = {
         'funding_deals': ['funding', 'investment', 'deal', 'acquisition', 'venture', 'seed', 'series'],
@@ -65,6 +145,30 @@ class Config:
         'regulatory': ['regulation', 'policy', 'law', 'government', 'compliance', 'ethics']
     }
     
+    # Newsletter Topics (NewsletterGenerator sections, checked in order)
+    TOPIC_KEYWORDS = {
+        'AI & Machine Learning': ['ai', 'artificial intelligence', 'machine learning', 'neural', 'chatgpt'],
+        'Business & Startups': ['startup', 'business', 'funding', 'investment'],
+        'Tech Innovation': ['tech', 'innovation', 'digital', 'automation']
+    }
+    
+    # Newsletter Layout (NewsletterGenerator): stories printed per section and per issue
+    NEWSLETTER_SECTION_LIMITS = {
+        'AI & Machine Learning': 6,
+        'Business & Startups': 4,
+        'Tech Innovation': 4,
+        'Other': 2
+    }
+    MAX_STORIES_PER_ISSUE = int(os.getenv('MAX_STORIES_PER_ISSUE', '12'))
+    
+    # AI/Tech Relevance Filter (NewsCollector)
+    AI_RELEVANCE_KEYWORDS = [
+        'artificial intelligence', 'machine learning', 'deep learning',
+        'neural network', 'ai', 'ml', 'chatgpt', 'openai', 'tech',
+        'technology', 'startup', 'innovation', 'digital', 'automation',
+        'robotics', 'algorithm', 'data science', 'blockchain', 'crypto'
+    ]
+    
     # Email Template Settings
     EMAIL_TEMPLATE_SETTINGS = {
         'primary_color': '#2563eb',
@@ -97,6 +201,22 @@ class Config:
         }
     }
     
+    # Newsletter sections each persona's highlight block draws from
+    PERSONA_CATEGORIES = {
+        'executives': ['Business & Startups', 'AI & Machine Learning'],
+        'developers': ['Tech Innovation', 'AI & Machine Learning'],
+        'investors': ['Business & Startups'],
+        'researchers': ['AI & Machine Learning']
+    }
+    
+    # Section weights for each persona's edition; sections weighted 0 are left out
+    PERSONA_CATEGORY_WEIGHTS = {
+        'executives': {'Business & Startups': 1.5, 'AI & Machine Learning': 1.2, 'Tech Innovation': 1.0, 'Other': 0.5},
+        'developers': {'Tech Innovation': 1.5, 'AI & Machine Learning': 1.4, 'Business & Startups': 0.6, 'Other': 0.5},
+        'investors': {'Business & Startups': 1.6, 'Tech Innovation': 1.1, 'AI & Machine Learning': 1.0, 'Other': 0.3},
+        'researchers': {'AI & Machine Learning': 1.6, 'Tech Innovation': 1.0, 'Business & Startups': 0.4, 'Other': 0}
+    }
+    
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -108,7 +228,9 @@ class Config:
             'newsapi_key': bool(cls.NEWSAPI_KEY),
             'hf_token': bool(cls.HF_TOKEN),
             'kit_api_key': bool(cls.KIT_API_KEY),
-            'whop_api_key': bool(cls.WHOP_API_KEY)
+            'whop_api_key': bool(cls.WHOP_API_KEY),
+            # Without it anyone could forge tracked-link tokens
+            'link_tracking_secret': bool(cls.LINK_TRACKING_SECRET) or not cls.LINK_TRACKING_URL
         }
     
     @classmethod
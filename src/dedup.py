@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection for Nosyt Labs AI Newsletter
+MinHash signatures + locality-sensitive hashing over title and summary shingles
+"""
+
+import logging
+import re
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from config import Config
+
+# Mersenne prime used for the universal hash family; shingle hashes are reduced below it
+_PRIME = (1 << 31) - 1
+
+@lru_cache(maxsize=None)
+def _optimal_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Pick (bands, rows) with bands * rows <= num_perm whose S-curve best matches the threshold"""
+    best, best_error = (1, num_perm), float('inf')
+    grid = np.linspace(0.0, 1.0, 101)
+    step = grid[1] - grid[0]
+    below = grid < threshold
+
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        probability = 1.0 - (1.0 - grid ** rows) ** bands
+        false_positive = probability[below].sum() * step
+        false_negative = (1.0 - probability[~below]).sum() * step
+        error = false_positive + false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+
+    return best
+
+class NearDuplicateDetector:
+    """Drops stories whose text is near-identical to an earlier story
+
+    Each story is turned into character shingles, hashed into a MinHash
+    signature and bucketed per LSH band, so work grows linearly with the
+    number of stories. Candidate pairs that share a bucket are confirmed
+    against the estimated Jaccard similarity before a story is dropped.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, num_perm: Optional[int] = None,
+                 shingle_size: int = 5, seed: int = 1):
+        self.threshold = threshold if threshold is not None else Config.DEDUP_SIMILARITY_THRESHOLD
+        self.num_perm = num_perm or Config.DEDUP_NUM_PERM
+        self.shingle_size = shingle_size
+        self.bands, self.rows = _optimal_bands(self.num_perm, self.threshold)
+        self.logger = logging.getLogger(__name__)
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=self.num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=self.num_perm).astype(np.uint64)
+
+    def _shingles(self, text: str) -> np.ndarray:
+        """Hash the character shingles of normalized text"""
+        text = ' '.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+        if len(text) <= self.shingle_size:
+            grams = {text}
+        else:
+            grams = {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+
+        return np.fromiter(
+            (zlib.crc32(gram.encode('utf-8')) % _PRIME for gram in grams),
+            dtype=np.uint64,
+            count=len(grams)
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of a text"""
+        shingles = self._shingles(text)
+        hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+    def deduplicate(self, items: List[Dict], text: Callable[[Dict], str]) -> List[Dict]:
+        """Keep the first of every group of near-duplicate items, preserving order"""
+        buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        signatures: List[np.ndarray] = []
+        kept: List[Dict] = []
+
+        for item in items:
+            signature = self.signature(text(item))
+            keys = [
+                (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+                for band in range(self.bands)
+            ]
+
+            candidates = {index for key in keys for index in buckets.get(key, ())}
+            if any(np.mean(signatures[index] == signature) >= self.threshold for index in candidates):
+                continue
+
+            index = len(signatures)
+            signatures.append(signature)
+            for key in keys:
+                buckets.setdefault(key, []).append(index)
+            kept.append(item)
+
+        dropped = len(items) - len(kept)
+        if dropped:
+            self.logger.info(f'Dropped {dropped} near-duplicate stories')
+
+        return kept
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Edition Builder for Nosyt Labs AI Newsletter
+One issue per target persona from the same summarized stories, rendered concurrently
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from fragment_cache import FragmentCache, get_fragment_cache
+from issue import IssueEmitter
+
+class EditionBuilder:
+    """Builds every persona edition, reusing story-card fragments between them"""
+
+    def __init__(self, fragment_cache: Optional[FragmentCache] = None):
+        self.fragment_cache = fragment_cache or get_fragment_cache()
+        self.emitter = IssueEmitter(self.fragment_cache)
+        self.logger = logging.getLogger(__name__)
+
+    def order_sections(self, categorized: Dict[str, List[Dict]], persona: str) -> List[Tuple[str, List[Dict]]]:
+        """Sections by the persona's category weight, highest first, and stories within each by score
+
+        Sections weighted 0 (or not listed) for a persona are left out of its edition.
+        """
+        weights = Config.PERSONA_CATEGORY_WEIGHTS.get(persona, {})
+        sections = [
+            (category, sorted(articles, key=lambda article: article.get('score', 0), reverse=True))
+            for category, articles in categorized.items()
+            if weights.get(category, 0) > 0 and articles
+        ]
+        # Stable sort keeps the generic issue order between equally weighted sections
+        sections.sort(key=lambda section: weights[section[0]], reverse=True)
+        return sections
+
+    def build_edition(self, categorized: Dict[str, List[Dict]], persona: str, now: Optional[datetime] = None) -> Dict:
+        """Subject and every output format of one persona's edition"""
+        now = now or datetime.now()
+        details = Config.TARGET_PERSONAS[persona]
+
+        subject = f"Nosyt Labs AI Intelligence for {details['title']} - {now.strftime('%B %d, %Y')}"
+        outputs, sections = self.emitter.emit_within_budget(
+            dict(self.order_sections(categorized, persona)), subject, now, details
+        )
+
+        return {
+            'persona': persona,
+            'subject': subject,
+            'html': outputs['html'],
+            'text': outputs['text'],
+            'markdown': outputs['markdown'],
+            'manifest': outputs['json'],
+            'articles_count': sum(len(articles) for articles in sections.values())
+        }
+
+    def build_all(self, categorized: Dict[str, List[Dict]]) -> Dict[str, Dict]:
+        """Every Config.TARGET_PERSONAS edition, rendered concurrently"""
+        now = datetime.now()
+        personas = list(Config.TARGET_PERSONAS)
+
+        hits, misses = self.fragment_cache.hits, self.fragment_cache.misses
+        with ThreadPoolExecutor(max_workers=len(personas) or 1) as executor:
+            editions = list(executor.map(lambda persona: self.build_edition(categorized, persona, now), personas))
+        self.fragment_cache.save()
+
+        self.logger.info(
+            f'Built {len(editions)} persona editions '
+            f'(story cards: {self.fragment_cache.misses - misses} rendered, {self.fragment_cache.hits - hits} reused)'
+        )
+        return dict(zip(personas, editions))
@@ -4,9 +4,9 @@ Email Sender - Handles newsletter delivery via Kit (ConvertKit)
 """
 
 import os
-import requests
 import logging
 from typing import List, Dict
+import http_client
 
 class EmailSender:
     """Sends newsletters via Kit (ConvertKit)"""
@@ -51,7 +51,7 @@ class EmailSender:
                 'send_at': None  # Send immediately
             }
             
-            response = requests.post(url, json=data)
+            response = http_client.post(url, json=data)
             
             if response.status_code == 201:
                 broadcast_data = response.json()
@@ -73,7 +73,7 @@ class EmailSender:
                 'api_key': self.kit_api_key
             }
             
-            response = requests.post(url, json=data)
+            response = http_client.post(url, json=data)
             
             if response.status_code == 204:
                 self.logger.info(f"Broadcast {broadcast_id} sent successfully")
@@ -98,7 +98,7 @@ class EmailSender:
                 'state': 'active'
             }
             
-            response = requests.post(url, json=data)
+            response = http_client.post(url, json=data)
             
             if response.status_code in [200, 201]:
                 self.logger.info(f"Subscriber {email} added successfully")
@@ -125,7 +125,7 @@ class EmailSender:
                 'api_key': self.kit_api_key
             }
             
-            response = requests.put(url, json=data)
+            response = http_client.put(url, json=data)
             
             if response.status_code == 200:
                 self.logger.info(f"Subscriber {email} removed successfully")
@@ -147,7 +147,7 @@ class EmailSender:
                 'email_address': email
             }
             
-            response = requests.get(url, params=params)
+            response = http_client.get(url, params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Feed Cache for Nosyt Labs AI Newsletter
+Persists ETag / Last-Modified validators and the last parsed entries per feed URL
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+import feedparser
+from config import Config
+
+# Entry fields the collectors read; everything else is dropped before persisting
+ENTRY_FIELDS = ('title', 'summary', 'description', 'link', 'published')
+
+class FeedCache:
+    """On-disk validator cache used for conditional GETs of RSS/Atom feeds"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config.FEED_CACHE_PATH
+        self.logger = logging.getLogger(__name__)
+        self.entries = self._load()
+        self.dirty = False
+
+    def _load(self) -> Dict[str, Dict]:
+        """Read the cache file, starting empty if it is missing or corrupt"""
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f'Ignoring unreadable feed cache {self.path}: {e}')
+            return {}
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a feed URL"""
+        cached = self.entries.get(url)
+        if not cached:
+            return {}
+
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
+    def load_feed(self, url: str) -> Optional[feedparser.FeedParserDict]:
+        """Rebuild a parsed feed from the cached entries (used on 304 Not Modified)
+
+        Returns None when only validators are cached, so the caller refetches the feed.
+        """
+        cached = self.entries.get(url)
+        if not cached or 'items' not in cached:
+            return None
+
+        return feedparser.FeedParserDict(
+            feed=feedparser.FeedParserDict(title=cached.get('feed_title', '')),
+            entries=[feedparser.FeedParserDict(entry) for entry in cached.get('items', [])]
+        )
+
+    def store(self, url: str, feed: feedparser.FeedParserDict, etag: Optional[str], last_modified: Optional[str]):
+        """Remember the validators and parsed entries of a freshly downloaded feed"""
+        self.entries[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'feed_title': feed.feed.get('title', ''),
+            'items': [
+                {field: entry[field] for field in ENTRY_FIELDS if entry.get(field)}
+                for entry in feed.entries
+            ],
+            'fetched_at': time.time()
+        }
+        self.dirty = True
+
+    def save(self):
+        """Write the cache back to disk atomically if anything changed"""
+        if not self.dirty:
+            return
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except Exception as e:
+            self.logger.warning(f'Failed to save feed cache {self.path}: {e}')
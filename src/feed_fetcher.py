@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Feed Fetcher for Nosyt Labs AI Newsletter
+Downloads all RSS/Atom feeds concurrently and hands the raw bytes to feedparser
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+import aiohttp
+import feedparser
+from config import Config
+from feed_cache import FeedCache
+
+USER_AGENT = 'NosytLabsNewsletter/1.0 (+https://nosytlabs.com)'
+
+class FeedFetcher:
+    """Fetches many feeds at once with a concurrency limit and per-request timeouts"""
+
+    def __init__(self, concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                 cache: Optional[FeedCache] = None, use_cache: bool = True):
+        self.concurrency = concurrency or Config.FEED_FETCH_CONCURRENCY
+        self.timeout = timeout or Config.FEED_FETCH_TIMEOUT
+        self.cache = cache or (FeedCache() if use_cache else None)
+        self.logger = logging.getLogger(__name__)
+
+    def fetch_all(self, urls: List[str]) -> Dict[str, feedparser.FeedParserDict]:
+        """Fetch and parse every feed, returning parsed feeds keyed by URL
+
+        Feeds that fail to download are logged and left out of the result.
+        Feeds answered with 304 Not Modified are served from the cache
+        without being parsed again.
+        """
+        if not urls:
+            return {}
+
+        feeds = asyncio.run(self._fetch_all(list(dict.fromkeys(urls))))
+
+        if self.cache:
+            self.cache.save()
+
+        return feeds
+
+    async def _fetch_all(self, urls: List[str]) -> Dict[str, feedparser.FeedParserDict]:
+        """Download all feeds concurrently, then parse the bodies"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+
+        async with aiohttp.ClientSession(
+            timeout=timeout,
+            connector=connector,
+            headers={'User-Agent': USER_AGENT}
+        ) as session:
+            responses = await asyncio.gather(
+                *(self._fetch_one(session, semaphore, url) for url in urls)
+            )
+
+        feeds = {}
+        not_modified = 0
+        for url, response in zip(urls, responses):
+            if response is None:
+                continue
+
+            if response['status'] == 304:
+                feed = self.cache.load_feed(url) if self.cache else None
+                if feed is not None:
+                    feeds[url] = feed
+                    not_modified += 1
+                continue
+
+            try:
+                feed = feedparser.parse(
+                    response['body'],
+                    response_headers={'content-type': response['content_type'], 'content-location': url}
+                )
+            except Exception as e:
+                self.logger.error(f'Feed parse error for {url}: {e}')
+                continue
+
+            feeds[url] = feed
+            if self.cache:
+                self.cache.store(url, feed, response['etag'], response['last_modified'])
+
+        if not_modified:
+            self.logger.info(f'{not_modified}/{len(urls)} feeds unchanged since last poll')
+
+        return feeds
+
+    async def _fetch_one(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str,
+                         conditional: bool = True) -> Optional[Dict]:
+        """Download a single feed, returning its status, body and validators or None on failure"""
+        headers = self.cache.conditional_headers(url) if self.cache and conditional else {}
+        stale_validators = False
+
+        async with semaphore:
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if response.status == 304:
+                        if self.cache and self.cache.load_feed(url) is not None:
+                            return {'status': 304}
+                        if headers:
+                            # Validators without cached entries (e.g. a cache written by an older version)
+                            stale_validators = True
+                        else:
+                            self.logger.error(f'Feed answered 304 to an unconditional request: {url}')
+                    else:
+                        response.raise_for_status()
+                        return {
+                            'status': response.status,
+                            'body': await response.read(),
+                            'content_type': response.headers.get('Content-Type', ''),
+                            'etag': response.headers.get('ETag'),
+                            'last_modified': response.headers.get('Last-Modified')
+                        }
+            except asyncio.TimeoutError:
+                self.logger.error(f'Feed fetch timed out after {self.timeout}s: {url}')
+            except Exception as e:
+                self.logger.error(f'Feed fetch error for {url}: {e}')
+
+        # Retried after the semaphore is released, so a full pool of such feeds cannot deadlock
+        if stale_validators:
+            self.logger.info(f'304 for {url} with nothing cached; fetching it unconditionally')
+            return await self._fetch_one(session, semaphore, url, conditional=False)
+
+        return None
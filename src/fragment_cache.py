@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Fragment Cache for Nosyt Labs AI Newsletter
+Pre-rendered HTML and text story cards keyed by story content and template version
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from markupsafe import Markup
+
+import renderer
+from config import Config
+
+CARD_TEMPLATES = ('story_card.html.j2', 'story_card.txt.j2')
+
+class FragmentCache:
+    """Disk-backed story-card cache, so a rebuild only renders the stories that changed"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None):
+        self.path = path if path is not None else Config.FRAGMENT_CACHE_PATH
+        self.max_entries = max_entries or Config.FRAGMENT_CACHE_MAX_ENTRIES
+        self.template_version = renderer.template_version(*CARD_TEMPLATES)
+        self.logger = logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        self.entries = self._load()
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def story_key(self, article: Dict) -> str:
+        """Hash of the template version and the story fields a card displays"""
+        fields = [
+            self.template_version,
+            article.get('title'),
+            article.get('ai_summary', article.get('description')),
+            article.get('url'),
+            article.get('source')
+        ]
+        payload = json.dumps(fields, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Read the cache file, starting empty if it is missing, corrupt or disabled"""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f'Ignoring unreadable fragment cache {self.path}: {e}')
+            return {}
+
+    def _entry(self, article: Dict) -> Dict:
+        """Cached HTML and text cards for a story, rendering both on a miss"""
+        key = self.story_key(article)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry['last_used'] = time.time()
+                self.hits += 1
+                self.dirty = True
+                return entry
+            self.misses += 1
+
+        # Rendering happens outside the lock; a concurrent miss just renders the same card twice
+        entry = {
+            'html': renderer.render_macro('story_card.html.j2', 'story_card', article, article.get('url', '#')),
+            'text': renderer.render_macro('story_card.txt.j2', 'story_card', article),
+            'last_used': time.time()
+        }
+        with self.lock:
+            self.entries[key] = entry
+            self.dirty = True
+        return entry
+
+    def html(self, article: Dict) -> Markup:
+        return Markup(self._entry(article)['html'])
+
+    def text(self, article: Dict) -> str:
+        return self._entry(article)['text']
+
+    def html_sections(self, categorized: Dict[str, List[Dict]]) -> List[Tuple[str, List[Markup]]]:
+        """(category, HTML cards) pairs ready for the issue templates"""
+        return [(category, [self.html(article) for article in articles]) for category, articles in categorized.items()]
+
+    def text_sections(self, categorized: Dict[str, List[Dict]]) -> List[Tuple[str, List[str]]]:
+        """(category, text cards) pairs ready for the issue templates"""
+        return [(category, [self.text(article) for article in articles]) for category, articles in categorized.items()]
+
+    def save(self):
+        """Keep the most recently used cards and write the cache back atomically if anything changed"""
+        with self.lock:
+            if not self.dirty or not self.path:
+                return
+
+            try:
+                if len(self.entries) > self.max_entries:
+                    recent = sorted(self.entries.items(), key=lambda item: item[1]['last_used'], reverse=True)
+                    self.entries = dict(recent[:self.max_entries])
+
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+
+                tmp_path = f'{self.path}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except Exception as e:
+                self.logger.warning(f'Failed to save fragment cache {self.path}: {e}')
+
+@lru_cache(maxsize=None)
+def get_fragment_cache() -> FragmentCache:
+    """Process-wide fragment cache shared by previews, editions and the real send"""
+    return FragmentCache()
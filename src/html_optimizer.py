@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+HTML Optimizer for Nosyt Labs AI Newsletter
+CSS inlining, minification and a byte budget that keeps issues under Gmail's clipping limit
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from config import Config
+
+STYLE_BLOCK = re.compile(r'<style[^>]*>(.*?)</style>', re.S | re.I)
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+CSS_RULE = re.compile(r'([^{}@]+)\{([^{}]*)\}')
+CSS_AT_RULE = re.compile(r'@[^{]+\{(?:[^{}]*\{[^{}]*\})*[^{}]*\}')
+SIMPLE_SELECTOR = re.compile(r'^(?:[a-z][a-z0-9]*|\.[\w-]+|[a-z][a-z0-9]*\.[\w-]+)$', re.I)
+
+TAG = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*?)(/?)>')
+CLASS_ATTR = re.compile(r'\sclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.I)
+STYLE_ATTR = re.compile(r'\sstyle\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.I)
+VOID_TAGS = frozenset('area base br col embed hr img input link meta source track wbr'.split())
+
+COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+PRESERVE = re.compile(r'(<(pre|textarea|script)\b.*?</\2>)', re.S | re.I)
+BETWEEN_TAGS = re.compile(r'>\s+<')
+WHITESPACE = re.compile(r'\s+')
+LEADING_GAP = re.compile(r'\s+<')
+BODY_START = re.compile(r'<body\b', re.I)
+
+# Characters of rendered HTML held back before a streamed piece is optimized and yielded
+STREAM_FLUSH_CHARS = 8192
+
+logger = logging.getLogger(__name__)
+
+def extract_css(html: str) -> str:
+    """Concatenated contents of the document's <style> blocks"""
+    return '\n'.join(STYLE_BLOCK.findall(html))
+
+def _matches(compound: str, tag: str, classes: List[str]) -> bool:
+    """Whether one simple selector (tag, .class or tag.class) matches an element"""
+    name, _, cls = compound.partition('.')
+    return (not name or name.lower() == tag) and (not cls or cls in classes)
+
+@lru_cache(maxsize=32)
+def _parse_css(css: str) -> Tuple[Tuple, str]:
+    """Split a stylesheet into inlinable rules and the leftover CSS that must stay in <style>
+
+    Inlinable rules have selectors made of one or two simple selectors
+    (".article", "h3", ".article h3"); pseudo-classes, @media and anything
+    more complex is kept as-is. Parsed once per distinct stylesheet.
+    """
+    css = CSS_COMMENT.sub('', css)
+    at_rules = CSS_AT_RULE.findall(css)
+    css = CSS_AT_RULE.sub('', css)
+
+    rules = []
+    leftover = list(at_rules)
+    for order, (selectors, body) in enumerate(CSS_RULE.findall(css)):
+        declarations = ';'.join(
+            ':'.join(piece.strip() for piece in part.split(':', 1)) for part in body.split(';') if part.strip()
+        )
+        for selector in selectors.split(','):
+            selector = ' '.join(selector.split())
+            parts = selector.split(' ')
+            if declarations and len(parts) <= 2 and all(SIMPLE_SELECTOR.match(part) for part in parts):
+                # One per type selector, ten per class: h3=1, .article=10, h3.title=11
+                specificity = sum((not part.startswith('.')) + 10 * ('.' in part) for part in parts)
+                rules.append((specificity, order, tuple(parts), declarations))
+            elif declarations:
+                leftover.append(f'{selector}{{{declarations}}}')
+
+    rules.sort(key=lambda rule: (rule[0], rule[1]))
+    return tuple(rules), ''.join(leftover)
+
+class CssInliner:
+    """Applies a stylesheet's inlinable rules to HTML fed in one or more pieces
+
+    Open elements are tracked across calls, so a document can be inlined
+    piece by piece as long as no tag is split between two pieces.
+    """
+
+    def __init__(self, css: str):
+        self.rules, self.leftover = _parse_css(css)
+        # Open elements as (tag, classes), so two-part selectors can look at ancestors
+        self.stack: List[Tuple[str, List[str]]] = []
+
+    def _apply(self, match) -> str:
+        closing, tag, attrs, self_closing = match.groups()
+        tag = tag.lower()
+        stack = self.stack
+        if closing:
+            while stack:
+                if stack.pop()[0] == tag:
+                    break
+            return match.group(0)
+
+        class_match = CLASS_ATTR.search(attrs)
+        classes = (class_match.group(1) or class_match.group(2) or '').split() if class_match else []
+        declarations = []
+        for _, _, parts, body in self.rules:
+            if not _matches(parts[-1], tag, classes):
+                continue
+            if len(parts) == 2 and not any(_matches(parts[0], *ancestor) for ancestor in stack):
+                continue
+            declarations.append(body)
+
+        if tag not in VOID_TAGS and not self_closing:
+            stack.append((tag, classes))
+        if not declarations:
+            return match.group(0)
+
+        style_match = STYLE_ATTR.search(attrs)
+        if style_match:
+            existing = (style_match.group(1) or style_match.group(2) or '').strip().rstrip(';')
+            declarations.append(existing)
+            attrs = attrs[:style_match.start()] + attrs[style_match.end():]
+        style = ';'.join(declarations).replace('"', "'")
+        return f'<{tag}{attrs} style="{style}"{self_closing}>'
+
+    def feed(self, html: str) -> str:
+        """Inline the next piece of the document"""
+        if not self.rules:
+            return html
+        return TAG.sub(self._apply, html)
+
+    def strip_style(self, html: str) -> str:
+        """Replace the first <style> block with the CSS that could not be inlined"""
+        replacement = f'<style>{self.leftover}</style>' if self.leftover else ''
+        return STYLE_BLOCK.sub(lambda _: replacement, html, count=1)
+
+def inline_css(html: str, css: Optional[str] = None) -> str:
+    """Copy stylesheet rules onto matching elements' style attributes
+
+    Uses the document's own <style> blocks unless css is given (for fragments
+    rendered without a <head>). Inlined rules are removed from the <style>
+    block; whatever cannot be inlined stays there. Existing style attributes win.
+    """
+    own_css = extract_css(html)
+    inliner = CssInliner(css if css is not None else own_css)
+    if not inliner.rules:
+        return html
+
+    html = inliner.feed(html)
+    if own_css:
+        html = inliner.strip_style(html)
+    return html
+
+def _minify(html: str) -> str:
+    pieces = PRESERVE.split(html)
+    out = []
+    # re.split with two groups yields [text, preserved, tag name, text, ...]
+    for index in range(0, len(pieces), 3):
+        text = COMMENT.sub('', pieces[index])
+        text = BETWEEN_TAGS.sub('><', text)
+        out.append(WHITESPACE.sub(' ', text))
+        if index + 1 < len(pieces):
+            out.append(pieces[index + 1])
+    return ''.join(out)
+
+def minify_html(html: str) -> str:
+    """Drop comments and collapse whitespace, leaving <pre>, <textarea> and <script> untouched"""
+    return _minify(html).strip()
+
+def optimize_html(html: str, css: Optional[str] = None) -> str:
+    """Inline CSS, then minify"""
+    return minify_html(inline_css(html, css))
+
+def stream_optimized(chunks: Iterable[str], css: Optional[str] = None) -> Iterator[str]:
+    """Inline CSS and minify a document as it is rendered, yielding pieces of the result
+
+    Matches optimize_html on the joined chunks. Input is buffered only until
+    the <body> starts (the stylesheet has to be known first) and then up to
+    STREAM_FLUSH_CHARS at a time, cut after the last complete tag. <pre>,
+    <textarea> and <script> elements must not straddle a cut.
+    """
+    inliner = None
+    buffer = ''
+    started = False
+
+    def flush(text: str) -> str:
+        nonlocal started
+        # Leading whitespace of the document, or between the previous piece's last tag and this one's first
+        if not started or LEADING_GAP.match(text):
+            text = text.lstrip()
+        started = started or bool(text)
+        return _minify(inliner.feed(text))
+
+    for chunk in chunks:
+        # join rather than +=, which would let a Markup chunk escape the buffered text
+        buffer = ''.join((buffer, chunk))
+        if inliner is None:
+            body = BODY_START.search(buffer)
+            if not body:
+                continue
+            cut = buffer.rfind('>', 0, body.start()) + 1
+            head, buffer = buffer[:cut], buffer[cut:]
+            own_css = extract_css(head)
+            inliner = CssInliner(css if css is not None else own_css)
+            if own_css and inliner.rules:
+                head = inliner.strip_style(head)
+            piece = flush(head)
+            if piece:
+                yield piece
+
+        if len(buffer) >= STREAM_FLUSH_CHARS:
+            cut = buffer.rfind('>') + 1
+            if cut:
+                piece, buffer = flush(buffer[:cut]), buffer[cut:]
+                if piece:
+                    yield piece
+
+    if inliner is None:
+        # No <body> at all: a fragment, handled in one go
+        yield optimize_html(buffer, css)
+        return
+    piece = flush(buffer).rstrip()
+    if piece:
+        yield piece
+
+def encoded_size(html: str) -> int:
+    """Size of the HTML part as sent (UTF-8 bytes)"""
+    return len(html.encode('utf-8'))
+
+def fit_to_budget(categorized: Dict[str, List[Dict]], render: Callable[[Dict[str, List[Dict]]], str],
+                  budget: Optional[int] = None) -> Tuple[str, Dict[str, List[Dict]], List[Dict]]:
+    """Render and optimize, dropping the lowest-scored stories until the HTML fits the budget
+
+    Returns (optimized html, stories that made it in, dropped stories). Among
+    equally scored stories the later ones go first.
+    """
+    budget = budget or Config.EMAIL_BYTE_BUDGET
+    kept = {category: list(articles) for category, articles in categorized.items()}
+    dropped = []
+
+    html = optimize_html(render(kept))
+    size = encoded_size(html)
+    while size > budget:
+        # Position counts across the whole issue, so ties drop the story printed last
+        stories = ((category, article) for category, articles in kept.items() for article in articles)
+        candidates = sorted(
+            ((article.get('score', 0), -position, category, article)
+             for position, (category, article) in enumerate(stories)),
+            key=lambda item: (item[0], item[1])
+        )
+        if not candidates:
+            break
+
+        # Average bytes per story (header and footer included) overestimates what one
+        # story costs, so each round drops slightly too few and never far too many
+        per_story = size / len(candidates)
+        count = max(1, int((size - budget) / per_story))
+        for _, _, category, article in candidates[:count]:
+            kept[category].remove(article)
+            dropped.append(article)
+
+        kept = {category: articles for category, articles in kept.items() if articles}
+        html = optimize_html(render(kept))
+        size = encoded_size(html)
+
+    if dropped:
+        logger.warning(f'Dropped {len(dropped)} lowest-scored stories to fit the {budget} byte budget ({size} bytes)')
+    return html, kept, dropped
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for Nosyt Labs AI Newsletter
+Pooled keep-alive sessions per host with gzip negotiation and default timeouts
+"""
+
+import os
+import threading
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+USER_AGENT = 'NosytLabsNewsletter/1.0 (+https://nosytlabs.com)'
+
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+class PooledSession(requests.Session):
+    """requests.Session that applies a default timeout to every call"""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, pool_maxsize: int = POOL_MAXSIZE):
+        super().__init__()
+        self.default_timeout = timeout
+        self.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        })
+
+        # Only connection failures are retried, so non-idempotent POSTs are never sent twice
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3)
+        )
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+def get_session(url: str) -> requests.Session:
+    """Return the shared pooled session for the host of a URL"""
+    parts = urlsplit(url)
+    key = f'{parts.scheme}://{parts.netloc}'
+
+    session = _sessions.get(key)
+    if session is None:
+        with _lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = PooledSession()
+                _sessions[key] = session
+
+    return session
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the pooled session for its host"""
+    return get_session(url).request(method, url, **kwargs)
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+def put(url: str, **kwargs) -> requests.Response:
+    return request('PUT', url, **kwargs)
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return request('DELETE', url, **kwargs)
+
+def close_all():
+    """Close every pooled session (e.g. on process shutdown)"""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Image Generator for Nosyt Labs AI Newsletter
+Concurrent text-to-image requests with a content-addressed cache of rendered images
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+import aiohttp
+from config import Config
+
+class ImageGenerator:
+    """Renders prompts on the inference endpoint a few at a time, reusing images already rendered
+
+    Images are cached on disk under a hash of the endpoint, prompt and
+    parameters, so a repeated prompt never costs another inference call.
+    """
+
+    def __init__(self, api_url: Optional[str] = None, token: Optional[str] = None, concurrency: Optional[int] = None,
+                 timeout: Optional[float] = None, cache_dir: Optional[str] = None):
+        self.api_url = api_url or Config.IMAGE_API_URL
+        self.token = token
+        self.concurrency = concurrency or Config.IMAGE_GENERATION_CONCURRENCY
+        self.timeout = timeout or Config.IMAGE_GENERATION_TIMEOUT
+        self.cache_dir = cache_dir or Config.IMAGE_CACHE_DIR
+        self.logger = logging.getLogger(__name__)
+
+    def image_key(self, prompt: str, parameters: Dict) -> str:
+        """Hash of everything that decides what the endpoint draws"""
+        payload = json.dumps([self.api_url, prompt, parameters], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.png')
+
+    async def generate(self, prompts: List[str], parameters: Optional[Dict] = None) -> List[Optional[str]]:
+        """Image file path for every prompt, in order, or None where generation failed
+
+        Cached prompts are answered from disk; the rest are requested
+        concurrently, each distinct prompt once.
+        """
+        parameters = parameters or {}
+        keys = [self.image_key(prompt, parameters) for prompt in prompts]
+
+        # Distinct uncached prompts, in first-seen order
+        pending = {}
+        for key, prompt in zip(keys, prompts):
+            if key not in pending and not os.path.exists(self._path(key)):
+                pending[key] = prompt
+
+        cached = len(set(keys)) - len(pending)
+        if cached:
+            self.logger.info(f'{cached} of {len(set(keys))} images served from the image cache')
+
+        if pending:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            semaphore = asyncio.Semaphore(self.concurrency)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            headers = {'Authorization': f'Bearer {self.token}'} if self.token else {}
+
+            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+                await asyncio.gather(*(
+                    self._generate_one(session, semaphore, key, prompt, parameters) for key, prompt in pending.items()
+                ))
+
+        return [self._path(key) if os.path.exists(self._path(key)) else None for key in keys]
+
+    async def _generate_one(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, key: str,
+                            prompt: str, parameters: Dict):
+        """Request one image and store it in the cache; failures are logged and leave no file"""
+        async with semaphore:
+            try:
+                async with session.post(self.api_url, json={'inputs': prompt, 'parameters': parameters}) as response:
+                    response.raise_for_status()
+                    image = await response.read()
+            except asyncio.TimeoutError:
+                self.logger.error(f'Image generation timed out after {self.timeout}s: {prompt[:60]}')
+                return
+            except Exception as e:
+                self.logger.error(f'Image generation error for "{prompt[:60]}": {e}')
+                return
+
+        tmp_path = f'{self._path(key)}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(image)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            self.logger.error(f'Failed to cache image {key}: {e}')
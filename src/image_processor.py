@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Image Processor for Nosyt Labs AI Newsletter
+Resizes and recompresses generated images into a content-addressed static directory
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from config import Config
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Optional: without Pillow images are served as generated
+    Image = None
+
+# Pillow format name and file extension per IMAGE_OUTPUT_FORMAT
+OUTPUT_FORMATS = {
+    'jpeg': ('JPEG', 'jpg'),
+    'webp': ('WEBP', 'webp')
+}
+MIN_QUALITY = 40
+QUALITY_STEP = 10
+
+class ImageProcessor:
+    """Crops images to their display box, recompresses them and stores each distinct result once
+
+    Files are named after a hash of their bytes, and manifest.json maps each
+    source image (by content and settings) to its processed file, so reruns
+    skip work and identical images share one file.
+    """
+
+    def __init__(self, static_dir: Optional[str] = None, base_url: Optional[str] = None,
+                 output_format: Optional[str] = None, workers: Optional[int] = None):
+        self.static_dir = static_dir or Config.IMAGE_STATIC_DIR
+        self.base_url = (base_url if base_url is not None else Config.IMAGE_BASE_URL).rstrip('/')
+        self.output_format = (output_format or Config.IMAGE_OUTPUT_FORMAT).lower()
+        self.workers = workers or Config.IMAGE_PROCESSING_WORKERS
+        self.size = (Config.IMAGE_DISPLAY_WIDTH, Config.IMAGE_DISPLAY_HEIGHT)
+        self.quality = Config.IMAGE_QUALITY
+        self.target_bytes = Config.IMAGE_TARGET_BYTES
+        self.manifest_path = os.path.join(self.static_dir, 'manifest.json')
+        self.logger = logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Dict]:
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f'Ignoring unreadable image manifest {self.manifest_path}: {e}')
+            return {}
+
+    def _source_key(self, data: bytes) -> str:
+        """Hash of the source image and every setting that shapes the output"""
+        settings = json.dumps([self.size, self.output_format, self.quality, self.target_bytes])
+        return hashlib.sha256(data + settings.encode('utf-8')).hexdigest()
+
+    def url(self, filename: str) -> str:
+        """Where an email links a processed image: under IMAGE_BASE_URL, or the local file"""
+        if self.base_url:
+            return f'{self.base_url}/{filename}'
+        return os.path.abspath(os.path.join(self.static_dir, filename))
+
+    def process_all(self, paths: List[Optional[str]]) -> List[Optional[str]]:
+        """URL of the processed version of every image, in order (None stays None)
+
+        Images are processed on a thread pool; Pillow releases the GIL while
+        decoding, resizing and encoding. An image that cannot be processed
+        keeps its original path.
+        """
+        if Image is None:
+            self.logger.warning('Pillow is not installed; images are used as generated')
+            return list(paths)
+        if self.output_format not in OUTPUT_FORMATS:
+            self.logger.warning(f'Unknown IMAGE_OUTPUT_FORMAT {self.output_format!r}; images are used as generated')
+            return list(paths)
+
+        os.makedirs(self.static_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self._process_or_keep, paths))
+        self._save_manifest()
+        return results
+
+    def _process_or_keep(self, path: Optional[str]) -> Optional[str]:
+        if not path:
+            return path
+        try:
+            return self.url(self.process(path))
+        except Exception as e:
+            self.logger.error(f'Image processing failed for {path}: {e}')
+            return path
+
+    def process(self, path: str) -> str:
+        """Processed file name for one image, reusing an earlier result for the same source"""
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        key = self._source_key(data)
+        with self.lock:
+            entry = self.manifest.get(key)
+        if entry and os.path.exists(os.path.join(self.static_dir, entry['file'])):
+            return entry['file']
+
+        output, width, height, quality = self._recompress(data)
+        filename = f"{hashlib.sha256(output).hexdigest()[:20]}.{OUTPUT_FORMATS[self.output_format][1]}"
+        target = os.path.join(self.static_dir, filename)
+        if not os.path.exists(target):
+            tmp_path = f'{target}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(output)
+            os.replace(tmp_path, target)
+
+        with self.lock:
+            self.manifest[key] = {
+                'file': filename,
+                'width': width,
+                'height': height,
+                'format': self.output_format,
+                'quality': quality,
+                'bytes': len(output),
+                'source_bytes': len(data)
+            }
+        return filename
+
+    def _recompress(self, data: bytes):
+        """Crop to the display aspect ratio without upscaling, then encode at the highest quality within the target size"""
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ('RGBA', 'LA', 'P'):
+                # JPEG has no alpha channel; flatten onto white like an email background
+                image = image.convert('RGBA')
+                background = Image.new('RGB', image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel('A'))
+                image = background
+            elif image.mode != 'RGB':
+                image = image.convert('RGB')
+
+            width, height = self.size
+            scale = min(1.0, image.width / width, image.height / height)
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            image = ImageOps.fit(image, size, Image.LANCZOS)
+
+        pillow_format = OUTPUT_FORMATS[self.output_format][0]
+        quality = self.quality
+        while True:
+            buffer = io.BytesIO()
+            image.save(buffer, pillow_format, quality=quality, optimize=True)
+            output = buffer.getvalue()
+            if not self.target_bytes or len(output) <= self.target_bytes or quality - QUALITY_STEP < MIN_QUALITY:
+                return output, image.width, image.height, quality
+            quality -= QUALITY_STEP
+
+    def _save_manifest(self):
+        """Write the manifest back atomically"""
+        with self.lock:
+            try:
+                tmp_path = f'{self.manifest_path}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.manifest, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.manifest_path)
+            except Exception as e:
+                self.logger.warning(f'Failed to save image manifest {self.manifest_path}: {e}')
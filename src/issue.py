@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Issue Model for Nosyt Labs AI Newsletter
+Compact issue representation and an emitter that writes every output format in one pass
+"""
+
+import json
+import re
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from markupsafe import Markup, escape
+
+import renderer
+from config import Config
+from fragment_cache import FragmentCache, get_fragment_cache
+from html_optimizer import fit_to_budget, stream_optimized
+
+FORMATS = ('html', 'text', 'markdown', 'json')
+
+# Page shells rendered around the emitted sections ('json' has none)
+SHELL_TEMPLATES = {
+    'html': 'issue_shell.html.j2',
+    'text': 'issue_shell.txt.j2',
+    'markdown': 'issue_shell.md.j2'
+}
+BODY_MARKER = '\x00body\x00'
+# Characters that would end a Markdown link target early or let it spill into the text
+MARKDOWN_URL_UNSAFE = re.compile(r'[\s()<>]')
+
+class Story:
+    """One story as printed in an issue"""
+
+    __slots__ = ('title', 'summary', 'url', 'source', 'score', 'article')
+
+    def __init__(self, article: Dict):
+        self.title = article.get('title', 'No Title')
+        self.summary = article.get('ai_summary', article.get('description', ''))
+        self.url = article.get('url', '#')
+        self.source = article.get('source', 'Unknown')
+        self.score = article.get('score', 0)
+        # Source dict, which the fragment cache keys its cards on
+        self.article = article
+
+class Section:
+    """Named group of stories, in print order"""
+
+    __slots__ = ('name', 'stories')
+
+    def __init__(self, name: str, stories: List[Story]):
+        self.name = name
+        self.stories = stories
+
+class Issue:
+    """Everything the emitters need to write one issue or edition"""
+
+    __slots__ = ('subject', 'date', 'sections', 'persona')
+
+    def __init__(self, subject: str, date: datetime, sections: List[Section], persona: Optional[Dict] = None):
+        self.subject = subject
+        self.date = date
+        self.sections = sections
+        self.persona = persona
+
+    @classmethod
+    def from_categorized(cls, categorized: Dict[str, List[Dict]], subject: str,
+                         date: Optional[datetime] = None, persona: Optional[Dict] = None) -> 'Issue':
+        sections = [
+            Section(name, [Story(article) for article in articles])
+            for name, articles in categorized.items() if articles
+        ]
+        return cls(subject, date or datetime.now(), sections, persona)
+
+    @classmethod
+    def from_manifest(cls, manifest: Dict) -> 'Issue':
+        """Rebuild an issue from the JSON manifest the emitter wrote for it"""
+        persona = next(
+            (details for details in Config.TARGET_PERSONAS.values() if details['title'] == manifest.get('persona')),
+            None
+        )
+        sections = [
+            Section(section['name'], [
+                Story({
+                    'title': story.get('title'),
+                    'ai_summary': story.get('summary', ''),
+                    'url': story.get('url'),
+                    'source': story.get('source'),
+                    'score': story.get('score', 0)
+                })
+                for story in section.get('stories', [])
+            ])
+            for section in manifest.get('sections', [])
+        ]
+        return cls(manifest.get('subject', ''), datetime.fromisoformat(manifest['date']), sections, persona)
+
+    @property
+    def story_count(self) -> int:
+        return sum(len(section.stories) for section in self.sections)
+
+class IssueEmitter:
+    """Writes HTML, plain text, Markdown and a JSON manifest in a single walk over an issue
+
+    Story cards for HTML and text come from the fragment cache; Markdown lines
+    and manifest entries are built inline. Each format appends to its own
+    buffer and is joined once at the end; stream() yields a single format
+    instead, without holding the whole document.
+    """
+
+    def __init__(self, fragment_cache: Optional[FragmentCache] = None):
+        self.fragment_cache = fragment_cache or get_fragment_cache()
+
+    def _shell(self, fmt: str, issue: Issue) -> Tuple[str, str]:
+        """Page text before and after the sections"""
+        page = renderer.render(SHELL_TEMPLATES[fmt], now=issue.date, persona=issue.persona, body=Markup(BODY_MARKER))
+        head, _, tail = page.partition(BODY_MARKER)
+        return head, tail
+
+    def _section_head(self, fmt: str, section: Section) -> str:
+        if fmt == 'html':
+            return f'<div class="category"><h2>{escape(section.name)}</h2>'
+        if fmt == 'text':
+            return f"{section.name.upper()}\n{'-' * len(section.name)}\n\n"
+        return f'## {section.name}\n\n'
+
+    def _story(self, fmt: str, number: int, story: Story) -> str:
+        if fmt == 'html':
+            return self.fragment_cache.html(story.article)
+        if fmt == 'text':
+            return f'{number}. {self.fragment_cache.text(story.article)}\n'
+        card = f'### [{_markdown_text(story.title)}]({_markdown_url(story.url)})\n\n*{_markdown_text(story.source)}*\n\n'
+        if story.summary:
+            card += f'{_markdown_text(story.summary)}\n\n'
+        return card
+
+    def emit(self, issue: Issue, formats: Tuple[str, ...] = FORMATS) -> Dict[str, str]:
+        """Every requested format of the issue, keyed by format name"""
+        html = 'html' in formats
+        manifest = {
+            'subject': issue.subject,
+            'date': issue.date.isoformat(),
+            'persona': issue.persona['title'] if issue.persona else None,
+            'story_count': issue.story_count,
+            'sections': []
+        } if 'json' in formats else None
+
+        shells = {fmt: self._shell(fmt, issue) for fmt in formats if fmt in SHELL_TEMPLATES}
+        buffers: Dict[str, List[str]] = {fmt: [head] for fmt, (head, _) in shells.items()}
+
+        for section in issue.sections:
+            for fmt, buffer in buffers.items():
+                buffer.append(self._section_head(fmt, section))
+            if manifest is not None:
+                stories = []
+                manifest['sections'].append({'name': section.name, 'stories': stories})
+
+            for number, story in enumerate(section.stories, 1):
+                for fmt, buffer in buffers.items():
+                    buffer.append(self._story(fmt, number, story))
+                if manifest is not None:
+                    stories.append({
+                        'title': story.title,
+                        'url': story.url,
+                        'source': story.source,
+                        'score': story.score,
+                        'summary': story.summary
+                    })
+
+            if html:
+                buffers['html'].append('</div>')
+
+        outputs = {}
+        for fmt, (_, tail) in shells.items():
+            buffers[fmt].append(tail)
+            outputs[fmt] = ''.join(buffers[fmt])
+        if manifest is not None:
+            outputs['json'] = json.dumps(manifest, ensure_ascii=False, default=str)
+        return outputs
+
+    def stream(self, issue: Issue, fmt: str = 'html') -> Iterator[str]:
+        """Yield one format of the issue piece by piece, for writing to a file or response as it renders
+
+        HTML comes out inlined and minified. Nothing is dropped for the byte
+        budget, so this is for previews and archive pages rather than the send.
+        """
+        if fmt not in SHELL_TEMPLATES:
+            raise ValueError(f"Cannot stream {fmt!r}; expected one of {', '.join(SHELL_TEMPLATES)}")
+        chunks = self._chunks(issue, fmt)
+        return stream_optimized(chunks) if fmt == 'html' else chunks
+
+    def _chunks(self, issue: Issue, fmt: str) -> Iterator[str]:
+        head, tail = self._shell(fmt, issue)
+        yield head
+        for section in issue.sections:
+            yield self._section_head(fmt, section)
+            for number, story in enumerate(section.stories, 1):
+                yield self._story(fmt, number, story)
+            if fmt == 'html':
+                yield '</div>'
+        yield tail
+
+    def emit_within_budget(self, categorized: Dict[str, List[Dict]], subject: str, date: Optional[datetime] = None,
+                           persona: Optional[Dict] = None) -> Tuple[Dict[str, str], Dict[str, List[Dict]]]:
+        """Emit every format, dropping the weakest stories until the optimized HTML fits the byte budget
+
+        Returns the outputs (HTML inlined and minified) and the stories that made it in.
+        """
+        date = date or datetime.now()
+        outputs = {}
+
+        def render(stories: Dict[str, List[Dict]]) -> str:
+            outputs.update(self.emit(Issue.from_categorized(stories, subject, date, persona)))
+            return outputs['html']
+
+        outputs['html'], kept, _ = fit_to_budget(categorized, render)
+        return outputs, kept
+
+def _markdown_text(value) -> str:
+    """Escape the characters that would turn story text into Markdown links or emphasis"""
+    text = ' '.join(str(value or '').split())
+    for char in '\\[]*_`':
+        text = text.replace(char, '\\' + char)
+    return text
+
+def _markdown_url(value) -> str:
+    """Percent-encode whitespace, parentheses and angle brackets in a link target"""
+    url = str(value or '#').strip()
+    return MARKDOWN_URL_UNSAFE.sub(
+        lambda match: ''.join(f'%{byte:02X}' for byte in match.group().encode('utf-8')), url
+    )
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Issue Archive for Nosyt Labs AI Newsletter
+Stored issue manifests, streamed back out as web pages or exported in bulk
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from flask import Flask, Response, abort, jsonify, stream_with_context
+
+import renderer
+from config import Config
+from issue import Issue, IssueEmitter
+
+ISSUE_KEY = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Archive page formats by URL suffix
+FORMAT_SUFFIXES = {
+    'html': ('html', 'text/html; charset=utf-8'),
+    'txt': ('text', 'text/plain; charset=utf-8'),
+    'md': ('markdown', 'text/markdown; charset=utf-8')
+}
+
+class IssueArchive:
+    """One JSON manifest per issue date; pages are rendered from them on demand"""
+
+    def __init__(self, directory: Optional[str] = None, emitter: Optional[IssueEmitter] = None):
+        self.directory = directory if directory is not None else Config.ISSUE_ARCHIVE_DIR
+        self.emitter = emitter or IssueEmitter()
+        self.logger = logging.getLogger(__name__)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def save(self, manifest: str) -> Optional[str]:
+        """Store an issue's manifest under its date, replacing an earlier issue from the same day"""
+        if not self.directory:
+            return None
+
+        try:
+            key = json.loads(manifest)['date'][:10]
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f'{self._path(key)}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(manifest)
+            os.replace(tmp_path, self._path(key))
+            return key
+        except Exception as e:
+            self.logger.warning(f'Failed to archive issue: {e}')
+            return None
+
+    def keys(self) -> List[str]:
+        """Archived issue dates, newest first"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        names = (name[:-len('.json')] for name in os.listdir(self.directory) if name.endswith('.json'))
+        return sorted((key for key in names if ISSUE_KEY.match(key)), reverse=True)
+
+    def load(self, key: str) -> Optional[Issue]:
+        """The archived issue for a date, or None if there is none"""
+        if not ISSUE_KEY.match(key) or not os.path.exists(self._path(key)):
+            return None
+        with open(self._path(key), 'r', encoding='utf-8') as f:
+            return Issue.from_manifest(json.load(f))
+
+    def stream(self, key: str, fmt: str = 'html') -> Optional[Iterator[str]]:
+        """Pieces of an archived issue as they render, or None if there is no such issue"""
+        issue = self.load(key)
+        return self.emitter.stream(issue, fmt) if issue is not None else None
+
+    def export(self, output_dir: str, suffix: str = 'html') -> int:
+        """Write every archived issue to output_dir, one at a time, returning how many were written
+
+        Each page is streamed straight to disk, so memory stays at about one
+        issue however large the archive grows.
+        """
+        fmt = FORMAT_SUFFIXES[suffix][0]
+        exported = 0
+        for key in self.keys():
+            try:
+                size = renderer.write_stream(self.stream(key, fmt), os.path.join(output_dir, f'{key}.{suffix}'))
+                self.logger.info(f'Exported {key}.{suffix} ({size} bytes)')
+                exported += 1
+            except Exception as e:
+                self.logger.warning(f'Failed to export issue {key}: {e}')
+        self.emitter.fragment_cache.save()
+        return exported
+
+def create_archive_app(archive: Optional[IssueArchive] = None) -> Flask:
+    """Create Flask app serving archived issues, streamed while they render"""
+    app = Flask(__name__)
+    archive = archive or IssueArchive()
+
+    @app.route('/health', methods=['GET'])
+    def health_check():
+        return jsonify({
+            'status': 'healthy',
+            'issues': len(archive.keys()),
+            'timestamp': datetime.now().isoformat()
+        })
+
+    @app.route('/archive', methods=['GET'])
+    def index():
+        return jsonify({'issues': archive.keys()})
+
+    @app.route('/archive/<key>', defaults={'suffix': 'html'}, methods=['GET'])
+    @app.route('/archive/<key>.<suffix>', methods=['GET'])
+    def issue_page(key: str, suffix: str):
+        if suffix not in FORMAT_SUFFIXES:
+            abort(404)
+        fmt, mimetype = FORMAT_SUFFIXES[suffix]
+        chunks = archive.stream(key, fmt)
+        if chunks is None:
+            abort(404)
+        return Response(stream_with_context(chunks), mimetype=mimetype)
+
+    return app
+
+def main():
+    """Serve the issue archive, or export it to static files"""
+    parser = argparse.ArgumentParser(description='Nosyt Labs AI Newsletter issue archive')
+    parser.add_argument('--export', metavar='DIR', help='write every archived issue to DIR instead of serving')
+    parser.add_argument('--format', choices=sorted(FORMAT_SUFFIXES), default='html', help='export format')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    if args.export:
+        count = IssueArchive().export(args.export, args.format)
+        print(f'📦 Exported {count} issues to {args.export}')
+        return
+
+    host = os.getenv('ARCHIVE_SERVER_HOST', '127.0.0.1')
+    port = int(os.getenv('ARCHIVE_SERVER_PORT', 8766))
+
+    app = create_archive_app()
+
+    print(f'🚀 Starting archive server on {host}:{port}')
+    print(f'📚 Issues: http://{host}:{port}/archive')
+    print(f'❤️ Health check: http://{host}:{port}/health')
+
+    app.run(host=host, port=port, debug=False, threaded=True)
+
+if __name__ == '__main__':
+    main()
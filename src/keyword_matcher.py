@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher for Nosyt Labs AI Newsletter
+Single Aho-Corasick automaton over every keyword table in Config
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Set, Tuple
+
+from config import Config
+
+class KeywordHits:
+    """Keywords found in one text, grouped by (table, group)"""
+
+    def __init__(self):
+        self.matches: Dict[Tuple[str, str], Set[str]] = {}
+
+    def add(self, table: str, group: str, keyword: str):
+        self.matches.setdefault((table, group), set()).add(keyword)
+
+    def has(self, table: str, group: str = None) -> bool:
+        """Whether any keyword of a table (or of one group in it) was found"""
+        if group is not None:
+            return (table, group) in self.matches
+        return any(key[0] == table for key in self.matches)
+
+    def count(self, table: str, group: str) -> int:
+        """Number of distinct keywords of a group that were found"""
+        return len(self.matches.get((table, group), ()))
+
+    def groups(self, table: str) -> Set[str]:
+        return {group for key_table, group in self.matches if key_table == table}
+
+class KeywordMatcher:
+    """Case-insensitive, word-boundary-aware multi-keyword matcher
+
+    All keyword tables are compiled into one automaton, so a single pass over
+    a story's text returns every hit from every table.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._keywords: List[Tuple[str, List[Tuple[str, str]]]] = []
+
+        keyword_ids: Dict[str, int] = {}
+        for table, groups in tables.items():
+            for group, keywords in groups.items():
+                for keyword in keywords:
+                    normalized = keyword.lower().strip()
+                    if not normalized:
+                        continue
+                    if normalized not in keyword_ids:
+                        keyword_ids[normalized] = len(self._keywords)
+                        self._keywords.append((normalized, []))
+                        self._insert(normalized, keyword_ids[normalized])
+                    self._keywords[keyword_ids[normalized]][1].append((table, group))
+
+        self._build_failure_links()
+
+    def _insert(self, keyword: str, keyword_id: int):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(keyword_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    @staticmethod
+    def _is_boundary(text: str, start: int, end: int) -> bool:
+        """Keyword text[start:end] must stand alone as a word (plural 's'/'es' allowed)"""
+        if start > 0 and text[start - 1].isalnum():
+            return False
+        for suffix in ('', 's', 'es'):
+            stop = end + len(suffix)
+            if text.startswith(suffix, end) and (stop >= len(text) or not text[stop].isalnum()):
+                return True
+        return False
+
+    def match(self, text: str) -> KeywordHits:
+        """Scan text once and return every keyword hit"""
+        hits = KeywordHits()
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for keyword_id in output[state]:
+                keyword, owners = self._keywords[keyword_id]
+                end = index + 1
+                if self._is_boundary(text, end - len(keyword), end):
+                    for table, group in owners:
+                        hits.add(table, group, keyword)
+
+        return hits
+
+@lru_cache(maxsize=1)
+def get_keyword_matcher() -> KeywordMatcher:
+    """Matcher over the Config keyword tables, built once per process"""
+    return KeywordMatcher({
+        'business': Config.BUSINESS_KEYWORDS,
+        'category': Config.CATEGORY_KEYWORDS,
+        'topic': Config.TOPIC_KEYWORDS,
+        'ai_relevance': {'ai': Config.AI_RELEVANCE_KEYWORDS}
+    })
@@ -4,13 +4,13 @@ Kit Email Manager for Nosyt Labs AI Newsletter
 Handles subscriber management and email delivery using Kit API
 """
 
-import requests
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional
 import json
 import time
 from config import Config
+import http_client
 
 class KitEmailManager:
     def __init__(self):
@@ -34,7 +34,7 @@ class KitEmailManager:
             
         try:
             url = f'{self.base_url}/subscribers'
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = http_client.get(url, headers=self.headers, timeout=30)
             response.raise_for_status()
             
             data = response.json()
@@ -63,7 +63,7 @@ class KitEmailManager:
                 }
             }
             
-            response = requests.post(url, headers=self.headers, json=payload, timeout=30)
+            response = http_client.post(url, headers=self.headers, json=payload, timeout=30)
             
             if response.status_code == 201:
                 self.logger.info(f'Successfully added subscriber: {email}')
@@ -96,7 +96,7 @@ class KitEmailManager:
                 return False
             
             url = f'{self.base_url}/subscribers/{subscriber_id}'
-            response = requests.delete(url, headers=self.headers, timeout=30)
+            response = http_client.delete(url, headers=self.headers, timeout=30)
             
             if response.status_code == 204:
                 self.logger.info(f'Successfully removed subscriber: {email}')
@@ -125,7 +125,7 @@ class KitEmailManager:
                 }
             }
             
-            response = requests.post(url, headers=self.headers, json=payload, timeout=30)
+            response = http_client.post(url, headers=self.headers, json=payload, timeout=30)
             
             if response.status_code == 201:
                 broadcast_data = response.json()
@@ -148,7 +148,7 @@ class KitEmailManager:
         try:
             url = f'{self.base_url}/broadcasts/{broadcast_id}/send'
             
-            response = requests.post(url, headers=self.headers, timeout=30)
+            response = http_client.post(url, headers=self.headers, timeout=30)
             
             if response.status_code == 204:
                 self.logger.info(f'Successfully sent broadcast: {broadcast_id}')
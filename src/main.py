@@ -7,6 +7,7 @@ Combines news aggregation, newsletter generation, and email delivery
 import logging
 import sys
 import os
+import threading
 from datetime import datetime
 
 # Add src to path
@@ -17,6 +18,7 @@ from newsletter_generator import NewsletterGenerator
 from kit_email_manager import KitEmailManager
 from whop_integration import WhopIntegration
 from config import Config
+import renderer
 
 class NewsletterOrchestrator:
     def __init__(self):
@@ -38,6 +40,9 @@ class NewsletterOrchestrator:
         try:
             self.logger.info(f'🤖 Starting {Config.NEWSLETTER_NAME} generation...')
             
+            # Load the summarization model while news is being collected
+            threading.Thread(target=self.newsletter_generator.warmup, daemon=True).start()
+            
             # Step 1: Collect news from all sources
             self.logger.info('📰 Collecting news from 20+ sources...')
             categorized_stories = self.news_aggregator.get_daily_stories()
@@ -141,15 +146,12 @@ class NewsletterOrchestrator:
                 self.logger.warning('No stories for preview')
                 return False
             
-            # Generate newsletter
-            newsletter_html = self.newsletter_generator.create_newsletter(categorized_stories)
-            
-            # Save preview
+            # Generate newsletter, writing each piece to the preview file as it renders
+            articles = self.newsletter_generator.daily_story_articles(categorized_stories)
             preview_filename = f'newsletter_preview_{datetime.now().strftime("%Y%m%d_%H%M%S")}.html'
-            with open(preview_filename, 'w', encoding='utf-8') as f:
-                f.write(newsletter_html)
+            size = renderer.write_stream(self.newsletter_generator.stream_newsletter(articles), preview_filename)
             
-            self.logger.info(f'✅ Preview saved as: {preview_filename}')
+            self.logger.info(f'✅ Preview saved as: {preview_filename} ({size} bytes)')
             return True
             
         except Exception as e:
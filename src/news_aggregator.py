@@ -4,14 +4,15 @@ Enhanced News Aggregator for Nosyt Labs AI Newsletter
 Supports 20+ global sources with NewsAPI integration
 """
 
-import feedparser
-import requests
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 import re
-import time
 from config import Config
+from dedup import NearDuplicateDetector
+from feed_fetcher import FeedFetcher
+from keyword_matcher import get_keyword_matcher
+import http_client
 
 class NewsAggregator:
     def __init__(self):
@@ -69,7 +70,7 @@ class NewsAggregator:
                 'from': (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = http_client.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -91,14 +92,19 @@ class NewsAggregator:
             return []
 
     def fetch_rss_stories(self):
-        """Fetch from all RSS sources"""
+        """Fetch from all RSS sources concurrently"""
         all_stories = []
         
+        feed_urls = [rss_url for sources in self.rss_sources.values() for rss_url in sources.values()]
+        feeds = FeedFetcher().fetch_all(feed_urls)
+        
         for category, sources in self.rss_sources.items():
             for source_name, rss_url in sources.items():
+                feed = feeds.get(rss_url)
+                if feed is None:
+                    continue
+                
                 try:
-                    feed = feedparser.parse(rss_url)
-                    
                     for entry in feed.entries[:3]:  # Top 3 from each
                         title = self.clean_html(entry.get('title', ''))
                         summary = self.clean_html(entry.get('summary', '') or entry.get('description', ''))
@@ -114,8 +120,6 @@ class NewsAggregator:
                             }
                             all_stories.append(story)
                     
-                    time.sleep(0.5)  # Rate limiting
-                    
                 except Exception as e:
                     self.logger.error(f'RSS error for {source_name}: {e}')
                     continue
@@ -129,22 +133,15 @@ class NewsAggregator:
         text = re.sub(r'<[^>]+>', '', text)
         return ' '.join(text.split()).strip()
 
-    def score_story(self, story):
+    def score_story(self, story, hits=None):
         """Calculate business impact score"""
-        score = 0.0
-        text = f"{story['title']} {story['summary']}".lower()
-        
-        for keyword in Config.BUSINESS_KEYWORDS['high_impact']:
-            if keyword in text:
-                score += 3.0
+        if hits is None:
+            hits = get_keyword_matcher().match(f"{story['title']} {story['summary']}")
         
-        for keyword in Config.BUSINESS_KEYWORDS['medium_impact']:
-            if keyword in text:
-                score += 2.0
-                
-        for keyword in Config.BUSINESS_KEYWORDS['trending_tech']:
-            if keyword in text:
-                score += 1.5
+        score = sum(
+            weight * hits.count('business', group)
+            for group, weight in Config.KEYWORD_WEIGHTS.items()
+        )
         
         # Category weights
         weights = {'breaking_news': 1.2, 'business': 1.5, 'research': 1.0}
@@ -154,9 +151,14 @@ class NewsAggregator:
 
     def categorize_stories(self, stories):
         """Categorize and rank stories"""
-        # Add scores
+        matcher = get_keyword_matcher()
+        story_hits = {}
+        
+        # Add scores (one keyword pass per story serves both scoring and categorization)
         for story in stories:
-            story['score'] = self.score_story(story)
+            hits = matcher.match(f"{story['title']} {story['summary']}")
+            story_hits[id(story)] = hits
+            story['score'] = self.score_story(story, hits)
         
         # Sort by score
         stories.sort(key=lambda x: x['score'], reverse=True)
@@ -175,15 +177,15 @@ class NewsAggregator:
         }
         
         for story in unique_stories:
-            text = f"{story['title']} {story['summary']}".lower()
+            hits = story_hits[id(story)]
             
-            if any(word in text for word in Config.CATEGORY_KEYWORDS['funding_deals']):
+            if hits.has('category', 'funding_deals'):
                 categorized['funding_deals'].append(story)
-            elif any(word in text for word in Config.CATEGORY_KEYWORDS['research']):
+            elif hits.has('category', 'research'):
                 categorized['research'].append(story)
-            elif any(word in text for word in Config.CATEGORY_KEYWORDS['enterprise']):
+            elif hits.has('category', 'enterprise'):
                 categorized['enterprise'].append(story)
-            elif any(word in text for word in Config.CATEGORY_KEYWORDS['developer_tools']):
+            elif hits.has('category', 'developer_tools'):
                 categorized['developer_tools'].append(story)
             elif story['score'] >= 4.0:
                 categorized['breaking_news'].append(story)
@@ -198,7 +200,7 @@ class NewsAggregator:
         return categorized
 
     def remove_duplicates(self, stories):
-        """Remove duplicate stories"""
+        """Remove exact and near-duplicate stories (e.g. syndicated copies)"""
         unique_stories = []
         seen_titles = set()
         
@@ -208,7 +210,10 @@ class NewsAggregator:
                 unique_stories.append(story)
                 seen_titles.add(normalized)
         
-        return unique_stories
+        return NearDuplicateDetector().deduplicate(
+            unique_stories,
+            text=lambda story: f"{story['title']} {story.get('summary', '')}"
+        )
 
     def get_daily_stories(self):
         """Main method to get all stories"""
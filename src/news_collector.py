@@ -4,11 +4,13 @@ News Collector - Gathers AI news from multiple sources
 """
 
 import os
-import requests
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict
-import feedparser
+from dedup import NearDuplicateDetector
+from feed_fetcher import FeedFetcher
+from keyword_matcher import get_keyword_matcher
+import http_client
 
 class NewsCollector:
     """Collects news from various AI and tech sources"""
@@ -53,10 +55,15 @@ class NewsCollector:
         """Collect articles from RSS feeds"""
         articles = []
         
+        # Unchanged feeds come back from the conditional-GET cache without re-parsing
+        feeds = FeedFetcher().fetch_all(self.rss_sources)
+        
         for rss_url in self.rss_sources:
+            feed = feeds.get(rss_url)
+            if feed is None:
+                continue
+            
             try:
-                feed = feedparser.parse(rss_url)
-                
                 for entry in feed.entries[:5]:  # Top 5 from each source
                     articles.append({
                         'title': entry.get('title', ''),
@@ -87,7 +94,7 @@ class NewsCollector:
                 'apiKey': self.newsapi_key
             }
             
-            response = requests.get(url, params=params)
+            response = http_client.get(url, params=params)
             data = response.json()
             
             articles = []
@@ -118,25 +125,22 @@ class NewsCollector:
                 seen_titles.add(title)
                 unique_articles.append(article)
         
-        return unique_articles
+        # Catch syndicated copies whose titles differ slightly
+        return NearDuplicateDetector().deduplicate(
+            unique_articles,
+            text=lambda article: f"{article.get('title', '')} {article.get('description', '')}"
+        )
     
     def _filter_ai_content(self, articles: List[Dict]) -> List[Dict]:
         """Filter articles for AI/tech relevance"""
-        ai_keywords = [
-            'artificial intelligence', 'machine learning', 'deep learning',
-            'neural network', 'ai', 'ml', 'chatgpt', 'openai', 'tech',
-            'technology', 'startup', 'innovation', 'digital', 'automation',
-            'robotics', 'algorithm', 'data science', 'blockchain', 'crypto'
-        ]
+        matcher = get_keyword_matcher()
         
         filtered = []
         for article in articles:
-            title = article.get('title', '').lower()
-            description = article.get('description', '').lower()
-            content = f"{title} {description}"
+            content = f"{article.get('title', '')} {article.get('description', '')}"
             
-            # Check if article contains AI/tech keywords
-            if any(keyword in content for keyword in ai_keywords):
+            # Check if article contains AI/tech keywords (Config.AI_RELEVANCE_KEYWORDS)
+            if matcher.match(content).has('ai_relevance'):
                 filtered.append(article)
         
-        return filtered
\ No newline at end of file
+        return filtered
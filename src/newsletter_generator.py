@@ -5,45 +5,120 @@ Newsletter Generator - Creates beautiful HTML newsletters using AI
 
 import os
 import logging
-from typing import List, Dict
+import threading
+import time
+from typing import List, Dict, Iterator
 from datetime import datetime
-from transformers import pipeline
-import requests
+from config import Config
+from dedup import NearDuplicateDetector
+from keyword_matcher import get_keyword_matcher
+from summary_cache import SummaryCache
+from summarizer_backends import WARMUP_TEXT, backend_model, format_startup_report, load_summarization_pipeline
+from summarizer_inputs import get_input_preparer
+from summarizer_pool import SummarizerPool
+from summarizer_server import SummarizerClient
+from textrank import TextRankSummarizer
+import renderer
+from personalizer import PersonalizedEdition
+from edition_builder import EditionBuilder
+from fragment_cache import get_fragment_cache
+from html_optimizer import fit_to_budget
+from issue import Issue, IssueEmitter
+from issue_archive import IssueArchive
 
 class NewsletterGenerator:
     """Generates AI-powered newsletters"""
     
+    # Generation settings shared by single and batched summarization
+    SUMMARY_PARAMS = {'max_length': 100, 'min_length': 30, 'do_sample': False}
+    
     def __init__(self):
         self.hf_token = os.getenv('HF_TOKEN')
         self.logger = logging.getLogger(__name__)
+        self.backend = Config.SUMMARIZER_BACKEND
+        self.model_name = backend_model(self.backend)
+        self.input_preparer = get_input_preparer(self.model_name)
+        self.extractive_summarizer = TextRankSummarizer()
+        self.summary_cache = SummaryCache() if Config.SUMMARY_CACHE_ENABLED else None
+        self.server_client = SummarizerClient()
+        self.fragment_cache = get_fragment_cache()
+        self.emitter = IssueEmitter(self.fragment_cache)
+        self.archive = IssueArchive(emitter=self.emitter)
         
-        # Initialize Hugging Face pipeline for summarization
+        # Hugging Face pipeline for summarization, loaded on first use
+        self._summarizer = None
+        self._summarizer_loaded = False
+        self._summarizer_lock = threading.Lock()
+        self.startup_timings = {}
+    
+    @property
+    def summarizer(self):
+        """Summarization pipeline (None if it failed to load), loaded on first access"""
+        if not self._summarizer_loaded:
+            with self._summarizer_lock:
+                if not self._summarizer_loaded:
+                    self._summarizer = self._load_summarizer()
+                    self._summarizer_loaded = True
+        return self._summarizer
+    
+    @summarizer.setter
+    def summarizer(self, value):
+        with self._summarizer_lock:
+            self._summarizer = value
+            self._summarizer_loaded = True
+    
+    def _load_summarizer(self):
+        """Import transformers and build the summarization pipeline for the configured backend"""
         try:
-            self.summarizer = pipeline(
-                "summarization",
-                model="facebook/bart-large-cnn",
-                use_auth_token=self.hf_token
-            )
+            return load_summarization_pipeline(self.backend, token=self.hf_token, timings=self.startup_timings)
         except Exception as e:
             self.logger.warning(f"Failed to load summarizer: {e}")
-            self.summarizer = None
+            return None
+    
+    def warmup(self) -> bool:
+        """Load the summarization model and run a first inference now instead of on first use"""
+        if self._server_available():
+            self.logger.info(f"Using warm summarizer server at {self.server_client.url}")
+            return True
+        
+        summarizer = self.summarizer
+        if summarizer is None:
+            return False
+        
+        try:
+            start = time.perf_counter()
+            summarizer(WARMUP_TEXT, **self.SUMMARY_PARAMS)
+            self.startup_timings['first_inference'] = time.perf_counter() - start
+        except Exception as e:
+            self.logger.warning(f"Warm-up inference failed: {e}")
+        
+        self.logger.info(f"Summarizer startup: {format_startup_report(self.startup_timings)}")
+        return True
+    
+    def _server_available(self) -> bool:
+        """True if a resident summarizer server is running the same backend and model"""
+        return self.server_client.available(self.backend, self.model_name)
     
     def generate_newsletter(self, articles: List[Dict]) -> Dict:
         """Generate complete newsletter content"""
         try:
-            # Group articles by category
-            categorized = self._categorize_articles(articles)
+            summarized = self._prepare_issue(articles)
+            subject = f"Nosyt Labs AI Intelligence - {datetime.now().strftime('%B %d, %Y')}"
             
-            # Generate summaries
-            summarized = self._generate_summaries(categorized)
+            # One pass writes every format; stories are dropped if the HTML would be clipped
+            outputs, summarized = self.emitter.emit_within_budget(summarized, subject)
             
             # Create newsletter structure
             newsletter = {
-                'subject': f"Nosyt Labs AI Intelligence - {datetime.now().strftime('%B %d, %Y')}",
-                'html': self._generate_html(summarized),
-                'text': self._generate_text(summarized),
-                'articles_count': len(articles)
+                'subject': subject,
+                'html': outputs['html'],
+                'text': outputs['text'],
+                'markdown': outputs['markdown'],
+                'manifest': outputs['json'],
+                'articles_count': sum(len(v) for v in summarized.values())
             }
+            self.fragment_cache.save()
+            self.archive.save(outputs['json'])
             
             return newsletter
             
@@ -51,6 +126,52 @@ class NewsletterGenerator:
             self.logger.error(f"Newsletter generation failed: {e}")
             return self._generate_fallback_newsletter(articles)
     
+    def create_personalized_edition(self, articles: List[Dict]) -> PersonalizedEdition:
+        """Render the issue once as a skeleton that fills in per-subscriber greetings, sections and links"""
+        return PersonalizedEdition.build(self._prepare_issue(articles))
+    
+    def generate_persona_editions(self, articles: List[Dict]) -> Dict[str, Dict]:
+        """One newsletter per Config.TARGET_PERSONAS entry, sharing a single summarization pass"""
+        return EditionBuilder(self.fragment_cache).build_all(self._prepare_issue(articles))
+    
+    def _prepare_issue(self, articles: List[Dict]) -> Dict[str, List[Dict]]:
+        """Categorize, select and summarize the stories that make up an issue"""
+        # Group articles by category
+        categorized = self._categorize_articles(articles)
+        
+        # Rank, dedup and cap first so the model only sees stories that get printed
+        selected = self._select_articles(categorized)
+        
+        # Generate summaries
+        return self._generate_summaries(selected)
+    
+    def stream_newsletter(self, articles: List[Dict], fmt: str = 'html') -> Iterator[str]:
+        """Yield the issue piece by piece as it renders, for previews written straight to disk
+        
+        Shows every selected story; only generate_newsletter trims to the email byte budget.
+        """
+        subject = f"Nosyt Labs AI Intelligence - {datetime.now().strftime('%B %d, %Y')}"
+        issue = Issue.from_categorized(self._prepare_issue(articles), subject)
+        yield from self.emitter.stream(issue, fmt)
+        self.fragment_cache.save()
+    
+    def create_newsletter(self, categorized_stories: Dict[str, List[Dict]]) -> str:
+        """Generate newsletter HTML from NewsAggregator.get_daily_stories() output"""
+        articles = self.daily_story_articles(categorized_stories)
+        
+        if not articles:
+            return ''
+        
+        return self.generate_newsletter(articles)['html']
+    
+    def daily_story_articles(self, categorized_stories: Dict[str, List[Dict]]) -> List[Dict]:
+        """Flatten NewsAggregator.get_daily_stories() output into generator input"""
+        return [
+            {**story, 'description': story.get('summary', '')}
+            for stories in categorized_stories.values()
+            for story in stories
+        ]
+    
     def _categorize_articles(self, articles: List[Dict]) -> Dict[str, List[Dict]]:
         """Categorize articles by topic"""
         categories = {
@@ -60,173 +181,258 @@ class NewsletterGenerator:
             'Other': []
         }
         
+        matcher = get_keyword_matcher()
+        
         for article in articles:
-            title = article.get('title', '').lower()
-            description = article.get('description', '').lower()
-            content = f"{title} {description}"
+            content = f"{article.get('title', '')} {article.get('description', '')}"
+            hits = matcher.match(content)
+            topics = hits.groups('topic')
             
-            if any(keyword in content for keyword in ['ai', 'artificial intelligence', 'machine learning', 'neural', 'chatgpt']):
-                categories['AI & Machine Learning'].append(article)
-            elif any(keyword in content for keyword in ['startup', 'business', 'funding', 'investment']):
-                categories['Business & Startups'].append(article)
-            elif any(keyword in content for keyword in ['tech', 'innovation', 'digital', 'automation']):
-                categories['Tech Innovation'].append(article)
-            else:
-                categories['Other'].append(article)
+            # Collector articles arrive unscored; aggregator stories keep their score
+            if 'score' not in article:
+                article['score'] = sum(
+                    weight * hits.count('business', group)
+                    for group, weight in Config.KEYWORD_WEIGHTS.items()
+                )
+            
+            # First topic in Config.TOPIC_KEYWORDS order wins
+            topic = next((name for name in Config.TOPIC_KEYWORDS if name in topics), 'Other')
+            categories[topic].append(article)
         
         # Remove empty categories
         return {k: v for k, v in categories.items() if v}
     
+    def _select_articles(self, categorized: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """Pick the stories that fit the issue layout, best first
+
+        Stories are ranked by score across all sections, near-duplicates are
+        dropped, and each section is filled up to its limit in
+        Config.NEWSLETTER_SECTION_LIMITS. Selection stops as soon as the issue
+        holds Config.MAX_STORIES_PER_ISSUE stories.
+        """
+        ranked = sorted(
+            ((category, article) for category, articles in categorized.items() for article in articles),
+            key=lambda item: item[1].get('score', 0),
+            reverse=True
+        )
+        ranked = NearDuplicateDetector().deduplicate(
+            ranked,
+            text=lambda item: f"{item[1].get('title', '')} {item[1].get('description', '')}"
+        )
+        
+        selected = {category: [] for category in categorized}
+        total = 0
+        for category, article in ranked:
+            if total >= Config.MAX_STORIES_PER_ISSUE:
+                break
+            if len(selected[category]) < Config.NEWSLETTER_SECTION_LIMITS.get(category, 3):
+                selected[category].append(article)
+                total += 1
+        
+        skipped = sum(len(v) for v in categorized.values()) - total
+        if skipped:
+            self.logger.info(f"Selected {total} stories for the issue, skipped {skipped} before summarization")
+        
+        return {k: v for k, v in selected.items() if v}
+    
     def _generate_summaries(self, categorized: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
-        """Generate AI summaries for articles"""
-        summarized = {}
+        """Generate AI summaries for articles, highest-priority stories first"""
+        articles = sorted(
+            (article for category_articles in categorized.values() for article in category_articles),
+            key=lambda article: article.get('score', 0),
+            reverse=True
+        )
+        summaries = self._summarize_batch(articles)
+        
+        for article, summary in zip(articles, summaries):
+            article['ai_summary'] = summary
+        
+        return {category: list(category_articles) for category, category_articles in categorized.items()}
+    
+    def _summarize_batch(self, articles: List[Dict]) -> List[str]:
+        """Generate AI summaries for many articles with batched pipeline inference"""
+        summaries = [None] * len(articles)
+        pending = []
+        
+        for index, article in enumerate(articles):
+            content = article.get('content') or article.get('description', '')
+            if self._too_short_to_summarize(content):
+                summaries[index] = content
+                continue
+            
+            # Truncate to the model's token budget on a word boundary
+            content = self.input_preparer.prepare(content)
+            
+            cached = self._cached_summary(content)
+            if cached is not None:
+                summaries[index] = cached
+            else:
+                pending.append((index, content))
+        
+        if pending and self._server_available():
+            self._summarize_with_server(pending, summaries)
+            pending = [(index, text) for index, text in pending if summaries[index] is None]
+        
+        if pending:
+            if Config.SUMMARIZER_WORKERS != 1 and len(pending) >= self._pool_min_articles():
+                self._summarize_with_pool(pending, summaries)
+            elif self.summarizer:
+                self._summarize_in_process(articles, pending, summaries)
+            
+            # Degraded mode: whatever the model did not cover (unavailable, failed or
+            # out of time budget) gets an extractive summary
+            degraded = [index for index, _ in pending if summaries[index] is None]
+            if degraded:
+                self._extractive_summaries(articles, degraded, summaries)
+        
+        self._save_summary_cache()
+        return summaries
+    
+    def _summarize_in_process(self, articles: List[Dict], pending: List, summaries: List[str]):
+        """Run pending (index, text) items through the local pipeline in batches"""
+        deadline = time.monotonic() + Config.SUMMARY_TIME_BUDGET
         
-        for category, articles in categorized.items():
-            summarized[category] = []
+        # Batch inputs of similar token length together so little padding is needed
+        batch_size = max(1, Config.SUMMARY_BATCH_SIZE)
+        for batch in self.input_preparer.batches(pending, batch_size):
+            if time.monotonic() > deadline:
+                self.logger.warning(f"Summarization time budget of {Config.SUMMARY_TIME_BUDGET}s exceeded")
+                break
             
-            for article in articles:
-                summary = self._summarize_article(article)
-                article['ai_summary'] = summary
-                summarized[category].append(article)
+            try:
+                results = self.summarizer(
+                    [text for _, text in batch],
+                    batch_size=len(batch),
+                    truncation=True,
+                    **self.SUMMARY_PARAMS
+                )
+                for (index, text), result in zip(batch, results):
+                    summaries[index] = result['summary_text']
+                    self._store_summary(text, summaries[index])
+            except Exception as e:
+                self.logger.warning(f"Batched summarization failed, retrying articles one by one: {e}")
+                for index, _ in batch:
+                    summaries[index] = self._summarize_article(articles[index])
+    
+    def _pool_min_articles(self) -> int:
+        """Fewest uncached articles worth starting worker processes for
+        
+        Selection caps an issue at Config.MAX_STORIES_PER_ISSUE, so a larger
+        threshold could never be reached; it is clamped to the issue size.
+        """
+        issue_size = max(1, Config.MAX_STORIES_PER_ISSUE)
+        return min(Config.SUMMARIZER_POOL_MIN_ARTICLES or max(1, issue_size // 2), issue_size)
+    
+    def _summarize_with_pool(self, pending: List, summaries: List[str]):
+        """Spread pending (index, text) items over worker processes, one model per worker"""
+        try:
+            results = SummarizerPool(backend=self.backend, token=self.hf_token).summarize(
+                [text for _, text in pending], self.SUMMARY_PARAMS, timeout=Config.SUMMARY_TIME_BUDGET
+            )
+        except Exception as e:
+            self.logger.warning(f"Summarizer pool failed: {e}")
+            results = [None] * len(pending)
+        
+        for (index, text), summary in zip(pending, results):
+            if summary is not None:
+                summaries[index] = summary
+                self._store_summary(text, summary)
+    
+    def _summarize_with_server(self, pending: List, summaries: List[str]):
+        """Send pending (index, text) items to the resident summarizer server in one request"""
+        results = self.server_client.summarize([text for _, text in pending], self.SUMMARY_PARAMS)
+        if results is None:
+            self.logger.warning("Summarizer server unavailable, summarizing locally")
+            return
+        
+        for (index, text), summary in zip(pending, results):
+            if summary:
+                summaries[index] = summary
+                self._store_summary(text, summary)
+    
+    def _extractive_summaries(self, articles: List[Dict], indices: List[int], summaries: List[str]):
+        """Fill summaries[index] with TextRank summaries, all articles in one vectorized pass"""
+        texts = [articles[index].get('content') or articles[index].get('description', '') for index in indices]
+        try:
+            extracted = self.extractive_summarizer.summarize_batch(texts)
+        except Exception as e:
+            self.logger.warning(f"Extractive summarization failed: {e}")
+            extracted = [''] * len(indices)
         
-        return summarized
+        for index, summary in zip(indices, extracted):
+            summaries[index] = summary or self._truncated_description(articles[index])
     
     def _summarize_article(self, article: Dict) -> str:
         """Generate AI summary for single article"""
         try:
-            if not self.summarizer:
-                return article.get('description', '')[:200] + '...'
-            
             content = article.get('content') or article.get('description', '')
-            if len(content) < 50:
+            if self._too_short_to_summarize(content):
                 return content
             
-            # Limit input length for summarization
-            content = content[:1000]
+            # Truncate to the model's token budget on a word boundary
+            content = self.input_preparer.prepare(content)
             
-            summary = self.summarizer(content, max_length=100, min_length=30, do_sample=False)
-            return summary[0]['summary_text']
+            cached = self._cached_summary(content)
+            if cached is not None:
+                return cached
             
-        except Exception as e:
-            self.logger.warning(f"Summarization failed for article: {e}")
-            return article.get('description', '')[:200] + '...'
-    
-    def _generate_html(self, categorized: Dict[str, List[Dict]]) -> str:
-        """Generate beautiful HTML newsletter"""
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="utf-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Nosyt Labs AI Intelligence</title>
-            <style>
-                body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; line-height: 1.6; color: #333; max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px; margin-bottom: 30px; }}
-                .header h1 {{ margin: 0; font-size: 28px; }}
-                .date {{ opacity: 0.9; margin-top: 10px; }}
-                .category {{ margin-bottom: 40px; }}
-                .category h2 {{ color: #667eea; border-bottom: 2px solid #667eea; padding-bottom: 10px; }}
-                .article {{ background: #f8f9fa; border-left: 4px solid #667eea; padding: 20px; margin-bottom: 20px; border-radius: 5px; }}
-                .article h3 {{ margin-top: 0; color: #333; }}
-                .article p {{ color: #666; margin: 10px 0; }}
-                .article a {{ color: #667eea; text-decoration: none; font-weight: 500; }}
-                .article a:hover {{ text-decoration: underline; }}
-                .source {{ font-size: 12px; color: #999; text-transform: uppercase; letter-spacing: 1px; }}
-                .footer {{ text-align: center; margin-top: 40px; padding: 20px; border-top: 1px solid #eee; color: #666; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🤖 Nosyt Labs AI Intelligence</h1>
-                <div class="date">{datetime.now().strftime('%A, %B %d, %Y')}</div>
-            </div>
-        """
-        
-        # Add categories and articles
-        for category, articles in categorized.items():
-            html += f'<div class="category"><h2>{category}</h2>'
+            if not self.summarizer:
+                return self._fallback_summary(article)
             
-            for article in articles:
-                html += f"""
-                <div class="article">
-                    <div class="source">{article.get('source', 'Unknown Source')}</div>
-                    <h3>{article.get('title', 'No Title')}</h3>
-                    <p>{article.get('ai_summary', article.get('description', ''))}</p>
-                    <a href="{article.get('url', '#')}" target="_blank">Read Full Article →</a>
-                </div>
-                """
+            summary = self.summarizer(content, **self.SUMMARY_PARAMS)[0]['summary_text']
+            self._store_summary(content, summary)
+            return summary
             
-            html += '</div>'
-        
-        # Add footer
-        html += f"""
-            <div class="footer">
-                <p>🚀 Powered by <strong>Nosyt Labs</strong></p>
-                <p>Daily AI intelligence delivered to your inbox</p>
-                <p><a href="https://whop.com" style="color: #667eea;">Manage Subscription</a></p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html
+        except Exception as e:
+            self.logger.warning(f"Summarization failed for article: {e}")
+            return self._fallback_summary(article)
     
-    def _generate_text(self, categorized: Dict[str, List[Dict]]) -> str:
-        """Generate plain text version"""
-        text = f"Nosyt Labs AI Intelligence - {datetime.now().strftime('%B %d, %Y')}\n"
-        text += "=" * 50 + "\n\n"
-        
-        for category, articles in categorized.items():
-            text += f"{category.upper()}\n" + "-" * len(category) + "\n\n"
-            
-            for i, article in enumerate(articles, 1):
-                text += f"{i}. {article.get('title', 'No Title')}\n"
-                text += f"   Source: {article.get('source', 'Unknown')}\n"
-                text += f"   {article.get('ai_summary', article.get('description', ''))}\n"
-                text += f"   Read more: {article.get('url', '#')}\n\n"
-        
-        text += "\n" + "=" * 50 + "\n"
-        text += "Powered by Nosyt Labs\n"
-        text += "Daily AI intelligence delivered to your inbox\n"
-        
-        return text
+    def _too_short_to_summarize(self, content: str) -> bool:
+        """Inputs below the minimum token count are used verbatim"""
+        return not content or self.input_preparer.count_tokens(content) < Config.SUMMARY_MIN_INPUT_TOKENS
+    
+    def _summary_cache_key(self, text: str) -> str:
+        # Quantized backends produce different text, so the backend is part of the key
+        return SummaryCache.make_key(text, f'{self.backend}:{self.model_name}', self.SUMMARY_PARAMS)
+    
+    def _cached_summary(self, text: str):
+        """Look up a previously generated summary for this exact model input"""
+        if not self.summary_cache:
+            return None
+        return self.summary_cache.get(self._summary_cache_key(text))
+    
+    def _store_summary(self, text: str, summary: str):
+        if self.summary_cache:
+            self.summary_cache.set(self._summary_cache_key(text), summary)
+    
+    def _save_summary_cache(self):
+        if self.summary_cache:
+            self.summary_cache.save()
+    
+    def _fallback_summary(self, article: Dict) -> str:
+        """Extractive summary used when the model is unavailable or fails"""
+        summaries = [None]
+        self._extractive_summaries([article], [0], summaries)
+        return summaries[0]
+    
+    def _truncated_description(self, article: Dict) -> str:
+        return article.get('description', '')[:200] + '...'
     
     def _generate_fallback_newsletter(self, articles: List[Dict]) -> Dict:
         """Generate simple newsletter if AI processing fails"""
+        # Same byte cap as the full issue, so the fallback is not clipped either
+        html, kept, _ = fit_to_budget({'articles': articles}, lambda stories: self._generate_simple_html(stories['articles']))
         return {
             'subject': f"Nosyt Labs AI Intelligence - {datetime.now().strftime('%B %d, %Y')}",
-            'html': self._generate_simple_html(articles),
-            'text': self._generate_simple_text(articles),
-            'articles_count': len(articles)
+            'html': html,
+            'text': self._generate_simple_text(kept['articles']),
+            'articles_count': len(kept['articles'])
         }
     
     def _generate_simple_html(self, articles: List[Dict]) -> str:
         """Generate simple HTML without AI processing"""
-        html = f"""
-        <h1>Nosyt Labs AI Intelligence</h1>
-        <p>{datetime.now().strftime('%B %d, %Y')}</p>
-        <hr>
-        """
-        
-        for article in articles:
-            html += f"""
-            <div style="margin: 20px 0; padding: 15px; border-left: 3px solid #007cba;">
-                <h3>{article.get('title', 'No Title')}</h3>
-                <p>{article.get('description', '')}</p>
-                <a href="{article.get('url', '#')}">Read More</a>
-            </div>
-            """
-        
-        return html
+        return renderer.render('simple_newsletter.html.j2', articles=articles, now=datetime.now())
     
     def _generate_simple_text(self, articles: List[Dict]) -> str:
         """Generate simple text without AI processing"""
-        text = f"Nosyt Labs AI Intelligence - {datetime.now().strftime('%B %d, %Y')}\n\n"
-        
-        for i, article in enumerate(articles, 1):
-            text += f"{i}. {article.get('title', 'No Title')}\n"
-            text += f"   {article.get('description', '')}\n"
-            text += f"   {article.get('url', '#')}\n\n"
-        
-        return text
\ No newline at end of file
+        return renderer.render('simple_newsletter.txt.j2', articles=articles, now=datetime.now())
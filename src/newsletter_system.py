@@ -11,10 +11,10 @@ from datetime import datetime
 from typing import Dict, List
 
 # Import modules
-from .news_collector import NewsCollector
-from .newsletter_generator import NewsletterGenerator
-from .email_sender import EmailSender
-from .whop_integration import WhopIntegration
+from news_collector import NewsCollector
+from newsletter_generator import NewsletterGenerator
+from email_sender import EmailSender
+from whop_integration import WhopIntegration
 
 def setup_logging():
     """Configure logging"""
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Personalizer for Nosyt Labs AI Newsletter
+Render-once, personalize-many: a compiled skeleton with named slots filled per recipient
+"""
+
+import hashlib
+import hmac
+import logging
+import multiprocessing
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from markupsafe import Markup, escape
+
+import renderer
+from config import Config
+from html_optimizer import encoded_size, extract_css, fit_to_budget, optimize_html
+
+# Slot markers survive autoescaping untouched; NULs are stripped from feed text
+# before rendering, so stories can never forge one
+SLOT_MARKER = '\x00{}\x00'
+SLOT_PATTERN = re.compile('\x00([a-z_]+)\x00')
+
+def slot(name: str) -> Markup:
+    """Placeholder that a template emits where a per-recipient value goes"""
+    return Markup(SLOT_MARKER.format(name))
+
+def tracked_url(url: str) -> Markup:
+    """Link through the click tracker with the recipient's token, or the plain URL without one"""
+    if not Config.LINK_TRACKING_URL:
+        return escape(url)
+    return escape(f'{Config.LINK_TRACKING_URL}?url={quote(url, safe="")}&r=') + slot('recipient')
+
+class Skeleton:
+    """Rendered document split into literal byte chunks around its named slots"""
+
+    def __init__(self, html: str):
+        pieces = SLOT_PATTERN.split(html)
+        self.literals = [piece.encode('utf-8') for piece in pieces[0::2]]
+        self.slots = pieces[1::2]
+
+    def fill(self, values: Dict[str, bytes]) -> bytes:
+        """Join the literals with each slot's value (missing slots are left empty)"""
+        parts = [self.literals[0]]
+        for name, literal in zip(self.slots, self.literals[1:]):
+            parts.append(values.get(name, b''))
+            parts.append(literal)
+        return b''.join(parts)
+
+def recipient_email(recipient: Dict) -> str:
+    """Email address of a Kit subscriber record or a plain recipient dict"""
+    return recipient.get('email_address') or recipient.get('email', '')
+
+def recipient_persona(recipient: Dict) -> Optional[str]:
+    """Persona key from the recipient, or from a Kit custom field"""
+    return recipient.get('persona') or (recipient.get('fields') or {}).get('persona')
+
+def recipient_token(recipient: Dict) -> str:
+    """Opaque per-recipient id for tracked links; the address itself never leaves the email"""
+    if not Config.LINK_TRACKING_SECRET:
+        raise ValueError('LINK_TRACKING_SECRET must be set to sign tracked links')
+    identity = str(recipient.get('id') or recipient_email(recipient))
+    secret = Config.LINK_TRACKING_SECRET.encode('utf-8')
+    return hmac.new(secret, identity.encode('utf-8'), hashlib.sha256).hexdigest()[:16]
+
+class PersonalizedEdition:
+    """Shared issue body rendered once, plus one pre-rendered section per persona"""
+
+    def __init__(self, body: Skeleton, persona_sections: Dict[str, Skeleton]):
+        self.body = body
+        self.persona_sections = persona_sections
+
+    @classmethod
+    def build(cls, categorized: Dict[str, List[Dict]]) -> 'PersonalizedEdition':
+        """Phase one: render the body and the persona sections once, for every recipient"""
+        if Config.LINK_TRACKING_URL and not Config.LINK_TRACKING_SECRET:
+            raise ValueError('LINK_TRACKING_SECRET must be set when LINK_TRACKING_URL is')
+
+        now = datetime.now()
+        categorized = _strip_nul(categorized)
+
+        def render_body(stories: Dict[str, List[Dict]]) -> str:
+            # Cards carry the recipient slot in their links, so they bypass the fragment cache
+            sections = [
+                (category, [
+                    Markup(renderer.render_macro('story_card.html.j2', 'story_card', article,
+                                                 tracked_url(article.get('url', '#'))))
+                    for article in articles
+                ])
+                for category, articles in stories.items()
+            ]
+            return renderer.render('personalized_newsletter.html.j2', sections=sections, now=now, slot=slot)
+
+        def render_sections(stories: Dict[str, List[Dict]]) -> Dict[str, str]:
+            # Sections have no <head>, so they are inlined with the body's stylesheet
+            return {
+                persona: optimize_html(renderer.render(
+                    'persona_section.html.j2',
+                    persona=details, articles=persona_articles(stories, persona), track=tracked_url
+                ), css)
+                for persona, details in Config.TARGET_PERSONAS.items()
+            }
+
+        # The full render supplies the stylesheet and doubles as fit_to_budget's first attempt
+        full_body = render_body(categorized)
+        css = extract_css(full_body)
+
+        # Keep room for the largest persona section and the per-recipient slot values. Sections
+        # from the full set are an upper bound: dropping the lowest-scored stories never adds to them
+        sections = render_sections(categorized)
+        reserve = max((encoded_size(html) for html in sections.values()), default=0) + Config.PERSONALIZATION_SLOT_RESERVE
+        body, kept, dropped = fit_to_budget(
+            categorized,
+            lambda stories: full_body if stories == categorized else render_body(stories),
+            Config.EMAIL_BYTE_BUDGET - reserve
+        )
+
+        # Sections may only link stories the body still carries
+        if dropped:
+            sections = render_sections(kept)
+
+        return cls(Skeleton(body), {persona: Skeleton(html) for persona, html in sections.items()})
+
+    def render(self, recipient: Dict) -> bytes:
+        """Phase two: fill the slots for one recipient"""
+        first_name = _strip_nul(recipient.get('first_name') or '').strip()
+        greeting = f'Hi {first_name},' if first_name else 'Hi there,'
+        values = {'greeting': str(escape(greeting)).encode('utf-8')}
+        if Config.LINK_TRACKING_URL:
+            values['recipient'] = recipient_token(recipient).encode('ascii')
+
+        section = self.persona_sections.get(recipient_persona(recipient))
+        if section is not None:
+            values['persona_section'] = section.fill(values)
+
+        return self.body.fill(values)
+
+    def render_many(self, recipients: List[Dict], workers: Optional[int] = None) -> Iterator[Tuple[str, bytes]]:
+        """Yield (email, html bytes) for every recipient, in input order
+
+        Large lists are spread over a process pool in chunks; small ones are
+        filled in this process, where pool start-up would cost more than it saves.
+        """
+        workers = workers or Config.PERSONALIZATION_WORKERS or os.cpu_count() or 1
+        if workers == 1 or len(recipients) < Config.PERSONALIZATION_POOL_MIN_RECIPIENTS:
+            for recipient in recipients:
+                yield recipient_email(recipient), self.render(recipient)
+            return
+
+        chunk_size = max(1, Config.PERSONALIZATION_CHUNK_SIZE)
+        chunks = [recipients[start:start + chunk_size] for start in range(0, len(recipients), chunk_size)]
+        logging.getLogger(__name__).info(
+            f'Personalizing {len(recipients)} emails in {len(chunks)} chunks across {workers} workers'
+        )
+
+        # Spawned like the summarizer pool, so a loaded model's threads are never forked
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(processes=min(workers, len(chunks)), initializer=_init_worker, initargs=(self,)) as pool:
+            for rendered in pool.imap(_render_chunk, chunks):
+                yield from rendered
+
+def _strip_nul(value):
+    """Copy of story or subscriber data without NUL characters (NewsAPI and Kit JSON may carry \\u0000)"""
+    if isinstance(value, str):
+        return value.replace('\x00', '')
+    if isinstance(value, dict):
+        return {key: _strip_nul(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_strip_nul(item) for item in value]
+    return value
+
+def persona_articles(categorized: Dict[str, List[Dict]], persona: str) -> List[Dict]:
+    """Best-scored stories from the categories a persona cares about"""
+    categories = Config.PERSONA_CATEGORIES.get(persona, [])
+    articles = [article for category in categories for article in categorized.get(category, [])]
+    articles.sort(key=lambda article: article.get('score', 0), reverse=True)
+    return articles[:Config.PERSONA_SECTION_STORIES]
+
+# Edition owned by the current worker process, received once by _init_worker
+_worker_edition = None
+
+def _init_worker(edition: PersonalizedEdition):
+    global _worker_edition
+    _worker_edition = edition
+
+def _render_chunk(recipients: List[Dict]) -> List[Tuple[str, bytes]]:
+    return [(recipient_email(recipient), _worker_edition.render(recipient)) for recipient in recipients]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Template Renderer for Nosyt Labs AI Newsletter
+Precompiled Jinja2 templates with autoescaping and an on-disk bytecode cache
+"""
+
+import hashlib
+import logging
+import os
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from config import Config
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+logger = logging.getLogger(__name__)
+
+def _autoescape(template_name) -> bool:
+    """Escape HTML templates only; plain-text templates are emitted verbatim"""
+    return bool(template_name) and template_name.endswith('.html.j2')
+
+@lru_cache(maxsize=None)
+def get_environment() -> Environment:
+    """Process-wide Jinja2 environment; templates compile once and stay cached in memory"""
+    bytecode_cache = None
+    try:
+        os.makedirs(Config.TEMPLATE_CACHE_DIR, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(Config.TEMPLATE_CACHE_DIR)
+    except OSError as e:
+        logger.warning(f'Template bytecode cache disabled: {e}')
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=_autoescape,
+        bytecode_cache=bytecode_cache,
+        # Templates ship with the code, so skip the per-render modification check
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+def render(template_name: str, **context) -> str:
+    """Render a template from src/templates with the given context"""
+    return get_environment().get_template(template_name).render(**context)
+
+def stream(template_name: str, **context) -> Iterator[str]:
+    """Render a template piece by piece, so output can be written before rendering finishes"""
+    return get_environment().get_template(template_name).generate(**context)
+
+def write_stream(chunks: Iterable[str], path: str) -> int:
+    """Write rendered pieces to a file as they arrive, returning the bytes written
+
+    Goes through a temporary file, so an interrupted render never leaves a
+    half-written page behind.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    written = 0
+    tmp_path = f'{path}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in chunks:
+                data = chunk.encode('utf-8')
+                f.write(data)
+                written += len(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return written
+
+def template_version(*template_names: str) -> str:
+    """Short hash of the templates' source, so caches of their output expire when they change"""
+    digest = hashlib.sha256()
+    for name in template_names:
+        source, _, _ = get_environment().loader.get_source(get_environment(), name)
+        digest.update(source.encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+def render_macro(template_name: str, macro_name: str, *args) -> str:
+    """Call a macro defined in a template, e.g. a single story card"""
+    return str(getattr(get_environment().get_template(template_name).module, macro_name)(*args))
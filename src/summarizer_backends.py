@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Summarizer Backends for Nosyt Labs AI Newsletter
+CPU-friendly model choices (distilled checkpoints, dynamic int8 quantization, ONNX Runtime)
+and a built-in latency / similarity comparison against the baseline model
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from config import Config
+
+# Backend name -> checkpoint, inference runtime and whether Linear layers get
+# dynamic int8 quantization (torch runtime only)
+BACKENDS = {
+    'bart': {'model': 'facebook/bart-large-cnn', 'runtime': 'torch', 'quantize': False},
+    'bart-int8': {'model': 'facebook/bart-large-cnn', 'runtime': 'torch', 'quantize': True},
+    'distilbart': {'model': 'sshleifer/distilbart-cnn-12-6', 'runtime': 'torch', 'quantize': False},
+    'distilbart-int8': {'model': 'sshleifer/distilbart-cnn-12-6', 'runtime': 'torch', 'quantize': True},
+    'bart-onnx': {'model': 'facebook/bart-large-cnn', 'runtime': 'onnx', 'quantize': False},
+    'distilbart-onnx': {'model': 'sshleifer/distilbart-cnn-12-6', 'runtime': 'onnx', 'quantize': False}
+}
+
+BASELINE_BACKEND = 'bart'
+
+# Short input for the first (warm-up) inference, which pays one-off allocation costs
+WARMUP_TEXT = (
+    'OpenAI and Google announced new language models this week. Both companies said the '
+    'models are faster and cheaper to run, and that they will be available to developers '
+    'through their existing APIs before the end of the month.'
+)
+
+logger = logging.getLogger(__name__)
+
+def backend_model(backend: str) -> str:
+    """Checkpoint used by a backend (SUMMARIZER_MODEL overrides it)"""
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown summarizer backend {backend!r}; choose from {", ".join(BACKENDS)}')
+    return Config.SUMMARIZER_MODEL or BACKENDS[backend]['model']
+
+def configure_threads(threads: Optional[int] = None):
+    """Set torch intra-op threads (0 or None keeps torch's default)"""
+    threads = threads if threads is not None else Config.SUMMARIZER_THREADS
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+
+def load_summarization_pipeline(backend: Optional[str] = None, token: Optional[str] = None,
+                                threads: Optional[int] = None, timings: Optional[Dict[str, float]] = None):
+    """Build a CPU summarization pipeline for the given backend
+
+    If a timings dict is passed, the seconds spent in each startup phase are
+    recorded in it: 'import', 'weight_load', plus 'conversion' for a one-off
+    safetensors or ONNX export and 'quantization' for int8 backends.
+    """
+    backend = backend or Config.SUMMARIZER_BACKEND
+    model = backend_model(backend)
+    timings = timings if timings is not None else {}
+
+    if BACKENDS[backend]['runtime'] == 'onnx':
+        try:
+            return _load_onnx_pipeline(model, token, threads, timings)
+        except ImportError as e:
+            logger.warning(f'ONNX Runtime backend unavailable ({e}); falling back to PyTorch')
+
+    start = time.perf_counter()
+    import torch
+    from transformers import pipeline
+    timings['import'] = time.perf_counter() - start
+
+    configure_threads(threads)
+
+    if Config.SUMMARIZER_LOCAL_WEIGHTS:
+        summarizer = _load_local_safetensors_pipeline(model, token, timings)
+    else:
+        start = time.perf_counter()
+        summarizer = pipeline('summarization', model=model, use_auth_token=token, device=-1)
+        timings['weight_load'] = time.perf_counter() - start
+
+    if BACKENDS[backend]['quantize']:
+        start = time.perf_counter()
+        summarizer.model = torch.quantization.quantize_dynamic(
+            summarizer.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        timings['quantization'] = time.perf_counter() - start
+
+    logger.info(f'Loaded summarizer backend {backend} ({model}) with {torch.get_num_threads()} threads')
+    return summarizer
+
+def local_model_dir(model: str) -> str:
+    """Local directory holding a checkpoint's weights in safetensors format"""
+    return os.path.join(Config.LOCAL_MODEL_DIR, model.replace('/', '--'))
+
+# safetensors dtype names -> torch dtype attribute names
+SAFETENSORS_DTYPES = {
+    'F64': 'float64', 'F32': 'float32', 'F16': 'float16', 'BF16': 'bfloat16',
+    'I64': 'int64', 'I32': 'int32', 'I16': 'int16', 'I8': 'int8', 'U8': 'uint8', 'BOOL': 'bool'
+}
+
+def mmap_safetensors(path: str) -> Dict[str, 'torch.Tensor']:
+    """Tensors of a safetensors file as views into one copy-on-write memory map
+
+    Nothing is read up front: pages come from the OS page cache on first
+    touch, and every process mapping the same file shares those pages until
+    it writes to them.
+    """
+    import mmap
+    import struct
+
+    import torch
+
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    header_size = struct.unpack('<Q', mapped[:8])[0]
+    header = json.loads(mapped[8:8 + header_size])
+    header.pop('__metadata__', None)
+    data_start = 8 + header_size
+
+    tensors = {}
+    for name, info in header.items():
+        dtype = getattr(torch, SAFETENSORS_DTYPES[info['dtype']])
+        begin, end = info['data_offsets']
+        if end == begin:
+            tensors[name] = torch.empty(info['shape'], dtype=dtype)
+            continue
+        # frombuffer keeps the map alive for as long as any tensor views it
+        count = (end - begin) // torch.empty((), dtype=dtype).element_size()
+        tensors[name] = torch.frombuffer(mapped, dtype=dtype, count=count, offset=data_start + begin).view(info['shape'])
+    return tensors
+
+def _load_local_safetensors_pipeline(model: str, token: Optional[str] = None,
+                                     timings: Optional[Dict[str, float]] = None):
+    """Summarization pipeline whose weights are memory-mapped from a local safetensors copy
+
+    The checkpoint is converted to safetensors once. Later loads build the
+    model on the meta device and assign it the memory-mapped tensors, so no
+    weights are copied: several newsletter processes (or summarizer pool
+    workers) on one host share a single copy through the page cache. int8
+    backends quantize into new tensors, so each process still holds its own
+    quantized copy.
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM, AutoTokenizer, GenerationConfig, pipeline
+
+    timings = timings if timings is not None else {}
+    model_dir = local_model_dir(model)
+    weights_path = os.path.join(model_dir, 'model.safetensors')
+    if not os.path.exists(weights_path):
+        logger.info(f'Saving {model} as safetensors (one-off) into {model_dir}')
+        start = time.perf_counter()
+        seq2seq = AutoModelForSeq2SeqLM.from_pretrained(model, token=token)
+        tokenizer = AutoTokenizer.from_pretrained(model, token=token)
+        # One file, so a single map covers every tensor
+        seq2seq.save_pretrained(model_dir, safe_serialization=True, max_shard_size='100GB')
+        tokenizer.save_pretrained(model_dir)
+        timings['conversion'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with torch.device('meta'):
+        seq2seq = AutoModelForSeq2SeqLM.from_config(AutoConfig.from_pretrained(model_dir))
+    # assign=True makes the parameters the mapped tensors instead of copying into them
+    seq2seq.load_state_dict(mmap_safetensors(weights_path), strict=False, assign=True)
+    seq2seq.tie_weights()
+
+    if any(tensor.is_meta for tensor in list(seq2seq.parameters()) + list(seq2seq.buffers())):
+        logger.warning(f'{weights_path} does not cover every weight; loading a private copy instead')
+        seq2seq = AutoModelForSeq2SeqLM.from_pretrained(model_dir, use_safetensors=True, low_cpu_mem_usage=True)
+    elif os.path.exists(os.path.join(model_dir, 'generation_config.json')):
+        seq2seq.generation_config = GenerationConfig.from_pretrained(model_dir)
+
+    seq2seq.eval()
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    summarizer = pipeline('summarization', model=seq2seq, tokenizer=tokenizer, device=-1)
+    timings['weight_load'] = time.perf_counter() - start
+    return summarizer
+
+def onnx_export_dir(model: str) -> str:
+    """Local directory holding the exported ONNX encoder/decoder graphs of a checkpoint"""
+    return os.path.join(Config.ONNX_CACHE_DIR, model.replace('/', '--'))
+
+def _load_onnx_pipeline(model: str, token: Optional[str] = None, threads: Optional[int] = None,
+                        timings: Optional[Dict[str, float]] = None):
+    """Summarization pipeline running encoder and decoder on ONNX Runtime's CPU provider
+
+    The checkpoint is exported to ONNX once and cached; later cold starts load
+    the cached graphs instead of the PyTorch weights.
+    """
+    timings = timings if timings is not None else {}
+    start = time.perf_counter()
+    import onnxruntime
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+    timings['import'] = time.perf_counter() - start
+
+    threads = threads if threads is not None else Config.SUMMARIZER_THREADS
+    session_options = onnxruntime.SessionOptions()
+    if threads:
+        session_options.intra_op_num_threads = threads
+
+    export_dir = onnx_export_dir(model)
+    if not os.path.exists(os.path.join(export_dir, 'config.json')):
+        logger.info(f'Exporting {model} to ONNX (one-off) into {export_dir}')
+        start = time.perf_counter()
+        ort_model = ORTModelForSeq2SeqLM.from_pretrained(
+            model, export=True, token=token,
+            provider='CPUExecutionProvider', session_options=session_options
+        )
+        tokenizer = AutoTokenizer.from_pretrained(model, token=token)
+        ort_model.save_pretrained(export_dir)
+        tokenizer.save_pretrained(export_dir)
+        timings['conversion'] = time.perf_counter() - start
+
+    # Loaded back from the export even on the first run, so weight_load always times the cached path
+    start = time.perf_counter()
+    ort_model = ORTModelForSeq2SeqLM.from_pretrained(
+        export_dir, provider='CPUExecutionProvider', session_options=session_options
+    )
+    tokenizer = AutoTokenizer.from_pretrained(export_dir)
+    summarizer = pipeline('summarization', model=ort_model, tokenizer=tokenizer)
+    timings['weight_load'] = time.perf_counter() - start
+    return summarizer
+
+def startup_report(backend: Optional[str] = None, params: Optional[Dict] = None) -> Dict[str, float]:
+    """Cold-start a backend and split the time into import, weight-load, quantization and first-inference phases
+
+    Import time is only meaningful in a fresh process.
+    """
+    from newsletter_generator import NewsletterGenerator
+
+    timings = {}
+    summarizer = load_summarization_pipeline(backend, token=Config.HF_TOKEN, timings=timings)
+
+    start = time.perf_counter()
+    summarizer(WARMUP_TEXT, **(params or NewsletterGenerator.SUMMARY_PARAMS))
+    timings['first_inference'] = time.perf_counter() - start
+
+    timings['total'] = sum(timings.values())
+    return {phase: round(seconds, 2) for phase, seconds in timings.items()}
+
+def format_startup_report(timings: Dict[str, float]) -> str:
+    return ', '.join(f"{phase.replace('_', ' ')} {seconds:.2f}s" for phase, seconds in timings.items())
+
+def _rouge1_f1(candidate: str, reference: str) -> float:
+    """Unigram-overlap F1 between two summaries"""
+    candidate_tokens = candidate.lower().split()
+    reference_tokens = reference.lower().split()
+    if not candidate_tokens or not reference_tokens:
+        return 0.0
+
+    remaining = {}
+    for token in reference_tokens:
+        remaining[token] = remaining.get(token, 0) + 1
+
+    overlap = 0
+    for token in candidate_tokens:
+        if remaining.get(token):
+            overlap += 1
+            remaining[token] -= 1
+
+    if not overlap:
+        return 0.0
+    precision = overlap / len(candidate_tokens)
+    recall = overlap / len(reference_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+def compare_backends(texts: List[str], backends: Optional[List[str]] = None,
+                     params: Optional[Dict] = None) -> Dict[str, Dict]:
+    """Summarize the same texts with each backend and report latency and similarity to the baseline"""
+    from newsletter_generator import NewsletterGenerator
+
+    backends = backends or list(BACKENDS)
+    params = params or NewsletterGenerator.SUMMARY_PARAMS
+    if BASELINE_BACKEND not in backends:
+        backends = [BASELINE_BACKEND] + backends
+
+    outputs = {}
+    report = {}
+    for backend in backends:
+        start = time.perf_counter()
+        summarizer = load_summarization_pipeline(backend, token=Config.HF_TOKEN)
+        load_seconds = time.perf_counter() - start
+
+        # First call pays one-off allocation costs; keep it out of the timing
+        summarizer(texts[0], **params)
+
+        start = time.perf_counter()
+        outputs[backend] = [summarizer(text, **params)[0]['summary_text'] for text in texts]
+        elapsed = time.perf_counter() - start
+
+        report[backend] = {
+            'model': backend_model(backend),
+            'load_seconds': round(load_seconds, 2),
+            'ms_per_article': round(1000 * elapsed / len(texts), 1)
+        }
+        del summarizer
+
+    baseline = outputs[BASELINE_BACKEND]
+    for backend, summaries in outputs.items():
+        scores = [_rouge1_f1(summary, reference) for summary, reference in zip(summaries, baseline)]
+        report[backend]['similarity_to_baseline'] = round(sum(scores) / len(scores), 3)
+
+    return report
+
+def _load_sample_texts(path: Optional[str]) -> List[str]:
+    """Article texts from a saved articles JSON file, or freshly collected news"""
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            articles = json.load(f)
+    else:
+        from news_collector import NewsCollector
+        articles = NewsCollector().collect_daily_news()
+
+    texts = [(a.get('content') or a.get('description') or '')[:1000] for a in articles]
+    return [text for text in texts if len(text) >= 50]
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+
+    # Usage: python src/summarizer_backends.py [articles.json] [backend ...]
+    #        python src/summarizer_backends.py --startup [backend]
+    if '--startup' in sys.argv:
+        chosen = [arg for arg in sys.argv[1:] if arg in BACKENDS]
+        backend_name = chosen[0] if chosen else Config.SUMMARIZER_BACKEND
+        print(f'{backend_name}: {format_startup_report(startup_report(backend_name))}')
+        sys.exit(0)
+
+    sample_path = sys.argv[1] if len(sys.argv) > 1 and os.path.exists(sys.argv[1]) else None
+    chosen = [arg for arg in sys.argv[1:] if arg in BACKENDS] or None
+
+    sample_texts = _load_sample_texts(sample_path)
+    if not sample_texts:
+        print('No article texts to compare')
+        sys.exit(1)
+
+    results = compare_backends(sample_texts, chosen)
+    print(f'Compared {len(sample_texts)} articles')
+    for name, stats in results.items():
+        print(f"{name:16} {stats['ms_per_article']:>8} ms/article  "
+              f"similarity {stats['similarity_to_baseline']:.3f}  load {stats['load_seconds']}s  ({stats['model']})")
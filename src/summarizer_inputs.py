@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Summarizer Inputs for Nosyt Labs AI Newsletter
+Token-budget truncation, length bucketing and a per-model tokenization cache for summarizer inputs
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+
+# Rough tokens-per-word ratio for BPE tokenizers, used when no tokenizer can be loaded
+WORDS_TO_TOKENS = 1.3
+
+class InputPreparer:
+    """Truncates summarizer inputs to a token budget and groups them into length buckets
+
+    Each text is tokenized once. The too-short-to-summarize check, truncation
+    and length bucketing all reuse that result, in the generator and in the
+    summarizer server alike.
+    """
+
+    def __init__(self, model_name: str, max_tokens: Optional[int] = None,
+                 buckets: Optional[List[int]] = None, cache_size: int = 4096):
+        self.model_name = model_name
+        self.max_tokens = max_tokens or Config.SUMMARY_INPUT_TOKENS
+        self.buckets = sorted(buckets or Config.SUMMARY_LENGTH_BUCKETS)
+        self.cache_size = cache_size
+        self.logger = logging.getLogger(__name__)
+        self._cache: 'OrderedDict[str, Tuple[str, int, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._tokenizer = None
+        self._tokenizer_loaded = False
+
+    @property
+    def tokenizer(self):
+        """The model's (fast) tokenizer, or None to fall back to word counts"""
+        if not self._tokenizer_loaded:
+            with self._lock:
+                if not self._tokenizer_loaded:
+                    try:
+                        from transformers import AutoTokenizer
+                        self._tokenizer = AutoTokenizer.from_pretrained(self.model_name, use_fast=True)
+                    except Exception as e:
+                        self.logger.warning(f'Tokenizer unavailable, approximating token counts: {e}')
+                        self._tokenizer = None
+                    self._tokenizer_loaded = True
+        return self._tokenizer
+
+    def _tokenize(self, text: str) -> Tuple[str, int, int]:
+        """Return (truncated text, full token count, truncated token count)"""
+        tokenizer = self.tokenizer
+        if tokenizer is None or not getattr(tokenizer, 'is_fast', False):
+            words = text.split()
+            total = int(len(words) * WORDS_TO_TOKENS)
+            keep = int(self.max_tokens / WORDS_TO_TOKENS)
+            if len(words) <= keep:
+                return text, total, total
+            return ' '.join(words[:keep]), total, int(keep * WORDS_TO_TOKENS)
+
+        encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = encoding['offset_mapping']
+        if len(offsets) <= self.max_tokens:
+            return text, len(offsets), len(offsets)
+
+        # Cut after the last token that fits, then back up to a word boundary
+        cut = offsets[self.max_tokens - 1][1]
+        truncated = text[:cut]
+        if cut < len(text) and not text[cut].isspace():
+            boundary = truncated.rstrip().rfind(' ')
+            if boundary > 0:
+                truncated = truncated[:boundary]
+
+        kept = sum(1 for _, end in offsets[:self.max_tokens] if end <= len(truncated))
+        return truncated.rstrip(), len(offsets), kept
+
+    def _lookup(self, text: str) -> Tuple[str, int, int]:
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return cached
+
+        result = self._tokenize(text)
+
+        with self._lock:
+            self._cache[text] = result
+            # The prepared text is what later steps pass around, so remember it too
+            if result[0] != text:
+                self._cache[result[0]] = (result[0], result[2], result[2])
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def count_tokens(self, text: str) -> int:
+        """Token count of the full text"""
+        return self._lookup(text)[1]
+
+    def prepare(self, text: str) -> str:
+        """Text truncated to the token budget on a word boundary"""
+        return self._lookup(text)[0]
+
+    def bucket_of(self, text: str) -> int:
+        """Smallest length bucket that holds the prepared text"""
+        tokens = self._lookup(text)[2]
+        for boundary in self.buckets:
+            if tokens <= boundary:
+                return boundary
+        return self.buckets[-1]
+
+    def batches(self, items: List[Tuple[int, str]], batch_size: int) -> List[List[Tuple[int, str]]]:
+        """Group (index, prepared text) items into batches of similar token length"""
+        grouped: Dict[int, List[Tuple[int, Tuple[int, str]]]] = {}
+        for item in items:
+            grouped.setdefault(self.bucket_of(item[1]), []).append((self._lookup(item[1])[2], item))
+
+        batches = []
+        for boundary in sorted(grouped):
+            bucket = [item for _, item in sorted(grouped[boundary], key=lambda pair: pair[0])]
+            batches.extend(bucket[start:start + batch_size] for start in range(0, len(bucket), batch_size))
+        return batches
+
+@lru_cache(maxsize=None)
+def get_input_preparer(model_name: str) -> InputPreparer:
+    """Process-wide preparer per model, so every summarization path in the process reuses its cache"""
+    return InputPreparer(model_name)
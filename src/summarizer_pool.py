@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Summarizer Pool for Nosyt Labs AI Newsletter
+Multi-process summarization with one model per worker process
+"""
+
+import logging
+import multiprocessing
+import os
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from summarizer_backends import load_summarization_pipeline
+
+# Pipeline owned by the current worker process, loaded once by _init_worker
+_worker_summarizer = None
+
+def _init_worker(backend: str, token: Optional[str], threads: int):
+    """Load the model once when a worker process starts"""
+    global _worker_summarizer
+    try:
+        _worker_summarizer = load_summarization_pipeline(backend, token=token, threads=threads)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f'Worker {os.getpid()} failed to load summarizer: {e}')
+        _worker_summarizer = None
+
+def _summarize_in_worker(task: Tuple[str, Dict]) -> Optional[str]:
+    """Summarize one text in a worker; None tells the parent to use its fallback"""
+    text, params = task
+    if _worker_summarizer is None:
+        return None
+
+    try:
+        return _worker_summarizer(text, truncation=True, **params)[0]['summary_text']
+    except Exception as e:
+        logging.getLogger(__name__).warning(f'Worker {os.getpid()} summarization failed: {e}')
+        return None
+
+def split_cores(workers: Optional[int] = None, threads_per_worker: Optional[int] = None,
+                cores: Optional[int] = None) -> Tuple[int, int]:
+    """Split the machine's cores between worker processes and torch intra-op threads
+
+    With only one of the two knobs set, the other gets the remaining cores.
+    """
+    cores = cores or os.cpu_count() or 1
+    workers = workers if workers is not None else Config.SUMMARIZER_WORKERS
+    threads_per_worker = threads_per_worker if threads_per_worker is not None else Config.SUMMARIZER_THREADS_PER_WORKER
+
+    if workers <= 0:
+        workers = max(1, cores // max(1, threads_per_worker or 2))
+    if threads_per_worker <= 0:
+        threads_per_worker = max(1, cores // workers)
+
+    return workers, threads_per_worker
+
+class SummarizerPool:
+    """Process pool where each worker loads the summarization model once
+
+    Workers share one copy of the weights through the page cache when
+    SUMMARIZER_LOCAL_WEIGHTS is on (except int8 backends); otherwise each holds its own.
+    """
+
+    def __init__(self, workers: Optional[int] = None, threads_per_worker: Optional[int] = None,
+                 backend: Optional[str] = None, token: Optional[str] = None):
+        self.workers, self.threads_per_worker = split_cores(workers, threads_per_worker)
+        self.backend = backend or Config.SUMMARIZER_BACKEND
+        self.token = token
+        self.logger = logging.getLogger(__name__)
+
+    def summarize(self, texts: List[str], params: Dict, timeout: Optional[float] = None) -> List[Optional[str]]:
+        """Summarize texts across the pool, returning results in input order
+
+        If the pool has not finished within timeout seconds it is terminated
+        and every result is None.
+        """
+        if not texts:
+            return []
+
+        workers = min(self.workers, len(texts))
+        self.logger.info(
+            f'Summarizing {len(texts)} articles with {workers} workers x {self.threads_per_worker} threads'
+        )
+
+        # Spawned (not forked) workers avoid inheriting torch's thread pools in a broken state
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(
+            processes=workers,
+            initializer=_init_worker,
+            initargs=(self.backend, self.token, self.threads_per_worker)
+        ) as pool:
+            # chunksize=1: workers pull one article at a time from the shared task queue
+            result = pool.map_async(_summarize_in_worker, [(text, params) for text in texts], chunksize=1)
+            try:
+                return result.get(timeout)
+            except multiprocessing.TimeoutError:
+                self.logger.warning(f'Summarizer pool did not finish within {timeout}s')
+                return [None] * len(texts)
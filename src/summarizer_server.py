@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Summarizer Server for Nosyt Labs AI Newsletter
+Resident localhost service that keeps the summarization model warm between runs
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import requests
+from flask import Flask, jsonify, request
+
+import http_client
+from config import Config
+from summarizer_backends import backend_model, format_startup_report, load_summarization_pipeline
+from summarizer_inputs import get_input_preparer
+
+def create_summarizer_app(backend: Optional[str] = None, token: Optional[str] = None) -> Flask:
+    """Create Flask app serving batched summaries from one resident model"""
+    app = Flask(__name__)
+    backend = backend or Config.SUMMARIZER_BACKEND
+    model = backend_model(backend)
+    input_preparer = get_input_preparer(model)
+
+    # The model is loaded once at startup; requests take turns on it
+    timings = {}
+    summarizer = load_summarization_pipeline(backend, token=token or Config.HF_TOKEN, timings=timings)
+    summarizer_lock = threading.Lock()
+    app.logger.info(f'Summarizer loaded: {format_startup_report(timings)}')
+
+    @app.route('/health', methods=['GET'])
+    def health_check():
+        return jsonify({
+            'status': 'healthy',
+            'backend': backend,
+            'model': model,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    @app.route('/summarize', methods=['POST'])
+    def summarize():
+        payload = request.get_json(silent=True) or {}
+        texts = payload.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return jsonify({'error': 'texts must be a list of strings'}), 400
+
+        params = payload.get('params') or {}
+        if not isinstance(params, dict):
+            return jsonify({'error': 'params must be an object'}), 400
+        try:
+            batch_size = max(1, int(payload.get('batch_size') or Config.SUMMARY_BATCH_SIZE))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'batch_size must be an integer'}), 400
+        summaries = [None] * len(texts)
+
+        try:
+            items = [(index, input_preparer.prepare(text)) for index, text in enumerate(texts)]
+            with summarizer_lock:
+                for batch in input_preparer.batches(items, batch_size):
+                    results = summarizer(
+                        [text for _, text in batch],
+                        batch_size=len(batch),
+                        truncation=True,
+                        **params
+                    )
+                    for (index, _), result in zip(batch, results):
+                        summaries[index] = result['summary_text']
+        except Exception as e:
+            app.logger.error(f'Summarization error: {e}')
+            return jsonify({'error': 'Summarization failed'}), 500
+
+        return jsonify({'summaries': summaries, 'model': model})
+
+    return app
+
+class SummarizerClient:
+    """Client for a running summarizer server; every method degrades to None if it is not there"""
+
+    def __init__(self, url: Optional[str] = None, timeout: Optional[float] = None):
+        self.url = (url if url is not None else Config.SUMMARIZER_SERVER_URL).rstrip('/')
+        self.timeout = timeout or Config.SUMMARY_TIME_BUDGET
+        self.logger = logging.getLogger(__name__)
+        self._health = None
+        self._health_checked = False
+        self._mismatch_logged = False
+
+    def health(self) -> Optional[Dict]:
+        """Server's health payload (checked once per client), or None if it is not running"""
+        if not self._health_checked:
+            self._health_checked = True
+            if self.url:
+                try:
+                    # A bare request rather than the pooled session, so a missing server costs one refused connect, not retries
+                    response = requests.get(f'{self.url}/health', timeout=Config.SUMMARIZER_SERVER_CONNECT_TIMEOUT)
+                    if response.status_code == 200:
+                        self._health = response.json()
+                except Exception as e:
+                    self.logger.debug(f'Summarizer server not reachable at {self.url}: {e}')
+        return self._health
+
+    def available(self, backend: Optional[str] = None, model: Optional[str] = None) -> bool:
+        """True if the server is running (and serving the given backend and model)
+
+        The backend matters as much as the model: a bart-int8 or bart-onnx server
+        loads the same checkpoint as bart, but its summaries belong under its own
+        summary-cache keys.
+        """
+        health = self.health()
+        if not health:
+            return False
+        if (backend is not None and health.get('backend') != backend) or (model is not None and health.get('model') != model):
+            if not self._mismatch_logged:
+                self._mismatch_logged = True
+                self.logger.info(
+                    f"Summarizer server runs {health.get('backend')}:{health.get('model')}, not {backend}:{model}; "
+                    f"summarizing in-process"
+                )
+            return False
+        return True
+
+    def summarize(self, texts: List[str], params: Dict) -> Optional[List[str]]:
+        """Summaries in input order, or None if the server could not produce them"""
+        try:
+            response = http_client.post(
+                f'{self.url}/summarize',
+                json={'texts': texts, 'params': params, 'batch_size': Config.SUMMARY_BATCH_SIZE},
+                timeout=self.timeout
+            )
+            if response.status_code != 200:
+                self.logger.warning(f'Summarizer server error: {response.status_code} - {response.text}')
+                return None
+            return response.json()['summaries']
+        except Exception as e:
+            self.logger.warning(f'Summarizer server request failed: {e}')
+            # Stop using a server that went away mid-run
+            self._health = None
+            return None
+
+def main():
+    """Run summarizer server"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+    host = os.getenv('SUMMARIZER_SERVER_HOST', '127.0.0.1')
+    port = int(os.getenv('SUMMARIZER_SERVER_PORT', 8765))
+
+    app = create_summarizer_app()
+
+    print(f'🚀 Starting summarizer server on {host}:{port}')
+    print(f'🧠 Summarize endpoint: http://{host}:{port}/summarize')
+    print(f'❤️ Health check: http://{host}:{port}/health')
+
+    app.run(host=host, port=port, debug=False, threaded=True)
+
+if __name__ == '__main__':
+    main()
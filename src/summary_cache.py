@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Summary Cache for Nosyt Labs AI Newsletter
+Disk-backed summaries keyed by a hash of the input text, model and generation parameters
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from config import Config
+
+class SummaryCache:
+    """Persistent summary cache with TTL expiry and an LRU size cap"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: Optional[int] = None,
+                 ttl_seconds: Optional[float] = None):
+        self.path = path or Config.SUMMARY_CACHE_PATH
+        self.max_entries = max_entries or Config.SUMMARY_CACHE_MAX_ENTRIES
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.SUMMARY_CACHE_TTL_DAYS * 86400
+        self.logger = logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        self.entries = self._load()
+        self.dirty = False
+
+    @staticmethod
+    def make_key(text: str, model: str, params: Dict) -> str:
+        """Hash of the normalized input text, model name and generation parameters"""
+        normalized = ' '.join(text.split())
+        payload = json.dumps([model, params, normalized], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Read the cache file, starting empty if it is missing or corrupt"""
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f'Ignoring unreadable summary cache {self.path}: {e}')
+            return {}
+
+    def _expired(self, entry: Dict, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry['created'] > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached summary, or None if it is missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            now = time.time()
+            if self._expired(entry, now):
+                del self.entries[key]
+                self.dirty = True
+                return None
+
+            entry['last_used'] = now
+            self.dirty = True
+            return entry['summary']
+
+    def set(self, key: str, summary: str):
+        """Store a freshly generated summary"""
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {'summary': summary, 'created': now, 'last_used': now}
+            self.dirty = True
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used ones above the size cap"""
+        now = time.time()
+        self.entries = {key: entry for key, entry in self.entries.items() if not self._expired(entry, now)}
+
+        if len(self.entries) > self.max_entries:
+            recent = sorted(self.entries.items(), key=lambda item: item[1]['last_used'], reverse=True)
+            self.entries = dict(recent[:self.max_entries])
+
+    def save(self):
+        """Evict and write the cache back to disk atomically if anything changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+
+            try:
+                self._evict()
+
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+
+                tmp_path = f'{self.path}.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except Exception as e:
+                self.logger.warning(f'Failed to save summary cache {self.path}: {e}')
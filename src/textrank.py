@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Extractive Summarizer for Nosyt Labs AI Newsletter
+NumPy TextRank over TF-IDF sentence similarity, vectorized across a whole batch of articles
+"""
+
+import re
+from typing import List, Optional
+
+import numpy as np
+from config import Config
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=["\'(\[]?[A-Z0-9])')
+WORD = re.compile(r'[a-z0-9]+')
+TAG = re.compile(r'<[^>]+>')
+
+STOPWORDS = frozenset(
+    'a an and are as at be been but by for from has have in into is it its of on or that the '
+    'their this to was were will with which who we you they he she said says also than then'.split()
+)
+
+class TextRankSummarizer:
+    """Picks each article's most central sentences with power-iteration TextRank"""
+
+    def __init__(self, max_sentences: Optional[int] = None, max_sentences_per_article: int = 40,
+                 damping: float = 0.85, iterations: int = 50, tolerance: float = 1e-6):
+        self.max_sentences = max_sentences or Config.EXTRACTIVE_SUMMARY_SENTENCES
+        self.max_sentences_per_article = max_sentences_per_article
+        self.damping = damping
+        self.iterations = iterations
+        self.tolerance = tolerance
+
+    def _split(self, text: str) -> List[str]:
+        text = ' '.join(TAG.sub(' ', text or '').split())
+        sentences = [s.strip() for s in SENTENCE_SPLIT.split(text) if s.strip()]
+        return sentences[:self.max_sentences_per_article]
+
+    def summarize(self, text: str) -> str:
+        return self.summarize_batch([text])[0]
+
+    def summarize_batch(self, texts: List[str]) -> List[str]:
+        """Summarize every text at once: one TF-IDF matrix and one batched power iteration"""
+        documents = [self._split(text) for text in texts]
+        summaries = [' '.join(sentences) for sentences in documents]
+
+        # Only articles longer than the summary need ranking
+        ranked = [d for d, sentences in enumerate(documents) if len(sentences) > self.max_sentences]
+        if not ranked:
+            return summaries
+
+        sentences = [s for d in ranked for s in documents[d]]
+        doc_of = np.repeat(np.arange(len(ranked)), [len(documents[d]) for d in ranked])
+        position = np.concatenate([np.arange(len(documents[d])) for d in ranked])
+
+        # Sentence x term TF-IDF matrix, L2-normalized rows
+        vocabulary = {}
+        rows, cols = [], []
+        for row, sentence in enumerate(sentences):
+            for word in WORD.findall(sentence.lower()):
+                if word not in STOPWORDS:
+                    rows.append(row)
+                    cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+        tf = np.zeros((len(sentences), max(1, len(vocabulary))), dtype=np.float32)
+        np.add.at(tf, (rows, cols), 1.0)
+        idf = np.log((1.0 + len(sentences)) / (1.0 + (tf > 0).sum(axis=0))) + 1.0
+        tfidf = tf * idf
+        norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+        tfidf /= np.where(norms == 0, 1.0, norms)
+
+        # Per-article similarity blocks padded into a (docs, S, S) tensor
+        size = int(position.max()) + 1
+        vectors = np.zeros((len(ranked), size, tfidf.shape[1]), dtype=np.float32)
+        vectors[doc_of, position] = tfidf
+        mask = np.zeros((len(ranked), size), dtype=bool)
+        mask[doc_of, position] = True
+
+        similarity = np.einsum('dik,djk->dij', vectors, vectors)
+        similarity[:, np.arange(size), np.arange(size)] = 0.0
+        similarity *= mask[:, :, None] & mask[:, None, :]
+
+        # Row-stochastic transitions; sentences with no similar neighbour jump uniformly
+        counts = mask.sum(axis=1, keepdims=True).astype(np.float32)
+        out_weight = similarity.sum(axis=2, keepdims=True)
+        uniform = mask[:, None, :] / counts[:, :, None]
+        transition = np.where(out_weight > 0, similarity / np.where(out_weight == 0, 1.0, out_weight), uniform)
+
+        scores = mask / counts
+        teleport = (1.0 - self.damping) * mask / counts
+        for _ in range(self.iterations):
+            updated = teleport + self.damping * np.einsum('dij,di->dj', transition, scores) * mask
+            converged = np.abs(updated - scores).max() < self.tolerance
+            scores = updated
+            if converged:
+                break
+
+        scores = np.where(mask, scores, -np.inf)
+        top = np.argsort(-scores, axis=1)[:, :self.max_sentences]
+        for row, d in enumerate(ranked):
+            keep = sorted(top[row])
+            summaries[d] = ' '.join(documents[d][i] for i in keep)
+
+        return summaries
@@ -6,11 +6,11 @@ Whop Integration - Handles subscription management and webhooks
 import os
 import json
 import logging
-import requests
 from typing import List, Dict, Optional
 from datetime import datetime
 from flask import Flask, request, jsonify
-from .email_sender import EmailSender
+from email_sender import EmailSender
+import http_client
 
 class WhopIntegration:
     """Manages Whop subscriptions and webhooks"""
@@ -31,7 +31,7 @@ class WhopIntegration:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.get(url, headers=headers)
+            response = http_client.get(url, headers=headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -85,7 +85,7 @@ class WhopIntegration:
                 ]
             }
             
-            response = requests.post(url, headers=headers, json=product_data)
+            response = http_client.post(url, headers=headers, json=product_data)
             
             if response.status_code == 201:
                 product = response.json()
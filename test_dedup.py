@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Test Near-Duplicate Detection
+Checks MinHash/LSH deduplication of syndicated and reworded stories
+"""
+
+from dedup import NearDuplicateDetector
+
+def story_text(story):
+    return f"{story['title']} {story['summary']}"
+
+def test_syndicated_copies_dropped():
+    """Copies that differ only in punctuation, case or a trailing source tag are dropped"""
+    stories = [
+        {'id': 1, 'title': 'OpenAI releases GPT-5 with improved reasoning',
+         'summary': 'The new model beats previous versions on math and coding benchmarks.'},
+        {'id': 2, 'title': 'OPENAI RELEASES GPT-5 WITH IMPROVED REASONING!',
+         'summary': 'The new model beats previous versions on math and coding benchmarks'},
+        {'id': 3, 'title': 'OpenAI releases GPT-5 with improved reasoning - Reuters',
+         'summary': 'The new model beats previous versions on math and coding benchmarks.'}
+    ]
+    kept = NearDuplicateDetector(threshold=0.6).deduplicate(stories, story_text)
+
+    assert [story['id'] for story in kept] == [1], [story['id'] for story in kept]
+
+def test_distinct_stories_kept():
+    """Unrelated stories all survive, in their original order"""
+    stories = [
+        {'id': 1, 'title': 'Nvidia unveils new data center GPU', 'summary': 'Twice the memory bandwidth.'},
+        {'id': 2, 'title': 'EU finalizes AI Act enforcement rules', 'summary': 'Fines start next year.'},
+        {'id': 3, 'title': 'Robotics startup raises Series B', 'summary': 'Warehouse automation at scale.'},
+        {'id': 4, 'title': 'Researchers shrink diffusion models', 'summary': 'Distillation cuts sampling steps.'}
+    ]
+    kept = NearDuplicateDetector(threshold=0.6).deduplicate(stories, story_text)
+
+    assert [story['id'] for story in kept] == [1, 2, 3, 4], [story['id'] for story in kept]
+
+def test_signatures_deterministic():
+    """The same text and seed always give the same signature, so runs are reproducible"""
+    text = 'Anthropic and Google announce model safety partnership'
+    first = NearDuplicateDetector(num_perm=64).signature(text)
+    second = NearDuplicateDetector(num_perm=64).signature(text)
+
+    assert len(first) == 64
+    assert (first == second).all()
+    assert not (first == NearDuplicateDetector(num_perm=64).signature('Completely different words here')).all()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test Edition Builder
+Checks persona section filtering and ordering, and that persona editions build concurrently
+"""
+
+import threading
+from datetime import datetime
+
+from config import Config
+from edition_builder import EditionBuilder
+from fragment_cache import FragmentCache
+
+NOW = datetime(2025, 1, 15, 8, 0)
+
+def sample_categorized():
+    return {
+        'AI & Machine Learning': [
+            {'title': 'Sparse attention wins', 'ai_summary': 'Faster.', 'url': 'https://example.com/a', 'source': 'Lab', 'score': 3},
+            {'title': 'Protein model released', 'ai_summary': 'Open.', 'url': 'https://example.com/b', 'source': 'Lab', 'score': 8}
+        ],
+        'Business & Startups': [
+            {'title': 'Robot startup raises $50M', 'ai_summary': 'Series B.', 'url': 'https://example.com/c', 'source': 'News', 'score': 6}
+        ],
+        'Tech Innovation': [],
+        'Other': [
+            {'title': 'Office chair roundup', 'ai_summary': 'Comfy.', 'url': 'https://example.com/d', 'source': 'Blog', 'score': 9}
+        ]
+    }
+
+def test_sections_follow_persona_weights():
+    """Sections come highest weight first, stories by score; empty and zero-weight sections are left out"""
+    builder = EditionBuilder(FragmentCache(path=''))
+    categorized = sample_categorized()
+
+    researchers = builder.order_sections(categorized, 'researchers')
+    assert [category for category, _ in researchers] == ['AI & Machine Learning', 'Business & Startups']
+    assert [article['title'] for article in researchers[0][1]] == ['Protein model released', 'Sparse attention wins']
+
+    investors = builder.order_sections(categorized, 'investors')
+    assert [category for category, _ in investors] == ['Business & Startups', 'AI & Machine Learning', 'Other']
+    assert builder.order_sections(categorized, 'unknown') == []
+
+def test_edition_leaves_out_filtered_topics():
+    """A topic a persona does not follow appears in none of its edition's formats"""
+    edition = EditionBuilder(FragmentCache(path='')).build_edition(sample_categorized(), 'researchers', NOW)
+
+    assert edition['subject'] == 'Nosyt Labs AI Intelligence for Researchers - January 15, 2025'
+    assert edition['articles_count'] == 3
+    for fmt in ('html', 'text', 'markdown'):
+        assert 'Office chair roundup' not in edition[fmt], fmt
+        assert 'Protein model released' in edition[fmt], fmt
+    assert edition['html'].index('Protein model released') < edition['html'].index('Robot startup raises $50M')
+
+def test_editions_built_concurrently(monkeypatch):
+    """Every persona edition is in flight at once, shares story cards and matches a one-at-a-time build"""
+    builder = EditionBuilder(FragmentCache(path=''))
+    personas = list(Config.TARGET_PERSONAS)
+    # Each build waits for all the others to start, so a sequential build_all breaks the barrier
+    barrier = threading.Barrier(len(personas), timeout=5)
+    build_edition = builder.build_edition
+
+    def build_together(categorized, persona, now=None):
+        barrier.wait()
+        return build_edition(categorized, persona, NOW)
+
+    monkeypatch.setattr(builder, 'build_edition', build_together)
+    editions = builder.build_all(sample_categorized())
+
+    assert list(editions) == personas
+    assert [edition['persona'] for edition in editions.values()] == personas
+    assert builder.fragment_cache.hits > 0, 'story cards were not reused between editions'
+    assert editions['investors']['articles_count'] == 4 and editions['researchers']['articles_count'] == 3
+
+    sequential = EditionBuilder(FragmentCache(path=''))
+    for persona in personas:
+        assert editions[persona]['html'] == sequential.build_edition(sample_categorized(), persona, NOW)['html'], persona
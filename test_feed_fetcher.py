@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Test Feed Fetcher
+Runs the concurrent feed fetcher against a local stand-in feed host
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from feed_cache import FeedCache
+from feed_fetcher import FeedFetcher
+
+def rss(title, items):
+    entries = ''.join(
+        f'<item><title>{item}</title><link>https://example.com/{index}</link><description>{item} story</description></item>'
+        for index, item in enumerate(items)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>{title}</title>{entries}</channel></rss>'.encode()
+
+class StandInFeedHost:
+    """Local feed host; routes map a path to its status, body, ETag and response delay"""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                route = host.routes[self.path]
+                with host.lock:
+                    host.requests.append((self.path, dict(self.headers)))
+                    host.in_flight += 1
+                    host.max_in_flight = max(host.max_in_flight, host.in_flight)
+                time.sleep(route.get('delay', 0))
+                with host.lock:
+                    host.in_flight -= 1
+
+                etag = route.get('etag')
+                if route.get('status') == 304 or (etag and self.headers.get('If-None-Match') == etag):
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                body = route.get('body', b'')
+                self.send_response(route.get('status', 200))
+                self.send_header('Content-Type', 'application/rss+xml')
+                self.send_header('Content-Length', str(len(body)))
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base = f'http://127.0.0.1:{self.server.server_port}'
+
+    def url(self, path):
+        return self.base + path
+
+    def requests_for(self, path):
+        return [headers for requested, headers in self.requests if requested == path]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def titles(feed):
+    return [entry.title for entry in feed.entries]
+
+def test_not_modified_served_from_cache(tmp_path):
+    """A second poll sends the ETag back and rebuilds the unchanged feed from the cache"""
+    routes = {'/ai.xml': {'body': rss('AI Wire', ['GPU launch', 'Model release']), 'etag': '"v1"'}}
+    cache_path = os.path.join(tmp_path, 'feeds.json')
+
+    with StandInFeedHost(routes) as host:
+        url = host.url('/ai.xml')
+        first = FeedFetcher(cache=FeedCache(cache_path)).fetch_all([url])
+        second = FeedFetcher(cache=FeedCache(cache_path)).fetch_all([url])
+
+    first_request, second_request = host.requests_for('/ai.xml')
+    assert 'If-None-Match' not in first_request
+    assert second_request['If-None-Match'] == '"v1"'
+    assert titles(second[url]) == titles(first[url]) == ['GPU launch', 'Model release']
+    assert second[url].feed.title == 'AI Wire'
+
+def test_not_modified_without_cached_items_refetches(tmp_path):
+    """Validators with no cached items would drop the feed on 304, so it is fetched again unconditionally"""
+    routes = {'/ai.xml': {'body': rss('AI Wire', ['GPU launch']), 'etag': '"v1"'}}
+    cache = FeedCache(os.path.join(tmp_path, 'feeds.json'))
+
+    with StandInFeedHost(routes) as host:
+        url = host.url('/ai.xml')
+        cache.entries[url] = {'etag': '"v1"', 'last_modified': None}
+        feeds = FeedFetcher(cache=cache).fetch_all([url])
+
+    conditional, unconditional = host.requests_for('/ai.xml')
+    assert conditional['If-None-Match'] == '"v1"'
+    assert 'If-None-Match' not in unconditional
+    assert titles(feeds[url]) == ['GPU launch']
+    assert cache.entries[url]['items'][0]['title'] == 'GPU launch'
+
+def test_not_modified_without_cache(caplog):
+    """A fetcher with no cache treats a stray 304 as a failed feed instead of crashing"""
+    routes = {
+        '/stray.xml': {'status': 304},
+        '/ai.xml': {'body': rss('AI Wire', ['GPU launch'])}
+    }
+
+    with StandInFeedHost(routes) as host:
+        feeds = FeedFetcher(use_cache=False).fetch_all([host.url('/stray.xml'), host.url('/ai.xml')])
+
+    assert list(feeds) == [host.url('/ai.xml')]
+    assert len(host.requests_for('/stray.xml')) == 1
+    assert 'answered 304 to an unconditional request' in caplog.text, caplog.text
+
+def test_feeds_fetched_concurrently():
+    """Slow feeds download in parallel, never more than the concurrency limit at once"""
+    routes = {f'/feed{index}.xml': {'body': rss(f'Feed {index}', [f'Story {index}']), 'delay': 0.3}
+              for index in range(6)}
+
+    with StandInFeedHost(routes) as host:
+        urls = [host.url(path) for path in routes]
+        started = time.perf_counter()
+        feeds = FeedFetcher(concurrency=3, use_cache=False).fetch_all(urls)
+        elapsed = time.perf_counter() - started
+
+    assert list(feeds) == urls
+    assert [titles(feeds[url]) for url in urls] == [[f'Story {index}'] for index in range(6)]
+    assert host.max_in_flight == 3, host.max_in_flight
+    # Six 0.3s responses, three at a time: two rounds rather than six
+    assert elapsed < 1.5, elapsed
+
+def test_slow_feed_times_out():
+    """A feed slower than the per-request timeout is dropped without holding up the rest"""
+    routes = {
+        '/slow.xml': {'body': rss('Slow', ['Late story']), 'delay': 2},
+        '/fast.xml': {'body': rss('Fast', ['On-time story'])}
+    }
+
+    with StandInFeedHost(routes) as host:
+        started = time.perf_counter()
+        feeds = FeedFetcher(timeout=0.5, use_cache=False).fetch_all([host.url('/slow.xml'), host.url('/fast.xml')])
+        elapsed = time.perf_counter() - started
+
+    assert list(feeds) == [host.url('/fast.xml')]
+    assert elapsed < 1.5, elapsed
+
+def test_failing_feeds_isolated(tmp_path):
+    """Server errors and unreachable hosts are left out; the healthy feeds still arrive and are cached"""
+    routes = {
+        '/broken.xml': {'status': 500, 'body': b'oops'},
+        '/ai.xml': {'body': rss('AI Wire', ['GPU launch'])}
+    }
+    cache = FeedCache(os.path.join(tmp_path, 'feeds.json'))
+
+    with StandInFeedHost(routes) as host:
+        urls = [host.url('/broken.xml'), 'http://127.0.0.1:1/closed.xml', host.url('/ai.xml')]
+        feeds = FeedFetcher(cache=cache).fetch_all(urls)
+
+    assert list(feeds) == [host.url('/ai.xml')]
+    assert list(cache.entries) == [host.url('/ai.xml')]
+    assert os.path.exists(cache.path)
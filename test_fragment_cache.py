@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test Fragment Cache
+Checks that story cards are reused until the story or its template changes
+"""
+
+import os
+import tempfile
+
+from fragment_cache import FragmentCache
+
+def story(**fields):
+    article = {'title': 'Sparse attention wins', 'ai_summary': 'Faster and cheaper.',
+               'url': 'https://example.com/a', 'source': 'Lab Blog', 'score': 7}
+    article.update(fields)
+    return article
+
+def test_hits_and_misses():
+    """Identical stories hit; any displayed field change misses; score does not matter"""
+    # Empty path keeps the cache in memory
+    cache = FragmentCache(path='')
+    first = cache.html(story())
+
+    assert 'Sparse attention wins' in first
+    assert cache.html(story(score=1)) == first
+    assert cache.text(story()) and (cache.hits, cache.misses) == (2, 1), (cache.hits, cache.misses)
+
+    for field in ('title', 'ai_summary', 'url', 'source'):
+        assert cache.html(story(**{field: 'changed'})) != first, field
+    assert cache.misses == 5, cache.misses
+
+def test_template_invalidation():
+    """A new template version makes every stored card a miss"""
+    cache = FragmentCache(path='')
+    key = cache.story_key(story())
+    cache.html(story())
+
+    cache.template_version = 'edited-template'
+    assert cache.story_key(story()) != key
+    cache.html(story())
+    assert cache.misses == 2, cache.misses
+
+def test_persistence_and_cap():
+    """Cards survive a restart; saving keeps only the most recently used ones"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'fragments.json')
+        cache = FragmentCache(path=path, max_entries=2)
+        for index, title in enumerate(('A', 'B', 'C')):
+            cache.html(story(title=title))
+            cache.entries[cache.story_key(story(title=title))]['last_used'] = 1000 + index
+        cache.entries[cache.story_key(story(title='A'))]['last_used'] = 2000  # recently read
+        cache.save()
+
+        reloaded = FragmentCache(path=path)
+        assert len(reloaded.entries) == 2, len(reloaded.entries)
+        reloaded.html(story(title='A'))
+        reloaded.html(story(title='C'))
+        reloaded.html(story(title='B'))
+        assert (reloaded.hits, reloaded.misses) == (2, 1), (reloaded.hits, reloaded.misses)
+
+        in_memory = FragmentCache(path='')
+        in_memory.html(story())
+        in_memory.save()
+        assert os.listdir(directory) == ['fragments.json'], os.listdir(directory)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test HTML Optimizer
+Checks CSS inlining, minification, streaming and the email byte budget
+"""
+
+import html_optimizer
+import newsletter_generator
+from config import Config
+from fragment_cache import FragmentCache
+from html_optimizer import encoded_size, fit_to_budget, inline_css, minify_html, optimize_html, stream_optimized
+from newsletter_generator import NewsletterGenerator
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        /* layout */
+        body { margin: 0 }
+        .article { padding: 10px; }
+        .article h3 { color: red }
+        h3 { color: blue; font-size: 18px }
+        a:hover { color: green }
+        @media (max-width: 600px) { .article { padding: 4px } }
+    </style>
+</head>
+<body>
+    <div class="article">
+        <h3 style="font-weight: bold">Inside</h3>
+    </div>
+    <h3>Outside</h3>
+    <!-- tracking note -->
+    <pre>  keep   this  </pre>
+</body>
+</html>
+"""
+
+def test_inline_css():
+    """Simple rules are inlined by specificity; pseudo-classes and @media stay in <style>"""
+    html = inline_css(PAGE)
+
+    assert '<div class="article" style="padding:10px">' in html, html
+    assert '<h3 style="color:blue;font-size:18px;color:red;font-weight: bold">Inside</h3>' in html, html
+    assert '<h3 style="color:blue;font-size:18px">Outside</h3>' in html, html
+    assert 'a:hover{color:green}' in html and '@media (max-width: 600px)' in html, html
+    assert '.article h3' not in html and 'layout' not in html, html
+
+def test_specificity_counts_tags_and_classes():
+    """tag.class outranks .class, which outranks tag, whatever order the rules come in"""
+    css = '<style>h3.title { color: red } .title { color: blue } h3 { color: green }</style>'
+    html = inline_css(f'<html><head>{css}</head><body><h3 class="title">T</h3></body></html>')
+
+    assert '<h3 class="title" style="color:green;color:blue;color:red">' in html, html
+
+def test_minify_preserves_pre():
+    """Comments and whitespace go; <pre> contents are left alone"""
+    html = minify_html(PAGE)
+
+    assert 'tracking note' not in html
+    assert '\n' not in html and '</div><h3>' in html, html
+    assert '<pre>  keep   this  </pre>' in html, html
+
+def test_stream_matches_optimize():
+    """Streaming in small pieces gives the same document as optimizing it whole"""
+    expected = optimize_html(PAGE)
+    flush_chars = html_optimizer.STREAM_FLUSH_CHARS
+    html_optimizer.STREAM_FLUSH_CHARS = 40
+    try:
+        chunks = [PAGE[i:i + 7] for i in range(0, len(PAGE), 7)]
+        pieces = list(stream_optimized(chunks))
+    finally:
+        html_optimizer.STREAM_FLUSH_CHARS = flush_chars
+
+    assert len(pieces) > 1, pieces
+    assert ''.join(pieces) == expected, (''.join(pieces), expected)
+
+def render(categorized):
+    stories = ''.join(
+        f'<div class="article"><h3>{article["title"]}</h3><p>{"x" * 200}</p></div>'
+        for articles in categorized.values() for article in articles
+    )
+    return f'<html><body><h1>Issue</h1>{stories}</body></html>'
+
+def test_fit_to_budget():
+    """The lowest-scored stories are dropped until the HTML fits; later stories go first on ties"""
+    categorized = {
+        'Research': [{'title': 'R1', 'score': 9}, {'title': 'R2', 'score': 2}],
+        'Funding': [{'title': 'F1', 'score': 2}, {'title': 'F2', 'score': 5}]
+    }
+    full = optimize_html(render(categorized))
+    budget = encoded_size(full) - 100
+
+    html, kept, dropped = fit_to_budget(categorized, render, budget)
+
+    assert encoded_size(html) <= budget, (encoded_size(html), budget)
+    assert [article['title'] for article in dropped] == ['F1'], dropped
+    assert [article['title'] for article in kept['Research']] == ['R1', 'R2'], kept
+    assert html == optimize_html(render(kept))
+
+    html, kept, dropped = fit_to_budget(categorized, render, len(full))
+    assert dropped == [] and html == full
+
+def test_fallback_newsletter_within_budget(monkeypatch, tmp_path):
+    """The no-AI fallback drops stories for the byte cap too, and its text version matches"""
+    monkeypatch.setattr(Config, 'SUMMARY_CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'ISSUE_ARCHIVE_DIR', str(tmp_path))
+    monkeypatch.setattr(newsletter_generator, 'get_fragment_cache', lambda: FragmentCache(path=''))
+    generator = NewsletterGenerator()
+    articles = [{'title': f'Story {index}', 'description': 'x' * 400, 'url': f'https://example.com/{index}'}
+                for index in range(5)]
+    full = generator._generate_fallback_newsletter(articles)
+
+    monkeypatch.setattr(Config, 'EMAIL_BYTE_BUDGET', encoded_size(full['html']) - 200)
+    newsletter = generator._generate_fallback_newsletter(articles)
+
+    assert encoded_size(newsletter['html']) <= Config.EMAIL_BYTE_BUDGET
+    assert newsletter['articles_count'] == 4 and full['articles_count'] == 5
+    assert 'Story 3' in newsletter['html'] and 'Story 4' not in newsletter['html']
+    assert 'Story 4' not in newsletter['text'] and 'Story 4' in full['text']
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test AI Image Generation
+Runs the image generator against a local stand-in for the Stable Diffusion endpoint
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from image_generator import ImageGenerator
+
+FAKE_PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+
+class StandInEndpoint:
+    """Local inference endpoint that counts requests and how many run at once"""
+
+    def __init__(self, delay: float = 0.2, fail_prompts=()):
+        self.delay = delay
+        self.fail_prompts = set(fail_prompts)
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with endpoint.lock:
+                    endpoint.requests += 1
+                    endpoint.in_flight += 1
+                    endpoint.max_in_flight = max(endpoint.max_in_flight, endpoint.in_flight)
+                time.sleep(endpoint.delay)
+                with endpoint.lock:
+                    endpoint.in_flight -= 1
+
+                if any(prompt.encode() in body for prompt in endpoint.fail_prompts):
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+                self.send_header('Content-Length', str(len(FAKE_PNG)))
+                self.end_headers()
+                self.wfile.write(FAKE_PNG)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/generate'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def test_concurrent_generation():
+    """Distinct prompts are requested in parallel, never more than the concurrency limit"""
+    with StandInEndpoint(delay=0.3) as endpoint, tempfile.TemporaryDirectory() as cache_dir:
+        generator = ImageGenerator(api_url=endpoint.url, concurrency=3, timeout=10, cache_dir=cache_dir)
+        prompts = [f'prompt {i}' for i in range(6)]
+
+        started = time.perf_counter()
+        paths = asyncio.run(generator.generate(prompts, {'width': 512}))
+        elapsed = time.perf_counter() - started
+
+        assert all(path and os.path.exists(path) for path in paths), paths
+        assert endpoint.requests == 6, endpoint.requests
+        assert endpoint.max_in_flight == 3, endpoint.max_in_flight
+        # Six 0.3s requests, three at a time: two rounds rather than six
+        assert elapsed < 1.5, elapsed
+
+def test_image_cache():
+    """Repeated prompts are served from the cache; changed parameters are not"""
+    with StandInEndpoint(delay=0) as endpoint, tempfile.TemporaryDirectory() as cache_dir:
+        generator = ImageGenerator(api_url=endpoint.url, cache_dir=cache_dir)
+
+        first = asyncio.run(generator.generate(['robot', 'robot', 'chip'], {'width': 512}))
+        assert endpoint.requests == 2, endpoint.requests
+        assert first[0] == first[1]
+
+        second = asyncio.run(generator.generate(['chip', 'robot'], {'width': 512}))
+        assert endpoint.requests == 2, endpoint.requests
+        assert second == [first[2], first[0]]
+
+        asyncio.run(generator.generate(['robot'], {'width': 768}))
+        assert endpoint.requests == 3, endpoint.requests
+
+def test_failures_and_timeouts():
+    """Failed or slow requests come back as None and are not cached"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with StandInEndpoint(delay=0, fail_prompts=['broken']) as endpoint:
+            generator = ImageGenerator(api_url=endpoint.url, cache_dir=cache_dir)
+            paths = asyncio.run(generator.generate(['fine', 'broken']))
+            assert paths[0] and paths[1] is None, paths
+
+        with StandInEndpoint(delay=1) as endpoint:
+            generator = ImageGenerator(api_url=endpoint.url, timeout=0.2, cache_dir=cache_dir)
+            paths = asyncio.run(generator.generate(['slow']))
+            assert paths == [None], paths
+
+        assert len(os.listdir(cache_dir)) == 1, os.listdir(cache_dir)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test Image Processor
+Checks cropping to the display box, the quality step-down, content-addressed files and manifest reuse
+"""
+
+import io
+import json
+import os
+import random
+
+import pytest
+
+import image_processor
+from config import Config
+from image_processor import ImageProcessor
+
+Image = pytest.importorskip('PIL.Image')
+
+def save_image(path, size, seed=0, mode='RGB'):
+    """Noise image, so JPEG cannot shrink it much and quality has to do the work"""
+    pixels = random.Random(seed).randbytes(size[0] * size[1] * len(mode))
+    Image.frombytes(mode, size, pixels).save(path, 'PNG')
+    return str(path)
+
+def jpeg_size(path, quality):
+    with Image.open(path) as image:
+        buffer = io.BytesIO()
+        image.convert('RGB').resize((700, 200)).save(buffer, 'JPEG', quality=quality, optimize=True)
+        return len(buffer.getvalue())
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'IMAGE_DISPLAY_WIDTH', 700)
+    monkeypatch.setattr(Config, 'IMAGE_DISPLAY_HEIGHT', 200)
+    monkeypatch.setattr(Config, 'IMAGE_QUALITY', 80)
+    monkeypatch.setattr(Config, 'IMAGE_TARGET_BYTES', 0)
+    return lambda **kwargs: ImageProcessor(static_dir=str(tmp_path / 'static'), base_url='https://cdn.example.com/img/',
+                                           output_format='jpeg', workers=2, **kwargs)
+
+def test_resized_to_display_box(tmp_path, processor):
+    """Large images are cropped to 700x200; small ones keep the aspect ratio without upscaling"""
+    large = save_image(tmp_path / 'large.png', (1400, 1400))
+    small = save_image(tmp_path / 'small.png', (350, 350), seed=1, mode='RGBA')
+
+    large_url, small_url, missing = processor().process_all([large, small, None])
+
+    assert missing is None
+    assert large_url.startswith('https://cdn.example.com/img/') and large_url.endswith('.jpg')
+    static = tmp_path / 'static'
+    with Image.open(static / os.path.basename(large_url)) as image:
+        assert (image.format, image.size, image.mode) == ('JPEG', (700, 200), 'RGB')
+    with Image.open(static / os.path.basename(small_url)) as image:
+        assert image.size == (350, 100)
+
+def test_quality_steps_down_to_target(tmp_path, processor, monkeypatch):
+    """Quality drops in steps until the file fits, but never below the floor"""
+    source = save_image(tmp_path / 'noise.png', (700, 200))
+    target = jpeg_size(source, 60)
+    assert jpeg_size(source, 70) > target
+
+    monkeypatch.setattr(Config, 'IMAGE_TARGET_BYTES', target)
+    fitted = processor()
+    filename = os.path.basename(fitted.process_all([source])[0])
+    entry = next(iter(fitted.manifest.values()))
+
+    assert entry['file'] == filename and os.path.getsize(tmp_path / 'static' / filename) == entry['bytes']
+    assert entry['quality'] == 60 and entry['bytes'] <= target, entry
+
+    monkeypatch.setattr(Config, 'IMAGE_TARGET_BYTES', 100)
+    floor = processor()
+    floor.process_all([source])
+    entry = next(entry for entry in floor.manifest.values() if entry['file'] != filename)
+    assert entry['quality'] == image_processor.MIN_QUALITY and entry['bytes'] > 100, entry
+
+def test_identical_images_share_one_file(tmp_path, processor):
+    """Files are named by content, so the same image from two paths is stored once"""
+    first = save_image(tmp_path / 'first.png', (800, 300))
+    copy = tmp_path / 'copy.png'
+    copy.write_bytes(open(first, 'rb').read())
+    other = save_image(tmp_path / 'other.png', (800, 300), seed=2)
+
+    urls = processor().process_all([first, str(copy), other])
+
+    assert urls[0] == urls[1] != urls[2]
+    files = sorted(name for name in os.listdir(tmp_path / 'static') if name != 'manifest.json')
+    assert len(files) == 2, files
+
+def test_manifest_reused_across_runs(tmp_path, processor, monkeypatch):
+    """A rerun finds earlier results in manifest.json and never decodes the image again"""
+    source = save_image(tmp_path / 'image.png', (900, 300))
+    first = processor().process_all([source])
+
+    with open(tmp_path / 'static' / 'manifest.json', encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert [entry['file'] for entry in manifest.values()] == [os.path.basename(first[0])]
+
+    def fail(*args):
+        raise AssertionError('image was processed again')
+
+    monkeypatch.setattr(ImageProcessor, '_recompress', fail)
+    assert processor().process_all([source]) == first
+
+    # Different settings are a different result and do not reuse the entry
+    monkeypatch.setattr(Config, 'IMAGE_QUALITY', 50)
+    assert processor().process_all([source]) == [source]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Issue Emitter
+Checks that one issue model yields consistent HTML, text, Markdown and JSON
+"""
+
+import json
+from datetime import datetime
+
+from fragment_cache import FragmentCache
+from html_optimizer import optimize_html
+from issue import Issue, IssueEmitter
+
+DATE = datetime(2025, 1, 15, 8, 0)
+
+def sample_categorized():
+    return {
+        'Research': [
+            {'title': 'Sparse <attention> wins', 'ai_summary': 'Faster *and* cheaper.', 'url': 'https://example.com/a',
+             'source': 'Lab Blog', 'score': 8.0},
+            {'title': 'New benchmark', 'ai_summary': 'Harder evals.', 'url': 'https://example.com/b',
+             'source': 'Journal', 'score': 5.0}
+        ],
+        'Funding': [
+            {'title': 'Startup raises $50M', 'ai_summary': 'Series B.', 'url': 'https://example.com/c',
+             'source': 'News', 'score': 6.0}
+        ],
+        'Empty': []
+    }
+
+def emitter():
+    # Empty path keeps the fragment cache in memory
+    return IssueEmitter(FragmentCache(path=''))
+
+def test_formats_agree():
+    """Every format carries the same sections and stories, in the same order"""
+    issue = Issue.from_categorized(sample_categorized(), 'Daily Brief', DATE)
+    outputs = emitter().emit(issue)
+
+    assert set(outputs) == {'html', 'text', 'markdown', 'json'}, set(outputs)
+    manifest = json.loads(outputs['json'])
+    assert manifest['story_count'] == 3, manifest
+    assert [section['name'] for section in manifest['sections']] == ['Research', 'Funding'], manifest
+    assert 'Empty' not in outputs['html'] and 'EMPTY' not in outputs['text']
+
+    for fmt in ('html', 'text', 'markdown'):
+        positions = [outputs[fmt].find(marker) for marker in ('benchmark', 'Startup raises')]
+        assert -1 not in positions and positions == sorted(positions), (fmt, positions)
+
+def test_escaping():
+    """HTML escapes story text; Markdown escapes emphasis and link syntax"""
+    issue = Issue.from_categorized(sample_categorized(), 'Daily Brief', DATE)
+    outputs = emitter().emit(issue)
+
+    assert '<attention>' not in outputs['html'] and '&lt;attention&gt;' in outputs['html']
+    assert 'Faster \\*and\\* cheaper.' in outputs['markdown'], outputs['markdown']
+
+def test_markdown_urls():
+    """Link targets with spaces or parentheses stay one well-formed link"""
+    categorized = {'Research': [{
+        'title': 'Odd link', 'ai_summary': '', 'source': 'Wiki',
+        'url': 'https://example.com/wiki/Transformer_(model) x) [evil](https://bad)'
+    }]}
+    markdown = emitter().emit(Issue.from_categorized(categorized, 'S', DATE), ('markdown',))['markdown']
+
+    expected = '(https://example.com/wiki/Transformer_%28model%29%20x%29%20[evil]%28https://bad%29)'
+    assert f'### [Odd link]{expected}' in markdown, markdown
+    assert '](https://bad)' not in markdown
+
+def test_manifest_round_trip():
+    """An issue rebuilt from its manifest renders the same pages"""
+    issue = Issue.from_categorized(sample_categorized(), 'Daily Brief', DATE)
+    first = emitter().emit(issue)
+    rebuilt = Issue.from_manifest(json.loads(first['json']))
+    second = emitter().emit(rebuilt)
+
+    for fmt in ('html', 'text', 'markdown'):
+        assert first[fmt] == second[fmt], fmt
+
+def test_stream_matches_emit():
+    """Streaming yields the same document as emit (HTML optimized)"""
+    issue = Issue.from_categorized(sample_categorized(), 'Daily Brief', DATE)
+    outputs = emitter().emit(issue)
+
+    assert ''.join(emitter().stream(issue, 'html')) == optimize_html(outputs['html'])
+    assert ''.join(emitter().stream(issue, 'text')) == outputs['text']
+    assert ''.join(emitter().stream(issue, 'markdown')) == outputs['markdown']
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test Issue Archive
+Checks archived issues are exported and served as streamed pages, and that the
+streamed premium newsletter still honours the email byte budget
+"""
+
+import asyncio
+import os
+from datetime import datetime
+
+from ai_newsletter_2025 import AIWhopNewsletter2025
+from config import Config
+from fragment_cache import FragmentCache
+from html_optimizer import encoded_size
+from issue import Issue, IssueEmitter
+from issue_archive import IssueArchive, create_archive_app
+
+def archive_with_issues(directory):
+    archive = IssueArchive(directory=str(directory), emitter=IssueEmitter(FragmentCache(path='')))
+    emitter = IssueEmitter(FragmentCache(path=''))
+    for day, title in ((14, 'Sparse attention wins'), (15, 'Robot startup raises $50M')):
+        categorized = {'Research': [{'title': title, 'ai_summary': 'Summary.', 'url': 'https://example.com/a',
+                                     'source': 'Wire', 'score': 5}]}
+        issue = Issue.from_categorized(categorized, f'Issue {day}', datetime(2025, 1, day, 8, 0))
+        archive.save(emitter.emit(issue, ('json',))['json'])
+    return archive
+
+def test_save_and_keys(tmp_path):
+    """Issues are stored per date, newest first; only date keys are ever read"""
+    archive = archive_with_issues(tmp_path / 'archive')
+
+    assert archive.keys() == ['2025-01-15', '2025-01-14']
+    assert archive.load('2025-01-14').subject == 'Issue 14'
+    assert archive.load('../secrets') is None and archive.stream('2025-02-01') is None
+
+def test_export(tmp_path):
+    """Every issue is written out in the chosen format and matches the streamed page"""
+    archive = archive_with_issues(tmp_path / 'archive')
+    output = tmp_path / 'site'
+
+    assert archive.export(str(output), 'md') == 2
+    assert sorted(os.listdir(output)) == ['2025-01-14.md', '2025-01-15.md']
+    with open(output / '2025-01-15.md', encoding='utf-8') as f:
+        assert f.read() == ''.join(archive.stream('2025-01-15', 'markdown'))
+
+def test_serving(tmp_path):
+    """The app lists issues and streams each one as HTML, text or Markdown"""
+    archive = archive_with_issues(tmp_path / 'archive')
+    client = create_archive_app(archive).test_client()
+
+    assert client.get('/archive').get_json() == {'issues': ['2025-01-15', '2025-01-14']}
+    assert client.get('/health').get_json()['issues'] == 2
+
+    page = client.get('/archive/2025-01-15')
+    assert page.status_code == 200 and page.mimetype == 'text/html'
+    assert page.is_streamed and 'Robot startup raises $50M' in page.get_data(as_text=True)
+
+    text = client.get('/archive/2025-01-14.txt')
+    assert text.mimetype == 'text/plain' and 'Sparse attention wins' in text.get_data(as_text=True)
+
+    assert client.get('/archive/2025-01-15.pdf').status_code == 404
+    assert client.get('/archive/2024-12-31').status_code == 404
+
+def premium_articles(count):
+    return [
+        {'title': f'Story {index}', 'description': 'Long description. ' * 40, 'url': f'https://example.com/{index}',
+         'source': {'name': 'Wire'}, 'score': count - index}
+        for index in range(count)
+    ]
+
+def test_premium_newsletter_within_budget(tmp_path, monkeypatch):
+    """The streamed premium page is kept when it fits, and trimmed to the budget when it does not"""
+    newsletter = AIWhopNewsletter2025()
+    articles = premium_articles(6)
+    path = str(tmp_path / 'premium.html')
+
+    full_size = asyncio.run(newsletter.write_premium_newsletter(articles, [], path))
+    with open(path, encoding='utf-8') as f:
+        assert f.read().count('Story ') == 6
+
+    monkeypatch.setattr(Config, 'EMAIL_BYTE_BUDGET', full_size - 500)
+    size = asyncio.run(newsletter.write_premium_newsletter(articles, [], path))
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+
+    assert size == encoded_size(html) <= Config.EMAIL_BYTE_BUDGET
+    assert 'Story 0' in html and 'Story 5' not in html
+    assert not os.path.exists(f'{path}.tmp')
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test Keyword Matcher
+Checks the Aho-Corasick matcher's hits, word boundaries and table grouping
+"""
+
+from keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+TABLES = {
+    'category': {
+        'funding': ['funding', 'series a', 'raises'],
+        'tools': ['tech', 'api', 'sdk']
+    },
+    'topic': {
+        'models': ['gpt', 'gpt-4', 'llm']
+    }
+}
+
+def test_overlapping_keywords():
+    """Every keyword is found, including ones nested inside longer keywords"""
+    hits = KeywordMatcher(TABLES).match('Startup raises Series A to build GPT-4 apps')
+
+    assert hits.has('category', 'funding')
+    assert hits.count('category', 'funding') == 2, hits.matches
+    assert hits.matches[('topic', 'models')] == {'gpt', 'gpt-4'}, hits.matches
+
+def test_word_boundaries():
+    """Keywords only match whole words: 'tech' does not match 'technology'"""
+    matcher = KeywordMatcher(TABLES)
+
+    assert not matcher.match('New technology for rapid prototyping').has('category', 'tools')
+    assert not matcher.match('A biotech firm, a capital idea').has('category', 'tools')
+    assert matcher.match('Big Tech responds').has('category', 'tools')
+    assert matcher.match('(tech) news').has('category', 'tools')
+
+def test_plurals_and_case():
+    """Plural 's'/'es' suffixes and any letter case still match"""
+    hits = KeywordMatcher(TABLES).match('Three new APIs and two LLMs ship today')
+
+    assert hits.matches.get(('category', 'tools')) == {'api'}, hits.matches
+    assert hits.matches.get(('topic', 'models')) == {'llm'}, hits.matches
+    assert not hits.has('category', 'funding')
+
+def test_tables_grouping():
+    """Hits are reported per table and group, and the Config matcher is built once"""
+    hits = KeywordMatcher(TABLES).match('The SDK raises the bar')
+
+    assert hits.groups('category') == {'tools', 'funding'}, hits.groups('category')
+    assert not hits.has('topic')
+    assert get_keyword_matcher() is get_keyword_matcher()
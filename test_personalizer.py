@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test Personalizer
+Checks the render-once skeleton, slot filling, tracked links and the byte budget
+"""
+
+import hashlib
+import hmac
+
+import pytest
+
+from config import Config
+from personalizer import PersonalizedEdition, Skeleton, recipient_token
+
+def sample_categorized():
+    return {
+        'AI & Machine Learning': [
+            {'title': 'Sparse attention wins', 'ai_summary': 'Faster and cheaper.', 'url': 'https://example.com/a',
+             'source': 'Lab Blog', 'score': 9},
+            {'title': 'Benchmark \x00recipient\x00 forged', 'ai_summary': 'Nul\x00 bytes.', 'url': 'https://example.com/b',
+             'source': 'Journal', 'score': 4}
+        ],
+        'Business & Startups': [
+            {'title': 'Robot startup raises $50M', 'ai_summary': 'Series B.', 'url': 'https://example.com/c',
+             'source': 'News', 'score': 6}
+        ]
+    }
+
+@pytest.fixture
+def untracked(monkeypatch):
+    monkeypatch.setattr(Config, 'LINK_TRACKING_URL', '')
+    monkeypatch.setattr(Config, 'LINK_TRACKING_SECRET', '')
+
+@pytest.fixture
+def tracked(monkeypatch):
+    monkeypatch.setattr(Config, 'LINK_TRACKING_URL', 'https://t.example.com/c')
+    monkeypatch.setattr(Config, 'LINK_TRACKING_SECRET', 'test-secret')
+
+def test_skeleton_fill():
+    """Literals are joined with each slot's value; unknown slots are left empty"""
+    skeleton = Skeleton('<p>\x00greeting\x00</p><a href="/c?r=\x00recipient\x00">é</a>\x00missing\x00!')
+
+    assert skeleton.slots == ['greeting', 'recipient', 'missing']
+    filled = skeleton.fill({'greeting': b'Hi Ada,', 'recipient': b'abc'})
+    assert filled == '<p>Hi Ada,</p><a href="/c?r=abc">é</a>!'.encode('utf-8')
+
+def test_render_per_recipient(untracked):
+    """Greetings are escaped per recipient; only a known persona gets its section"""
+    edition = PersonalizedEdition.build(sample_categorized())
+
+    html = edition.render({'email': 'a@example.com', 'first_name': ' <Ada> ', 'persona': 'investors'}).decode('utf-8')
+    assert 'Hi &lt;Ada&gt;,' in html and 'For Investors' in html, html
+    assert 'href="https://example.com/a"' in html
+
+    plain = edition.render({'email': 'b@example.com', 'fields': {'persona': 'unknown'}}).decode('utf-8')
+    assert 'Hi there,' in plain and 'class="persona"' not in plain
+
+def test_nul_characters_stripped(untracked):
+    """NULs in stories or subscriber fields never reach the email or forge a slot"""
+    edition = PersonalizedEdition.build(sample_categorized())
+    html = edition.render({'email': 'a@example.com', 'first_name': 'A\x00da'})
+
+    assert b'\x00' not in html
+    assert b'Benchmark recipient forged' in html and b'Nul bytes.' in html
+    assert b'Hi Ada,' in html
+    assert 'recipient' not in edition.body.slots
+
+def test_tracking_secret_required(monkeypatch):
+    """Tracked links need a secret: building, signing and config validation all say so"""
+    monkeypatch.setattr(Config, 'LINK_TRACKING_URL', 'https://t.example.com/c')
+    monkeypatch.setattr(Config, 'LINK_TRACKING_SECRET', '')
+
+    with pytest.raises(ValueError):
+        PersonalizedEdition.build(sample_categorized())
+    with pytest.raises(ValueError):
+        recipient_token({'id': 42})
+    assert 'link_tracking_secret' in Config.get_missing_config()
+
+def test_tracked_links_signed(tracked):
+    """Each recipient's links carry an HMAC of their id under the secret"""
+    edition = PersonalizedEdition.build(sample_categorized())
+    token = recipient_token({'id': 42})
+
+    assert token == hmac.new(b'test-secret', b'42', hashlib.sha256).hexdigest()[:16]
+    assert token != recipient_token({'id': 43})
+    assert recipient_token({'email': 'a@example.com'}) == hmac.new(
+        b'test-secret', b'a@example.com', hashlib.sha256).hexdigest()[:16]
+
+    html = edition.render({'id': 42, 'email': 'a@example.com', 'persona': 'researchers'}).decode('utf-8')
+    assert html.count(f'&amp;r={token}"') == 5, html
+    assert 'a@example.com' not in html
+
+def test_sections_follow_budget(untracked, monkeypatch):
+    """Persona sections only link stories that survived the byte budget"""
+    monkeypatch.setattr(Config, 'PERSONALIZATION_SLOT_RESERVE', 0)
+    full = PersonalizedEdition.build(sample_categorized())
+    body_size = len(full.body.fill({}))
+    section_size = max(len(section.fill({})) for section in full.persona_sections.values())
+
+    # Tight enough that the lowest-scored story has to go
+    monkeypatch.setattr(Config, 'EMAIL_BYTE_BUDGET', body_size + section_size - 100)
+    edition = PersonalizedEdition.build(sample_categorized())
+    html = edition.render({'email': 'a@example.com', 'persona': 'executives'}).decode('utf-8')
+
+    assert 'Benchmark' not in html, html
+    assert html.count('Sparse attention wins') == 2 and html.count('Robot startup') == 2, html
+
+def test_pool_matches_in_process(untracked, monkeypatch):
+    """Spreading recipients over worker processes yields the same emails, in order"""
+    edition = PersonalizedEdition.build(sample_categorized())
+    recipients = [
+        {'email': f'user{index}@example.com', 'first_name': f'User{index}',
+         'persona': ('executives', 'developers', None)[index % 3]}
+        for index in range(7)
+    ]
+
+    in_process = list(edition.render_many(recipients, workers=1))
+    monkeypatch.setattr(Config, 'PERSONALIZATION_POOL_MIN_RECIPIENTS', 1)
+    monkeypatch.setattr(Config, 'PERSONALIZATION_CHUNK_SIZE', 2)
+    pooled = list(edition.render_many(recipients, workers=2))
+
+    assert [email for email, _ in pooled] == [recipient['email'] for recipient in recipients]
+    assert pooled == in_process
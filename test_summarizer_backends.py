@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test Summarizer Backends
+Checks memory-mapped safetensors loading (needs torch) and the startup report format
+"""
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from summarizer_backends import format_startup_report, mmap_safetensors
+
+def write_safetensors(path, arrays):
+    """Minimal safetensors writer: 8-byte header length, JSON header, raw little-endian data"""
+    names = {np.dtype('float32'): 'F32', np.dtype('int64'): 'I64'}
+    header, offset, blobs = {'__metadata__': {'format': 'pt'}}, 0, []
+    for name, array in arrays.items():
+        blob = np.ascontiguousarray(array).tobytes()
+        header[name] = {'dtype': names[array.dtype], 'shape': list(array.shape), 'data_offsets': [offset, offset + len(blob)]}
+        offset += len(blob)
+        blobs.append(blob)
+    encoded = json.dumps(header).encode()
+    encoded += b' ' * (-len(encoded) % 8)
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<Q', len(encoded)) + encoded + b''.join(blobs))
+
+def test_mmap_safetensors(tmp_path):
+    """Tensors match the file and are views of the map, not copies"""
+    torch = pytest.importorskip('torch')
+    weights = {
+        'encoder.weight': np.arange(12, dtype=np.float32).reshape(3, 4),
+        'positions': np.array([7, 8, 9], dtype=np.int64),
+        'empty.bias': np.zeros((0,), dtype=np.float32)
+    }
+    path = str(tmp_path / 'model.safetensors')
+    write_safetensors(path, weights)
+
+    tensors = mmap_safetensors(path)
+
+    assert set(tensors) == set(weights)
+    for name, array in weights.items():
+        assert tensors[name].shape == torch.Size(array.shape), name
+        assert np.array_equal(tensors[name].numpy(), array), name
+    # Copy-on-write: writing to a tensor never touches the file other processes map
+    tensors['encoder.weight'][0, 0] = 100.0
+    assert mmap_safetensors(path)['encoder.weight'][0, 0].item() == 0.0
+
+def test_startup_report_format():
+    """Phases print in the order they were timed"""
+    report = format_startup_report({'import': 1.234, 'weight_load': 0.5, 'first_inference': 2})
+    assert report == 'import 1.23s, weight load 0.50s, first inference 2.00s'
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test Summarizer Inputs
+Checks token-budget truncation, length bucketing and the tokenization cache
+"""
+
+import re
+
+from summarizer_inputs import InputPreparer
+
+class PieceTokenizer:
+    """Fast-tokenizer stand-in: every run of up to four non-space characters is one token"""
+
+    is_fast = True
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=False):
+        self.calls.append(text)
+        return {'offset_mapping': [match.span() for match in re.finditer(r'\S{1,4}', text)]}
+
+def preparer(max_tokens=6, buckets=(4, 8, 16), **kwargs):
+    prepared = InputPreparer('test-model', max_tokens=max_tokens, buckets=list(buckets), **kwargs)
+    prepared._tokenizer = PieceTokenizer()
+    prepared._tokenizer_loaded = True
+    return prepared
+
+def test_truncates_on_word_boundary():
+    """Inputs over the budget are cut at the last whole word that fits"""
+    prepared = preparer(max_tokens=5)
+
+    # 'attention' is three tokens; the fifth token ends inside it
+    assert prepared.prepare('new sparse attention wins benchmark') == 'new sparse'
+    assert prepared.count_tokens('new sparse attention wins benchmark') == 10
+    assert prepared.prepare('short text') == 'short text'
+
+def test_tokenizes_each_text_once():
+    """Counting, truncating and bucketing one text (or its prepared form) tokenizes it once"""
+    prepared = preparer(max_tokens=6)
+    text = 'new sparse attention wins benchmark'
+
+    prepared.count_tokens(text)
+    short = prepared.prepare(text)
+    prepared.bucket_of(text)
+    prepared.count_tokens(short)
+    prepared.bucket_of(short)
+
+    assert prepared.tokenizer.calls == [text]
+
+def test_cache_is_bounded():
+    """The least recently used texts are evicted past cache_size"""
+    prepared = preparer(cache_size=2)
+
+    for text in ('one', 'two', 'three', 'one'):
+        prepared.count_tokens(text)
+
+    assert prepared.tokenizer.calls == ['one', 'two', 'three', 'one']
+    assert list(prepared._cache) == ['three', 'one']
+
+def test_batches_group_similar_lengths():
+    """Batches never mix length buckets, are shortest first and respect the batch size"""
+    prepared = preparer(max_tokens=16)
+    items = [
+        (0, 'a b c d e f g h i j'),   # 10 tokens -> bucket 16
+        (1, 'a b'),                   # 2 tokens  -> bucket 4
+        (2, 'a b c d e f'),           # 6 tokens  -> bucket 8
+        (3, 'a'),                     # 1 token   -> bucket 4
+        (4, 'a b c d e f g'),         # 7 tokens  -> bucket 8
+        (5, 'a b c')                  # 3 tokens  -> bucket 4
+    ]
+
+    batches = prepared.batches(items, batch_size=2)
+
+    assert [[index for index, _ in batch] for batch in batches] == [[3, 1], [5], [2, 4], [0]]
+
+def test_word_count_fallback():
+    """Without a tokenizer, token counts are approximated from words"""
+    prepared = InputPreparer('test-model', max_tokens=13)
+    prepared._tokenizer = None
+    prepared._tokenizer_loaded = True
+    text = ' '.join(f'word{index}' for index in range(20))
+
+    assert prepared.count_tokens(text) == 26
+    assert prepared.prepare(text) == ' '.join(f'word{index}' for index in range(10))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test Summarizer Pool
+Checks core splitting and that generate_newsletter hands a full issue to the worker pool
+"""
+
+import pytest
+
+import newsletter_generator
+from config import Config
+from fragment_cache import FragmentCache
+from newsletter_generator import NewsletterGenerator
+from summarizer_pool import split_cores
+
+SUBJECTS = [
+    'AI model beats radiologists at reading chest scans', 'Startup funding round for warehouse robots',
+    'Tech giant opens quantum computing lab in Denver', 'Neural network predicts protein folding faster',
+    'Business software maker acquires analytics firm', 'Digital payments rollout reaches rural India',
+    'ChatGPT plugin store adds travel booking tools', 'Investment in chip fabs doubles across Europe',
+    'Automation cuts port congestion in Rotterdam', 'Machine learning spots wildfire smoke early',
+    'Startup builds solar drones for crop mapping', 'Innovation grant backs open source compilers',
+    'AI tutors tested in Finnish classrooms', 'Tech union votes on remote work policy'
+]
+
+class RecordingPool:
+    """Stands in for SummarizerPool in the parent process and records what it was given"""
+
+    calls = []
+
+    def __init__(self, backend=None, token=None):
+        self.backend = backend
+
+    def summarize(self, texts, params, timeout=None):
+        RecordingPool.calls.append(list(texts))
+        return [f'Pool summary {index}.' for index in range(len(texts))]
+
+def articles():
+    return [
+        {'title': subject, 'description': f'{subject}. ' + ' '.join(subject.lower().split()[::-1]) * 2,
+         'url': f'https://example.com/{index}', 'source': 'Wire'}
+        for index, subject in enumerate(SUBJECTS)
+    ]
+
+@pytest.fixture
+def generator(monkeypatch, tmp_path):
+    """Generator with no model, summary cache or archive on disk"""
+    monkeypatch.setattr(Config, 'SUMMARY_CACHE_ENABLED', False)
+    monkeypatch.setattr(Config, 'ISSUE_ARCHIVE_DIR', str(tmp_path))
+    monkeypatch.setattr(newsletter_generator, 'get_fragment_cache', lambda: FragmentCache(path=''))
+    monkeypatch.setattr(newsletter_generator, 'SummarizerPool', RecordingPool)
+    RecordingPool.calls = []
+    return NewsletterGenerator()
+
+def test_split_cores():
+    """Whichever knob is left at 0 takes the remaining cores"""
+    assert split_cores(workers=4, threads_per_worker=0, cores=16) == (4, 4)
+    assert split_cores(workers=0, threads_per_worker=4, cores=16) == (4, 4)
+    assert split_cores(workers=0, threads_per_worker=0, cores=16) == (8, 2)
+    assert split_cores(workers=3, threads_per_worker=0, cores=2) == (3, 1)
+
+def test_pool_runs_for_a_full_issue(generator, monkeypatch):
+    """With workers enabled, every selected story is summarized by the pool and the parent loads no model"""
+    monkeypatch.setattr(Config, 'SUMMARIZER_WORKERS', 4)
+
+    newsletter = generator.generate_newsletter(articles())
+
+    assert 'manifest' in newsletter, newsletter
+    assert len(RecordingPool.calls) == 1, RecordingPool.calls
+    assert len(RecordingPool.calls[0]) == Config.MAX_STORIES_PER_ISSUE
+    assert newsletter['html'].count('Pool summary') == newsletter['articles_count']
+    assert not generator._summarizer_loaded
+
+def test_threshold_never_exceeds_issue_size(generator, monkeypatch):
+    """A threshold above the issue cap is clamped, so the pool can still run"""
+    monkeypatch.setattr(Config, 'SUMMARIZER_WORKERS', 4)
+    monkeypatch.setattr(Config, 'SUMMARIZER_POOL_MIN_ARTICLES', 40)
+
+    assert generator._pool_min_articles() == Config.MAX_STORIES_PER_ISSUE
+    generator.generate_newsletter(articles())
+    assert len(RecordingPool.calls) == 1
+
+    monkeypatch.setattr(Config, 'SUMMARIZER_POOL_MIN_ARTICLES', 0)
+    assert generator._pool_min_articles() == Config.MAX_STORIES_PER_ISSUE // 2
+
+def test_single_worker_stays_in_process(generator, monkeypatch):
+    """SUMMARIZER_WORKERS=1 never starts the pool; without a model stories get extractive summaries"""
+    monkeypatch.setattr(Config, 'SUMMARIZER_WORKERS', 1)
+    generator.summarizer = None
+
+    newsletter = generator.generate_newsletter(articles())
+
+    assert RecordingPool.calls == []
+    assert 'Pool summary' not in newsletter['html']
+    assert newsletter['articles_count'] == Config.MAX_STORIES_PER_ISSUE
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test Summarizer Server
+Exercises the /summarize and /health endpoints with a stand-in model
+"""
+
+import pytest
+
+import summarizer_server
+from summarizer_inputs import InputPreparer
+from summarizer_server import create_summarizer_app
+
+class StandInPipeline:
+    """Summarization pipeline stand-in that records each batch it is given"""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def __call__(self, texts, batch_size, truncation, **params):
+        if self.fail:
+            raise RuntimeError('out of memory')
+        self.calls.append((list(texts), params))
+        return [{'summary_text': f'{len(text.split())} words'} for text in texts]
+
+@pytest.fixture
+def make_client(monkeypatch):
+    def make(pipeline):
+        def load(backend, token=None, timings=None):
+            timings['weight_load'] = 0.0
+            return pipeline
+
+        def word_counts(model):
+            preparer = InputPreparer(model, max_tokens=64)
+            preparer._tokenizer = None
+            preparer._tokenizer_loaded = True
+            return preparer
+
+        monkeypatch.setattr(summarizer_server, 'load_summarization_pipeline', load)
+        monkeypatch.setattr(summarizer_server, 'get_input_preparer', word_counts)
+        return create_summarizer_app(backend='bart').test_client()
+    return make
+
+def test_health(make_client):
+    """Health reports the backend and model being served"""
+    health = make_client(StandInPipeline()).get('/health').get_json()
+
+    assert health['status'] == 'healthy' and health['backend'] == 'bart' and health['model']
+
+def test_summaries_in_input_order(make_client):
+    """Texts are batched by length, and summaries come back in the order they were sent"""
+    pipeline = StandInPipeline()
+    texts = ['one two three four five six', 'one', 'one two three', 'one two']
+
+    response = make_client(pipeline).post('/summarize', json={'texts': texts, 'params': {'max_length': 40},
+                                                              'batch_size': 2})
+
+    assert response.status_code == 200, response.get_data(as_text=True)
+    assert response.get_json()['summaries'] == ['6 words', '1 words', '3 words', '2 words']
+    assert all(len(texts) <= 2 and params == {'max_length': 40} for texts, params in pipeline.calls), pipeline.calls
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'texts': 'not a list'},
+    {'texts': ['ok', 3]},
+    {'texts': ['ok'], 'batch_size': 'eight'},
+    {'texts': ['ok'], 'batch_size': [8]},
+    {'texts': ['ok'], 'params': ['max_length', 40]}
+])
+def test_bad_requests_rejected(make_client, payload):
+    """Malformed payloads are a 400 and never reach the model"""
+    pipeline = StandInPipeline()
+
+    response = make_client(pipeline).post('/summarize', json=payload)
+
+    assert response.status_code == 400, response.get_data(as_text=True)
+    assert 'error' in response.get_json() and pipeline.calls == []
+
+def test_model_failure(make_client):
+    """A model error is a 500 with no details leaked"""
+    response = make_client(StandInPipeline(fail=True)).post('/summarize', json={'texts': ['one two']})
+
+    assert response.status_code == 500
+    assert response.get_json() == {'error': 'Summarization failed'}
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test Summary Cache
+Checks content-hash keys, persistence, TTL expiry and the LRU size cap
+"""
+
+import os
+import tempfile
+import time
+
+from summary_cache import SummaryCache
+
+PARAMS = {'max_length': 100, 'min_length': 30, 'do_sample': False}
+
+def test_keys():
+    """Keys ignore whitespace differences but change with model or parameters"""
+    key = SummaryCache.make_key('OpenAI  ships\na new model', 'bart', PARAMS)
+
+    assert key == SummaryCache.make_key('OpenAI ships a new model ', 'bart', PARAMS)
+    assert key == SummaryCache.make_key('OpenAI ships a new model', 'bart', dict(reversed(list(PARAMS.items()))))
+    assert key != SummaryCache.make_key('OpenAI ships a new model', 'bart-int8', PARAMS)
+    assert key != SummaryCache.make_key('OpenAI ships a new model', 'bart', {**PARAMS, 'max_length': 60})
+
+def test_persistence():
+    """Saved summaries are served by a fresh cache; corrupt files start empty"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'nested', 'summaries.json')
+        cache = SummaryCache(path=path)
+        cache.set('k', 'A summary.')
+        cache.save()
+
+        assert SummaryCache(path=path).get('k') == 'A summary.'
+        assert SummaryCache(path=path).get('missing') is None
+
+        with open(path, 'w') as f:
+            f.write('{not json')
+        assert SummaryCache(path=path).entries == {}
+
+def test_ttl_expiry():
+    """Entries older than the TTL are misses and are dropped on save"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'summaries.json')
+        cache = SummaryCache(path=path, ttl_seconds=60)
+        cache.set('old', 'stale')
+        cache.set('new', 'fresh')
+        cache.entries['old']['created'] = time.time() - 120
+
+        assert cache.get('old') is None
+        assert cache.get('new') == 'fresh'
+
+        cache.entries['new']['created'] = time.time() - 120
+        cache.save()
+        assert SummaryCache(path=path, ttl_seconds=60).entries == {}
+
+def test_lru_cap():
+    """Above the size cap, the least recently used entries are evicted on save"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'summaries.json')
+        cache = SummaryCache(path=path, max_entries=2)
+        for index, key in enumerate(('a', 'b', 'c')):
+            cache.set(key, key.upper())
+            cache.entries[key]['last_used'] = 1000 + index
+        cache.entries['a']['last_used'] = 2000  # recently read
+        cache.save()
+
+        assert set(SummaryCache(path=path).entries) == {'a', 'c'}
@@ -8,7 +8,10 @@ import os
 import sys
 import logging
 from datetime import datetime
-from src.newsletter_system import AINewsletterSystem
+
+import bootstrap  # noqa: F401  (puts src on sys.path)
+
+from newsletter_system import AINewsletterSystem
 
 def test_environment():
     """Test environment variables"""
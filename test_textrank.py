@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test TextRank Fallback
+Checks the extractive summarizer used when the model is unavailable, fails or runs out of time
+"""
+
+import logging
+
+from newsletter_generator import NewsletterGenerator
+from textrank import TextRankSummarizer
+
+ARTICLE = (
+    'The weather was pleasant on Tuesday. '
+    'Nvidia announced a new GPU for training large language models. '
+    'The GPU doubles memory bandwidth for large language model training. '
+    'Analysts expect the GPU to ship to cloud providers training language models next year. '
+    'A local bakery opened downtown.'
+)
+
+def test_central_sentences_kept():
+    """Long articles keep their most central sentences, in original order"""
+    summary = TextRankSummarizer(max_sentences=2).summarize(ARTICLE)
+
+    assert 'bakery' not in summary and 'weather' not in summary, summary
+    assert summary.count('GPU') == 2, summary
+    sentences = [s for s in TextRankSummarizer()._split(ARTICLE) if s in summary]
+    assert summary == ' '.join(sentences), summary
+
+def test_short_and_markup():
+    """Short texts pass through whole; HTML tags and extra whitespace are stripped"""
+    summarizer = TextRankSummarizer(max_sentences=2)
+
+    assert summarizer.summarize('<p>One   sentence only.</p>') == 'One sentence only.'
+    assert summarizer.summarize('') == ''
+    assert '<' not in summarizer.summarize(f'<div>{ARTICLE}</div>')
+
+def test_batch_matches_single():
+    """Ranking a batch gives each article the same summary as ranking it alone"""
+    summarizer = TextRankSummarizer(max_sentences=2)
+    other = (
+        'Regulators in Brussels published draft AI Act guidance. '
+        'The guidance covers general purpose AI models. '
+        'Companies must document training data for general purpose AI models. '
+        'Fines apply from next August.'
+    )
+    texts = [ARTICLE, 'Too short.', other]
+
+    assert summarizer.summarize_batch(texts) == [summarizer.summarize(text) for text in texts]
+
+def test_generator_fallback():
+    """Without a model the generator falls back to TextRank, then to the description"""
+    # Only the pieces the fallback path touches; no model is loaded
+    generator = NewsletterGenerator.__new__(NewsletterGenerator)
+    generator.logger = logging.getLogger('test_textrank')
+    generator.extractive_summarizer = TextRankSummarizer(max_sentences=2)
+
+    summary = generator._fallback_summary({'content': ARTICLE})
+    assert summary == generator.extractive_summarizer.summarize(ARTICLE), summary
+
+    assert generator._fallback_summary({'description': 'Only a teaser.'}) == 'Only a teaser.'
+    assert generator._fallback_summary({'content': '', 'description': ''}) == '...'
@@ -11,6 +11,8 @@ import json
 from datetime import datetime
 from dotenv import load_dotenv
 
+import bootstrap  # noqa: F401  (puts src on sys.path)
+
 def test_whop_api():
     """Test Whop API connection"""
     load_dotenv()
@@ -138,7 +140,7 @@ def simulate_webhook_test():
     
     # Test webhook handling
     try:
-        from src.whop_integration import WhopIntegration
+        from whop_integration import WhopIntegration
         whop = WhopIntegration()
         result = whop.handle_subscription_webhook(test_payload)
         print(f"Webhook handling test: {'✅ Passed' if result else '❌ Failed'}")
@@ -6,7 +6,10 @@ Run this to handle subscription webhooks
 
 import os
 import logging
-from src.whop_integration import create_flask_webhook_app
+
+import bootstrap  # noqa: F401  (puts src on sys.path)
+
+from whop_integration import create_flask_webhook_app
 
 def main():
     """Run webhook server"""